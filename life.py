@@ -19,207 +19,444 @@ remains a still-life when embedded in any larger board.
 
 from Tkinter import * 
 from ttk import Scrollbar
-from itertools import * 
 import tkMessageBox,tkFileDialog
 
-from random import randint
-class Life(object):
-    """
-    This object implements the game board and also holds the pattern.
-    
-    self.__nrows = number of rows
-    self.__ncols = number of columns
-    self.__board = 2D list (nrows x ncols) containing the pattern
-    self.__neighbors = 2D List (nrows x ncols) containing the number of neighbors of each cell (in toroidal boundary conditions)
-    self.__generation = the generation number of the pattern
-    self.__ncells = the number of live cells currently in the pattern
-    """
-    def __init__(self,nrows,ncols,percentage):
-        self.__nrows = nrows
-        self.__ncols = ncols
-        self.__board = []
-        self.__neighbors = []
-        self.__generation = 1
-        self.__ncells = 0
+import threading,time,Queue
+from lifecore import *
 
-        self.makeBlankBoard()
 
-    def randomize(self,percentage):
-        """
-        Fill the board according to the percentage, where 0 < percentage < 100.
-        """
+PATTERN_FILETYPES = [('Life patterns','.life'),('RLE patterns','.rle'),('Plaintext patterns','.cells')]
 
-        self.__board = []
-        for i in xrange(self.__nrows):
-            column=[]
-            for j in xrange(self.__ncols):
-                rint=0
-                if randint(1,100)<=percentage:  
-                    rint=1
-                    self.__ncells += 1
-                column.append(rint)
-            self.__board.append(column)
 
-    def setPatternFromTuple(self,tuple):
+class BackgroundWorker(threading.Thread):
+    """
+    Base class for threads which do work away from the Tk event loop.  Frames for the interface to show are
+    published through a bounded queue.  A frame is only made while the queue has room, so the worker never waits 
+    for the interface and the interface never shows a frame older than its last poll.
+
+    self.__frames = Queue of published frames
+    self.__stopEvent = Event which is set to ask the worker to stop
+    self.__delay = the pause in seconds after each unit of work, which sets the speed
+    """
+    def __init__(self,queueSize=1):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.__frames = Queue.Queue(queueSize)
+        self.__stopEvent = threading.Event()
+        self.__delay = 0
+
+    def wantsFrame(self):
         """
-        Creates a board pattern from a tuple, where the tuple encodes the 2D pattern as
-        a list of 1D integers.
+        Returns True if there is room in the queue for a new frame.
         """
+        return not self.__frames.full()
 
-        self.makeBlankBoard()
-        # Use modular arithmetic to code 2D pattern as 1D values.
-        for val in tuple:
-            i = val/self.__ncols
-            j = val%self.__ncols
-            self.__board[i][j] = 1
-
-
-    def getTupleFromPattern(self):
+    def publish(self,frame):
         """
-        Use a list comprehension to generate a tuple from the pattern, where the tuple encodes the 2D pattern as
-        a list of 1D integers.
+        Publishes a frame, dropping it if the queue is full.
         """
-        patternList = [i*self.__ncols+j for i in xrange(self.__nrows) for j in xrange(self.__ncols) if self.__board[i][j]]
-        return tuple(patternList)
+        try:
+            self.__frames.put_nowait(frame)
+        except Queue.Full:
+            pass
 
-    def __str__(self):
-        """Print information about the board and pattern"""
-        return "Game of Life board of %d rows and %d columns and having %d live cells." %(self.__nrows,self.__ncols,self.__ncells)
-    
-
-    def printBoardGraphics(self,canvas,cellWidth,drawMargin):
+    def getFrame(self):
         """
-        Displays a graphical representation of the board onto a tkinter canvas
-
-        canvas = A tkinter canvas
-        drawWidth = the size of the individual cells when plotted on the canvas.  (Width = Height)
-        drawMargin = the width of the margin drawn around the board on the canvas
+        Takes every frame from the queue and returns the newest, or None if there are none.
         """
+        frame = None
+        try:
+            while True:
+                frame = self.__frames.get_nowait()
+        except Queue.Empty:
+            return frame
+
+    def setDelay(self,delay):
+        """
+        setter for delay
+        """
+        self.__delay = delay
 
-        # First draw in grid
-        for i in xrange(self.__ncols + 1):
-            canvas.create_line(cellWidth*i + drawMargin,drawMargin,
-                               cellWidth*i + drawMargin,cellWidth*(self.__nrows) + drawMargin)
-
-        for j in xrange(self.__nrows + 1):
-            canvas.create_line(drawMargin,cellWidth*j + drawMargin
-                               ,cellWidth*(self.__ncols) + drawMargin,cellWidth*j + drawMargin)
-
-        # Now draw in live cells
-        for i in xrange(self.__ncols):
-            for j in xrange(self.__nrows):
-                if self.__board[j][i]:
-                    canvas.create_rectangle(cellWidth*i + drawMargin,cellWidth*j + drawMargin,
-                                            cellWidth*(i + 1) + drawMargin,cellWidth*(j+1) + drawMargin,fill='red')
-
-    def printBoard(self):
+    def wait(self):
+        """
+        Pauses for the delay, returning early if the worker is asked to stop.
+        """
+        if self.__delay:
+            profiler = getProfiler()
+            if profiler is not None:
+                start = time.time()
+            self.__stopEvent.wait(self.__delay)
+            if profiler is not None:
+                profiler.addTime('worker.sleep',time.time() - start)
+
+    def stop(self):
         """
-        Displays a textual representation of the board, output to the monitor window.
+        Asks the worker to stop and waits for it.
         """
+        self.__stopEvent.set()
+        if self.isAlive():
+            self.join()
 
-        for i in xrange(self.__nrows):
-            for j in xrange(self.__ncols):
-                if self.__board[i][j]:
-                    print("*"),
-                else:
-                    print("-"),
-            print("")
+    def stopped(self):
+        """
+        Returns True once the worker has been asked to stop.
+        """
+        return self.__stopEvent.isSet()
 
 
-    def makeBlankBoard(self):
+class PlayWorker(BackgroundWorker):
+    """
+    Worker which steps a board until it is stopped, the pattern dies out, or (if stopOnCycle is set) 
+    the pattern enters a new cycle.  A cycle found before play started is forgotten, and only a cycle of another 
+    period, or any cycle once the board is edited, stops play, so a board which has settled can be watched running.  
+    The frames are copies of the board.  Every generation is recorded in the history.
+
+    self.__life = the board, which belongs to the worker until it has stopped
+    self.__stopOnCycle = A Boolean showing whether the worker stops once the pattern enters a cycle.
+    self.__history = the GenerationHistory of the board, which belongs to the worker until it has stopped
+    self.__edits = Queue of (i,j,value) cell edits made by the interface, applied between generations
+    """
+    def __init__(self,life,stopOnCycle,history):
+        BackgroundWorker.__init__(self)
+        self.__life = life
+        self.__stopOnCycle = stopOnCycle
+        self.__history = history
+        self.__edits = Queue.Queue()
+
+    def setStopOnCycle(self,stopOnCycle):
         """
-        Use a nested list comprehension to create self.__board as a blank 2D list of size nrows*ncols
+        setter for stopOnCycle
         """
-        self.__ncells = 0
-        self.__board=[[0 for j in xrange(self.__ncols)] for i in xrange(self.__nrows)]
+        self.__stopOnCycle = stopOnCycle
 
-    def makeBlankNeighbors(self):
+    def setCell(self,i,j,value):
         """
-        Use a nested list comprehension to create self.__neighbors as a blank 2D list of size nrows*ncols
+        Sets the cell in row i and column j to value (0 or 1) before the next generation.
         """
-        self.__neighbors=[[0 for j in xrange(self.__ncols)] for i in xrange(self.__nrows)]
+        self.__edits.put((i,j,value))
 
-    def update(self):
+    def __applyEdits(self):
+        """
+        Applies the edits made since the last generation.  Returns True if there were any.
+        """
+        edited = False
+        try:
+            while True:
+                i,j,value = self.__edits.get_nowait()
+                self.__life.setCell(i,j,value)
+                edited = True
+        except Queue.Empty:
+            pass
+        return edited
+
+    def run(self):
+        life = self.__life
+        cycle = life.getCycle()
+        knownPeriod = cycle[0] if cycle else None
+        if cycle:
+            life.clearHistory()
+        while not self.stopped():
+            if self.__applyEdits():
+                knownPeriod = None
+            if not life.getNcells():
+                break
+            # Record the generation before stepping too, in case the board was edited since the last step.
+            self.__history.record(life)
+            profiler = getProfiler()
+            if profiler is not None:
+                start = time.time()
+            life.findCycle()
+            life.update()
+            if profiler is not None:
+                profiler.addTime('worker.update',time.time() - start)
+            self.__history.record(life)
+            cycle = life.findCycle()
+            if cycle and self.__stopOnCycle and cycle[0] != knownPeriod:
+                break
+            if self.wantsFrame():
+                if profiler is not None:
+                    start = time.time()
+                self.publish(life.copy())
+                if profiler is not None:
+                    profiler.addTime('worker.copy',time.time() - start)
+            self.wait()
+        self.__applyEdits()
+
+    def getLife(self):
         """
-        Finds the pattern on the n+1 th step, from the pattern on the nth step 
-        using Conway's rule-set.
+        getter for life.  Only use the board once the worker has stopped.
         """
+        return self.__life
 
-        # First build up 2D list of the number of neighbors around each cell
-        self.__generation += 1
-        self.makeBlankNeighbors()
 
-        for i in xrange(self.__nrows):
-            for j in xrange(self.__ncols):
-                if self.__board[i][j]:
-                    # Note use of periodic (toroidal) boundary conditions
-                    iplus=(i + 1) % self.__nrows
-                    iminus=(i - 1) % self.__nrows
-                    jplus=(j + 1) % self.__ncols
-                    jminus=(j - 1) % self.__ncols
-                    self.__neighbors[iminus][jminus] += 1
-                    self.__neighbors[iminus][j     ] += 1
-                    self.__neighbors[iminus][jplus ] += 1
-                    self.__neighbors[i     ][jminus] += 1
-                    self.__neighbors[i     ][jplus ] += 1
-                    self.__neighbors[iplus ][jminus] += 1
-                    self.__neighbors[iplus ][j     ] += 1
-                    self.__neighbors[iplus ][jplus ] += 1
+class SearchWorker(BackgroundWorker):
+    """
+    Worker which searches for all still lifes of n cells on the board of life (see searchStillLifes), 
+    printing them to the terminal.  The frames are (pattern,generation) pairs for the still lifes found.
 
-        #Now apply Conway's rules
+    self.__life = the board used to print the still lifes
+    self.__n = the number of live cells in the still lifes
+    """
+    def __init__(self,life,n):
+        BackgroundWorker.__init__(self)
+        self.__life = life
+        self.__n = n
+
+    def run(self):
+        life = self.__life
+        # The search checks whether the worker has been stopped between still lifes too, since it can go a long 
+        # time without finding one, and the interface waits for the worker when the search is abandoned.
+        for pattern in searchStillLifes(life.getNrows(),life.getNcols(),self.__n,stopped=self.stopped):
+            if self.stopped():
+                break
+            if self.wantsFrame():
+                self.publish((pattern,life.getGeneration()))
+
+            # Print out the still lifes to the terminal.
+
+            life.setPatternFromTuple(pattern)
+            print('='*30)
+            print pattern
+            life.printBoard()
+            self.wait()
+
+
+class CellRenderer(object):
+    """
+    Draws a board onto a tkinter canvas, keeping the canvas items from one frame to the next.  
+    The grid lines are only drawn when the size of the board changes, and each frame only hides 
+    the rectangles of cells which have died and shows rectangles for cells which have been born, 
+    reusing hidden rectangles where possible.  So the cost of a frame is proportional to the number of changed cells.
 
-        for i in xrange(self.__nrows):
-            for j in xrange(self.__ncols):
-                if self.__board[i][j] == 0:
-                    if self.__neighbors[i][j] == 3:
-                        self.__board[i][j] = 1
-                        self.__ncells += 1
-                elif self.__neighbors[i][j] !=2 and self.__neighbors[i][j] !=3: 
-                        self.__board[i][j] = 0
-                        self.__ncells -= 1
+    self.__canvas = A tkinter canvas
+    self.__cellWidth = The size of the individual cells when plotted on the canvas.  (Width = Height)
+    self.__drawMargin = the width of the margin drawn around the board on the canvas
+    self.__shape = (nrows,ncols) of the grid currently drawn, or None
+    self.__items = dictionary mapping the 1D integer encoding of each live cell drawn to its rectangle
+    self.__spare = list of hidden rectangles available for reuse
+    self.__created = the number of rectangles created, for the profiler
+    """
+    def __init__(self,canvas,cellWidth,drawMargin):
+        self.__canvas = canvas
+        self.__cellWidth = cellWidth
+        self.__drawMargin = drawMargin
+        self.__shape = None
+        self.__items = {}
+        self.__spare = []
+        self.__created = 0
+
+    def setCellWidth(self,cellWidth):
+        """
+        setter for cellWidth.  The grid is redrawn on the next reshape.
+        """
+        self.__cellWidth = cellWidth
 
-    def countNcells(self):
+    def reshape(self,life):
         """
-        sets self.__ncells to the number of live cells on the board
+        Clears the canvas and draws the grid for the board of life.
         """
+        self.__canvas.delete(ALL)
+        self.__items = {}
+        self.__spare = []
+        life.printGridGraphics(self.__canvas,self.__cellWidth,self.__drawMargin)
+        self.__shape = (life.getNrows(),life.getNcols())
 
-        ncells=0
-        for i in xrange(self.__nrows):
-            for j in xrange(self.__ncols):
-                if self.__board[i][j]: ncells += 1
+    def draw(self,life):
+        """
+        Brings the canvas up to date with the pattern of life, changing only the cells that differ from the last frame drawn.
+        """
+        profiler = getProfiler()
+        if profiler is not None:
+            start = time.time()
+            created = self.__created
+        if self.__shape != (life.getNrows(),life.getNcols()):
+            self.reshape(life)
+
+        ncols = self.__shape[1]
+        live = set(life.getTupleFromPattern())
+        drawn = self.__items.viewkeys()
+        died = drawn - live
+        born = live - drawn
+        for val in died:
+            self.drawCell(val/ncols,val%ncols,0)
+        for val in born:
+            self.drawCell(val/ncols,val%ncols,1)
+        if profiler is not None:
+            profiler.addTime('draw.cells',time.time() - start)
+            profiler.addCount('draw.itemsHidden',len(died))
+            profiler.addCount('draw.itemsShown',len(born))
+            profiler.addCount('draw.itemsCreated',self.__created - created)
+
+    def drawCell(self,i,j,value):
+        """
+        Shows (value = 1) or hides (value = 0) the rectangle of the cell in row i and column j.
+        """
+        canvas = self.__canvas
+        val = i*self.__shape[1] + j
+        if value:
+            if val in self.__items:
+                return
+            x0 = self.__cellWidth*j + self.__drawMargin
+            y0 = self.__cellWidth*i + self.__drawMargin
+            x1 = x0 + self.__cellWidth
+            y1 = y0 + self.__cellWidth
+            if self.__spare:
+                item = self.__spare.pop()
+                canvas.coords(item,x0,y0,x1,y1)
+                canvas.itemconfig(item,state=NORMAL)
+            else:
+                item = canvas.create_rectangle(x0,y0,x1,y1,fill='red')
+                self.__created += 1
+            self.__items[val] = item
+        else:
+            item = self.__items.pop(val,None)
+            if item is not None:
+                canvas.itemconfig(item,state=HIDDEN)
+                self.__spare.append(item)
 
-        self.__ncells = ncells
 
-    def getBoard(self):
+class RasterRenderer(object):
+    """
+    Draws a board onto a tkinter canvas as a single image, for boards too large to draw cell by cell.
+    Only the part of the board visible in the canvas window is drawn.  When zoomed in, each cell is a 
+    square of pixels.  When zoomed out, each pixel covers a square block of cells and is shaded by 
+    the fraction of them that are live.  So the cost of a frame is bounded by the number of pixels on screen, 
+    not the number of cells on the board.  Requires numpy.
+
+    self.__canvas = A tkinter canvas
+    self.__cellWidth = The size of the individual cells when plotted on the canvas, which is 1/n when zoomed out
+    self.__drawMargin = the width of the margin drawn around the board on the canvas
+    self.__image = the PhotoImage currently shown, or None
+    self.__view = (i0,j0,cells) where (i0,j0) is the first cell in the image and cells is the width of a pixel in cells
+    self.__life = the board last drawn
+    self.__palette = numpy array of colour strings, from dead (white) to fully live (red)
+    """
+    def __init__(self,canvas,cellWidth,drawMargin):
+        if numpy is None:
+            raise ImportError("RasterRenderer requires numpy")
+        self.__canvas = canvas
+        self.__cellWidth = cellWidth
+        self.__drawMargin = drawMargin
+        self.__image = None
+        self.__view = None
+        self.__life = None
+        shades = [255 - 255*k/16 for k in xrange(17)]
+        self.__palette = numpy.array(['#ff%02x%02x' %(shade,shade) for shade in shades])
+
+    def setCellWidth(self,cellWidth):
         """
-        getter for board.  Note, board is mutable, so changes to board outside of this class will also cause changes inside.
+        setter for cellWidth
         """
-        return self.__board
+        self.__cellWidth = cellWidth
 
-    def getGeneration(self):
+    def reshape(self,life):
         """
-        getter for generation
+        Clears the canvas.
         """
-        return self.__generation
+        self.__canvas.delete(ALL)
+        self.__image = None
+        self.__view = None
 
-    def setGeneration(self,gen):
+    def __shades(self,region,cells):
         """
-        setter for generation
+        Returns an array of indices into the palette for a region of cells, where each pixel covers cells x cells cells.
         """
-        self.__generation = gen
-
-    def getNcells(self):
+        if cells == 1:
+            return region*16
+        rows,cols = region.shape
+        prows = -(-rows/cells)*cells
+        pcols = -(-cols/cells)*cells
+        if (prows,pcols) != (rows,cols):
+            padded = numpy.zeros((prows,pcols),dtype=numpy.uint8)
+            padded[:rows,:cols] = region
+            region = padded
+        blocks = region.reshape(prows/cells,cells,pcols/cells,cells).sum(axis=(1,3),dtype=numpy.uint32)
+        return (blocks*16 + cells*cells - 1)/(cells*cells)
+
+    def draw(self,life):
         """
-        getter for ncells
+        Draws the visible part of the board of life as an image.
         """
-        return self.__ncells
+        canvas = self.__canvas
+        margin = self.__drawMargin
+        width = self.__cellWidth
+        nrows = life.getNrows()
+        ncols = life.getNcols()
+
+        # Each pixel covers cells x cells cells when zoomed out, and each cell covers zoom x zoom pixels when zoomed in.
+        if width < 1:
+            cells = int(round(1/width))
+            zoom = 1
+        else:
+            cells = 1
+            zoom = int(width)
+
+        # Find the cells inside the visible window, aligned to whole pixels
+        left = canvas.canvasx(0) - margin
+        top = canvas.canvasy(0) - margin
+        i0 = max(0,int(top/width))/cells*cells
+        j0 = max(0,int(left/width))/cells*cells
+        i1 = min(nrows,int((top + canvas.winfo_height())/width) + cells)
+        j1 = min(ncols,int((left + canvas.winfo_width())/width) + cells)
+
+        profiler = getProfiler()
+        if profiler is not None:
+            start = time.time()
+        canvas.delete(ALL)
+        self.__image = None
+        if profiler is not None:
+            profiler.addTime('draw.delete',time.time() - start)
+        if i1 <= i0 or j1 <= j0:
+            return
 
-    def setNcells(self,nc):
+        # Only read the part of the window inside the bounding box of the live cells, when it is known.
+        box = life.getBoundingBox() if life.hasOccupancy() else (0,0,nrows - 1,ncols - 1)
+        region = numpy.zeros((i1 - i0,j1 - j0),dtype=numpy.uint8)
+        if box is not None:
+            bi0 = max(i0,box[0])
+            bj0 = max(j0,box[1])
+            bi1 = min(i1,box[2] + 1)
+            bj1 = min(j1,box[3] + 1)
+            if bi0 < bi1 and bj0 < bj1:
+                region[bi0 - i0:bi1 - i0,bj0 - j0:bj1 - j0] = life.getRegion(bi0,bi1,bj0,bj1)
+        shades = self.__shades(region,cells)
+        colours = self.__palette[shades]
+        data = " ".join(["{" + " ".join(row) + "}" for row in colours.tolist()])
+
+        image = PhotoImage(width=colours.shape[1],height=colours.shape[0])
+        image.put(data,to=(0,0))
+        if zoom > 1:
+            image = image.zoom(zoom)
+        canvas.create_image(margin + j0*width,margin + i0*width,image=image,anchor=NW)
+        self.__image = image
+        self.__view = (i0,j0,cells)
+        self.__life = life
+        if profiler is not None:
+            profiler.addTime('draw.raster',time.time() - start)
+            profiler.addCount('draw.pixels',colours.size)
+
+    def drawCell(self,i,j,value):
         """
-        setter for ncells
+        Redraws the pixels of the cell in row i and column j after it has been set to value (0 or 1).
         """
-        self.__ncells = nc
-    
+        if self.__image is None:
+            return
+        i0,j0,cells = self.__view
+        zoom = max(1,int(self.__cellWidth))
+        x = (j - j0)/cells*zoom
+        y = (i - i0)/cells*zoom
+        if not (0 <= x < self.__image.width() and 0 <= y < self.__image.height()):
+            return
+        if cells == 1:
+            shade = 16 if value else 0
+        else:
+            # Reshade the whole block of cells covered by the pixel.
+            bi = i - (i - i0)%cells
+            bj = j - (j - j0)%cells
+            region = self.__life.getRegion(bi,min(bi + cells,self.__life.getNrows()),bj,min(bj + cells,self.__life.getNcols()))
+            shade = self.__shades(region,cells)[0,0]
+        self.__image.put(self.__palette[shade],to=(x,y,x + zoom,y + zoom))
+
 
 class Controller(object):
     """
@@ -231,9 +468,20 @@ class Controller(object):
     self.__percentage = The fill density used to create a random pattern.
     self.__nrows = The initial number of rows.
     self.__ncols = The initial number of columns.
-    self.__nevery = The graphical display is updated every nevery steps.
+    self.__worker = The BackgroundWorker playing the game or searching for still lifes, or None.
+    self.__frameInterval = The time in ms between updates of the graphical display while a worker runs.
     self.__cellWidth = The size of the individual cells when plotted on the canvas.  (Width = Height)
     self.__drawMargin = the width of the margin drawn around the board on the canvas
+    self.__renderer = The renderer which draws the board onto the canvas, either self.__cellRenderer or self.__rasterRenderer.
+    self.__cellRenderer = The CellRenderer, which draws each live cell as a canvas item.
+    self.__rasterRenderer = The RasterRenderer, which draws the visible part of the board as an image, or None without numpy.
+    self.__zoomLevels = The cell widths which can be chosen with the zoom buttons.
+    self.__rasterCells = Boards with more cells than this are drawn with the RasterRenderer.
+    self.__engine = The name of the engine (a key of ENGINES) used to hold and step the board.
+    self.__stopOnCycle = A Boolean showing whether play stops once the pattern enters a cycle.
+    self.__profileWindow = The ProfileWindow showing the profiler, or None when profiling is off.
+    self.__lastFrame = The time the last frame of play was shown, for the profiler.
+    self.__history = The GenerationHistory of the recent generations of the board, for going back and seeking.
     """
 
     def __init__(self):
@@ -242,8 +490,14 @@ class Controller(object):
         self.__percentage = 50
         self.__nrows = 50
         self.__ncols = 50
-        self.__nevery = 1
+        self.__worker = None
+        self.__frameInterval = 40
         self.__drawMargin = 5
+        self.__engine = 'numpy' if 'numpy' in ENGINES else 'list'
+        self.__stopOnCycle = 1
+        self.__profileWindow = None
+        self.__lastFrame = None
+        self.__history = None
 
         self.__root = Tk()
         self.__root.title("Game of Life")
@@ -251,6 +505,8 @@ class Controller(object):
         self.__root.minsize(256,440)
 
         self.__cellWidth = 8
+        self.__zoomLevels = [1.0/16,1.0/8,1.0/4,1.0/2,1,2,4,8,16]
+        self.__rasterCells = 250000
 
         # Create main frames.  The left frame contains the controls and the right frame contains the canvas.
 
@@ -289,20 +545,67 @@ class Controller(object):
         self.__speedFrame = SpeedFrame(self.__leftFrame,self)
         self.__speedFrame.pack()
 
+        self.__cycleFrame = CycleFrame(self.__leftFrame,self,self.__stopOnCycle)
+        self.__cycleFrame.pack()
+
+        self.__historyFrame = HistoryFrame(self.__leftFrame,self)
+        self.__historyFrame.pack()
+
+        self.__profileFrame = ProfileFrame(self.__leftFrame,self)
+        self.__profileFrame.pack()
+
         self.__popFrame = PopFrame(self.__rightFrame,self)
         self.__popFrame.pack()
 
+        self.__zoomFrame = ZoomFrame(self.__rightFrame,self)
+        self.__zoomFrame.pack()
+
         self.__canvasFrame = CanvasFrame(self.__rightFrame,self)
         self.__canvasFrame.pack()
+        self.__cellRenderer = CellRenderer(self.__canvasFrame.canvas,self.__cellWidth,self.__drawMargin)
+        self.__rasterRenderer = None
+        if numpy is not None:
+            self.__rasterRenderer = RasterRenderer(self.__canvasFrame.canvas,self.__cellWidth,self.__drawMargin)
+        self.__renderer = self.__cellRenderer
 
         self.__stillFrame= StillFrame(self.__leftFrame,self,pady = 50)
         self.__stillFrame.pack()
 
-        self.__percentage = int(self.__randomFrame.densityText.get())
+        self.__percentage = float(self.__randomFrame.densityText.get())
         self.reshape()
         self.random()
         self.__root.mainloop()
 
+    def profile(self):
+        """
+        Called when the 'profile' box is ticked or cleared.  Turns profiling on and shows the ProfileWindow, or 
+        turns it off and closes the window.
+        """
+        if self.__profileFrame.profileVar.get():
+            enableProfiling()
+            if self.__profileWindow is None:
+                self.__profileWindow = ProfileWindow(self.__root,self)
+        else:
+            disableProfiling()
+            if self.__profileWindow is not None:
+                self.__profileWindow.destroy()
+                self.__profileWindow = None
+
+    def setStopOnCycle(self):
+        """
+        Called when the 'stop on cycle' box is ticked or cleared.  Passed on to the PlayWorker during play.
+        """
+        self.__stopOnCycle = self.__cycleFrame.stopVar.get()
+        if isinstance(self.__worker,PlayWorker):
+            self.__worker.setStopOnCycle(self.__stopOnCycle)
+
+    def closeProfile(self):
+        """
+        Called when the ProfileWindow is closed.  Turns profiling off.
+        """
+        self.__profileFrame.profileVar.set(0)
+        self.profile()
+
     def testCommand2(self):
         print 'test2'
 
@@ -311,30 +614,45 @@ class Controller(object):
         Quits program
         """
         self.__pause = 1
+        self.stopWorker()
         self.__root.quit()
 
     def saveFile(self):
         """
-        Saves the current pattern
+        Saves the current pattern.  Files named .rle or .cells are saved as RLE or plaintext, others 
+        in the compressed binary .life format if numpy is available
         """
-        file = tkFileDialog.asksaveasfile(mode='w',defaultextension = '.life')
+        file = tkFileDialog.asksaveasfile(mode='wb',defaultextension = '.life',filetypes=PATTERN_FILETYPES)
         if file:
-            tuple = self.__pattern.getTupleFromPattern()
-            
-            file.write("%s %s\n" %(self.__nrows,self.__ncols))
-            gen = self.__pattern.getGeneration()
-            file.write("%s\n" %gen)
-            file.write(str(tuple))
+            name = file.name.lower()
+            if name.endswith('.rle'):
+                writeRLE(file,self.__pattern)
+            elif name.endswith('.cells'):
+                writePlaintext(file,self.__pattern)
+            elif numpy is not None:
+                writeBinaryLifeFile(file,self.__pattern,compress=True)
+            else:
+                tuple = self.__pattern.getTupleFromPattern()
+                gen = self.__pattern.getGeneration()
+                writeLifeFile(file,self.__nrows,self.__ncols,gen,tuple)
+            file.close()
 
     def openFile(self):
         """
-        Opens a pattern from a file
+        Opens a pattern from a file, in the binary or text .life format, or RLE or plaintext.  
+        RLE and plaintext patterns are centred on a board at least the size of the current one
         """
-        file = tkFileDialog.askopenfile(mode='r',defaultextension = '.life',filetypes=[('Life patterns','.life')])
+        file = tkFileDialog.askopenfile(mode='rb',defaultextension = '.life',filetypes=PATTERN_FILETYPES)
         if file:
-            rowsCols=file.readline().split(" ")
-            self.__nrows = int(rowsCols[0])
-            self.__ncols = int(rowsCols[1])
+            try:
+                life = readPattern(file,self.__engine,self.__nrows,self.__ncols)
+            except ValueError as error:
+                tkMessageBox.showinfo("Alert",str(error))
+                return
+            finally:
+                file.close()
+            self.__nrows = life.getNrows()
+            self.__ncols = life.getNcols()
 
             self.__sizeFrame.rowsText.delete(0,"end")
             self.__sizeFrame.rowsText.insert(0,self.__nrows)
@@ -342,21 +660,13 @@ class Controller(object):
             self.__sizeFrame.colsText.delete(0,"end")
             self.__sizeFrame.colsText.insert(0,self.__ncols)
             self.reshape()
+            self.__pattern = life
+            self.newHistory()
 
-            gen=int(file.readline())
-            self.__popFrame.genLabel.config(text = str(gen))
-            self.__pattern.setGeneration(gen)
-
-            tuple = eval(file.read())
-            self.__pattern.setPatternFromTuple(tuple)
+            self.__popFrame.genLabel.config(text = str(life.getGeneration()))
+            self.__popFrame.popLabel.config(text=str(life.getNcells()))
 
-            ncells = int(self.__stillFrame.stillSize.get())
-            self.__pattern.countNcells()
-            ncells = self.__pattern.getNcells()
-            self.__popFrame.popLabel.config(text=str(ncells))
-
-            self.__canvasFrame.canvas.delete(ALL)
-            self.__pattern.printBoardGraphics(self.__canvasFrame.canvas,self.__cellWidth,self.__drawMargin)
+            self.__renderer.draw(self.__pattern)
             self.__canvasFrame.canvas.update()
 
 
@@ -365,6 +675,7 @@ class Controller(object):
         Called when a search for still lifes is abandoned halfway through
         """
 
+        self.stopWorker()
         self.__enumerate=0
         self.__stillFrame.enumerateButton.config(text='Find Still Lifes',command = self.findStillLife)
 
@@ -374,6 +685,8 @@ class Controller(object):
         self.__randomFrame.randomButton.config(state=NORMAL)
         self.__controlFrame.clearButton.config(state=NORMAL)
         self.__controlFrame.stepButton.config(state=NORMAL)
+        self.__historyFrame.backButton.config(state=NORMAL)
+        self.__historyFrame.seekButton.config(state=NORMAL)
         self.__sizeFrame.rowsText.config(state=NORMAL)
         self.__sizeFrame.colsText.config(state=NORMAL)
         self.__randomFrame.densityText.config(state=NORMAL)
@@ -395,19 +708,73 @@ class Controller(object):
             tkMessageBox.showinfo("Alert","Not an integer")
             return
 
+        if self.__worker is not None:
+            self.__pause = 1
+            self.pauseButtonConfigure()
+
         self.__nrows = int(self.__sizeFrame.rowsText.get())
         self.__ncols = int(self.__sizeFrame.colsText.get())
 
+        self.__pattern=ENGINES[self.__engine](self.__nrows,self.__ncols,self.__percentage)
+        self.configureCanvas()
+
+        gen = 1
+        self.__pattern.setGeneration(gen)
+        self.newHistory()
+        self.updateDisplay()
+
+    def newHistory(self):
+        """
+        Starts a new history for the board, beginning with its current generation.
+        """
+        self.__history = GenerationHistory(self.__nrows,self.__ncols)
+        self.__history.record(self.__pattern)
+
+    def configureCanvas(self):
+        """
+        Sizes the canvas for the board and the cell width, and picks the renderer.  Cell-by-cell drawing is used unless 
+        the board is too large or the cells are too small for it.
+        """
         self.__canvasFrame.canvas.config(width=self.__cellWidth*self.__ncols + 2*self.__drawMargin,
                                       height = self.__cellWidth*self.__nrows + 2*self.__drawMargin)
         self.__canvasFrame.canvas.config(scrollregion=(0,0,self.__cellWidth*self.__ncols + 2*self.__drawMargin,
                                                            self.__cellWidth*self.__nrows + 2*self.__drawMargin))
 
-        self.__pattern=Life(self.__nrows,self.__ncols,self.__percentage)
+        useRaster = self.__cellWidth < 4 or self.__nrows*self.__ncols > self.__rasterCells
+        if useRaster and self.__rasterRenderer is not None:
+            self.__renderer = self.__rasterRenderer
+            self.__rasterRenderer.setCellWidth(self.__cellWidth)
+        else:
+            self.__renderer = self.__cellRenderer
+            self.__cellRenderer.setCellWidth(self.__cellWidth)
+        self.__renderer.reshape(self.__pattern)
 
-        gen = 1
-        self.__pattern.setGeneration(gen)
-        self.updateDisplay()
+    def zoom(self,direction):
+        """
+        Called when a zoom button is pressed.  Moves to the next larger (direction = +1) or smaller (direction = -1) cell width.
+        """
+        levels = self.__zoomLevels
+        k = levels.index(self.__cellWidth) + direction
+        if 0 <= k < len(levels):
+            self.__cellWidth = levels[k]
+            self.__zoomFrame.zoomLabel.config(text=self.zoomText())
+            self.configureCanvas()
+            self.updateDisplay()
+
+    def zoomText(self):
+        """
+        Returns the cell width as text for the zoom label.
+        """
+        if self.__cellWidth < 1:
+            return '1:%d' %int(round(1/self.__cellWidth))
+        return '%d:1' %self.__cellWidth
+
+    def viewChanged(self):
+        """
+        Called when the canvas is scrolled or resized.  Only the raster renderer depends on what is visible.
+        """
+        if self.__renderer is self.__rasterRenderer:
+            self.__renderer.draw(self.__pattern)
 
     def clickCell(self,event,draw):
         """
@@ -420,28 +787,29 @@ class Controller(object):
         i = int((self.__canvasFrame.canvas.canvasx(event.x - self.__drawMargin))/self.__cellWidth)
         j = int((self.__canvasFrame.canvas.canvasy(event.y - self.__drawMargin))/self.__cellWidth)
 
-        board =self.__pattern.getBoard()
-
-        self.__pattern.countNcells()
-        ncells = self.__pattern.getNcells()
         if -1<i<self.__ncols  and -1<j<self.__nrows:
 
             redraw = 0
-            if board[j][i] == 0 and draw == 1:
-                board[j][i] = 1
-                ncells += 1
+            if self.__pattern.getCell(j,i) == 0 and draw == 1:
+                self.__pattern.setCell(j,i,1)
                 redraw = 1
-            elif board[j][i] == 1 and draw == -1:
-                board[j][i]=0
-                ncells += -1
+            elif self.__pattern.getCell(j,i) == 1 and draw == -1:
+                self.__pattern.setCell(j,i,0)
                 redraw = 1
 
             if redraw:
-                self.__canvasFrame.canvas.delete(ALL)
-                self.__pattern.printBoardGraphics(self.__canvasFrame.canvas,self.__cellWidth,self.__drawMargin)
+                # During play the board belongs to the worker, so pass the edit on to it too.
+                if isinstance(self.__worker,PlayWorker):
+                    self.__worker.setCell(j,i,self.__pattern.getCell(j,i))
+                self.__renderer.drawCell(j,i,self.__pattern.getCell(j,i))
+                profiler = getProfiler()
+                if profiler is not None:
+                    start = time.time()
                 self.__canvasFrame.canvas.update()
+                if profiler is not None:
+                    profiler.addTime('display.canvasUpdate',time.time() - start)
 
-                self.__pattern.setNcells(ncells)
+                ncells = self.__pattern.getNcells()
                 self.__popFrame.popLabel.config(text=str(ncells))
 
     def pauseButtonConfigure(self):
@@ -454,6 +822,8 @@ class Controller(object):
             self.__controlFrame.pauseButton.config(text='pause')
         else:
             self.__controlFrame.pauseButton.config(text='play')
+            if isinstance(self.__worker,PlayWorker):
+                self.stopWorker()
         self.updateDisplay()
 
     def clear(self):
@@ -470,8 +840,10 @@ class Controller(object):
         Called when the 'random' button is pressed.  Creates a new random pattern.
         """
 
-        if not self.__randomFrame.densityText.get().isdigit():
-            tkMessageBox.showinfo("Alert","Not an integer")
+        try:
+            percentage = float(self.__randomFrame.densityText.get())
+        except ValueError:
+            tkMessageBox.showinfo("Alert","Not a number")
             return
 
         self.__pause=1
@@ -480,20 +852,22 @@ class Controller(object):
         self.__nrows = int(self.__sizeFrame.rowsText.get())
         self.__ncols = int(self.__sizeFrame.colsText.get())
 
-        self.__percentage = int(self.__randomFrame.densityText.get())
-        self.__pattern=Life(self.__nrows,self.__ncols,self.__percentage)
+        self.__percentage = percentage
+        self.__pattern=ENGINES[self.__engine](self.__nrows,self.__ncols,self.__percentage)
+        self.configureCanvas()
 
         gen = 1
         self.__pattern.setGeneration(gen)
 
         self.__pattern.randomize(self.__percentage)
+        self.newHistory()
         self.updateDisplay()
 
 
     def findStillLife(self):
         """
         Called when the 'Find Still Lifes' button is pressed. 
-        Enumerates all still-lifes of a given size.  
+        Enumerates all still-lifes of a given size in a SearchWorker.  
         Note- toroidal boundary conditions are 
         *not* used when finding still lifes.  Instead, the algorithm searches all possible 
         patterns inside a 1 cell 'safety-margin' about the perimeter, in order to remove 
@@ -508,6 +882,8 @@ class Controller(object):
         self.__randomFrame.randomButton.config(state=DISABLED)
         self.__controlFrame.clearButton.config(state=DISABLED)
         self.__controlFrame.stepButton.config(state=DISABLED)
+        self.__historyFrame.backButton.config(state=DISABLED)
+        self.__historyFrame.seekButton.config(state=DISABLED)
         self.__sizeFrame.rowsText.config(state=DISABLED)
         self.__sizeFrame.colsText.config(state=DISABLED)
         self.__randomFrame.densityText.config(state=DISABLED)
@@ -518,157 +894,112 @@ class Controller(object):
 
         self.__stillFrame.enumerateButton.config(text='Abandon Search',command = self.abandonSearch)
 
-        # Iterate over all patterns in a board of dimension (nrows-2)*(ncols-2), 
-        # the size of the board within a 1 square safety margin around the perimeter.
-
-        ncols_reduced = self.__ncols - 2
-        nrows_reduced = self.__nrows - 2
-
-        n = nrows_reduced*ncols_reduced
-        i = int(self.__stillFrame.stillSize.get())
-        for tuplej in combinations(xrange(n),i):
-            if not self.__enumerate: break
-
-            # reflected1, reflected2 and reflected3 hold representations of the pattern reflected horizontally, vertically and 
-            # horizontally + vertically.
-            # For square patterns, reflected4 swaps rows and columns, then reflected5, reflected6 and reflected7 are representations 
-            # of reflected4 reflected horizontally, vertically and horizontally + vertically.
-
-            reflected1=[]
-            reflected2=[]
-            reflected3=[]
-            reflected4=[]
-            reflected5=[]
-            reflected6=[]
-            reflected7=[]
-
-            # iflag indicates whether the pattern has at least one live cell in the top-most row (within the margin)
-            # jflag indicates whether the pattern has at least one live cell in the left-most column (within the margin)
-
-            iflag = 0
-            jflag = 0
-
-            # Halt enumeration if the first live cell in the tuple is in a column more than half-way accross the width of the board.
-            # All subsequent patterns are translations and rotations of patterns encountered so far.
-            # Proof:  If the first cell is in row 0, then the reflection j -> ncols-1-j results in a pattern where j is 
-            # less than half-way across the 
-            # width of the board and so will already have been enumerated.  
-            # If the first cell is not in row 0, then a translation can take the pattern to one which has its first cell in row 0.
-
-            j0 = tuplej[0]%ncols_reduced
-            if j0 > ncols_reduced-1 - j0: break
-
-            for m in tuplej:
-                i = m/ncols_reduced
-                j = m%ncols_reduced
-
-                if i==0: iflag = 1
-                if j==0: jflag = 1
-
-                i2 = nrows_reduced - 1 - i
-                j2 = j
-                reflected1.append(i2*ncols_reduced + j2)
-
-                i3 = i
-                j3 = ncols_reduced - 1 - j
-                reflected2.append(i3*ncols_reduced + j3)
-
-                i4 = nrows_reduced-1-i
-                j4 = ncols_reduced-1-j
-                reflected3.append(i4*ncols_reduced + j4)
-
-                # For square boards
-                if self.__nrows==self.__ncols:
-                    reflected4.append(j*ncols_reduced + i)
-                    reflected5.append(j2*ncols_reduced + i2)
-                    reflected6.append(j3*ncols_reduced + i3)
-                    reflected7.append(j4*ncols_reduced + i4)
-
+        searchLife = ENGINES[self.__engine](self.__nrows,self.__ncols,self.__percentage)
+        self.__worker = SearchWorker(searchLife,int(self.__stillFrame.stillSize.get()))
+        self.setPatternSpeed()
+        self.__worker.start()
+        self.__root.after(self.__frameInterval,self.searchPoll)
 
-            # Check the pattern is not a tranlation.  Only count patterns which have a live cell in row 0 and a live cell in column 0.  
-            # All other patterns may be considered translations.
-
-            if iflag and jflag:
-
-                # Only step pattern if it is not a reflection along either 4 of the symmetries of a rectangle or 8 symmetries of the square.
-
-                if          tuplej <= tuple(sorted(reflected1)) and tuplej <= tuple(sorted(reflected2))\
-                        and tuplej <= tuple(sorted(reflected3)):
-
-                    # For square boards
-                    if self.__nrows!=self.__ncols or (tuplej <= tuple(sorted(reflected4))\
-                        and tuplej <= tuple(sorted(reflected5)) and tuplej <= tuple(sorted(reflected6))\
-                        and tuplej <= tuple(sorted(reflected7))):
-
-                        # Convert pattern tuple to format for board of dimension nrows*ncols
-                        list=[]
-                        for val in tuplej:
-                            i = 1 + val/ncols_reduced
-                            j = 1 + val%ncols_reduced
-                            list.append(i*self.__ncols + j)
-
-                        # Set the pattern from the tuple and plot it
+    def searchPoll(self):
+        """
+        Called on a timer during a search.  Shows the newest candidate published by the SearchWorker,
+        and finishes the search once the worker has stopped.
+        """
+        worker = self.__worker
+        if not isinstance(worker,SearchWorker):
+            return
 
-                        tuplej2=tuple(list)
-                        self.__pattern.setPatternFromTuple(tuplej2)
-                        ncells = int(self.__stillFrame.stillSize.get())
-                        self.__pattern.setNcells(ncells)
+        frame = worker.getFrame()
+        if frame is not None:
+            pattern,gen = frame
+            self.__pattern.setPatternFromTuple(pattern)
+            self.__pattern.setGeneration(gen)
+            self.updateDisplay()
 
-                        self.setPatternSpeed()
-                        gen = self.__pattern.getGeneration()
-                        if gen % int(self.__nevery)==0:
-                            self.updateDisplay()
-
-                        # Evolve the pattern for 1 generation
-                        self.__pattern.update()
-                        tuplek = self.__pattern.getTupleFromPattern()
-
-                        # If it's a still life, the pattern before and after will be identical.  
-                        # Print out the still lifes to the terminal.
-
-                        if set(tuplej2) == set(tuplek): 
-                            print('='*30)
-                            print tuplej2
-                            self.__pattern.printBoard()
-        self.__enumerate = 0
-        self.__pause = 1
-        self.__controlFrame.pauseButton.config(text='play')
+        if worker.isAlive():
+            self.setPatternSpeed()
+            self.__root.after(self.__frameInterval,self.searchPoll)
+        else:
+            self.__enumerate = 0
+            self.__pause = 1
+            self.__controlFrame.pauseButton.config(text='play')
 
-        self.abandonSearch()
+            self.abandonSearch()
 
     def playPauseGame(self):
         """
         Called when the pause or play button is pressed.
-        The game loop is contained in the while-loop in this method.
+        The game is played by a PlayWorker, which owns the board while it runs.  
+        Meanwhile the display shows the copies of the board it publishes.
         """
 
         self.__pause=1-self.__pause
         self.pauseButtonConfigure()
 
-        if not self.__enumerate:
-            while not self.__pause:
-                self.setPatternSpeed()
-                self.step()
+        if not self.__enumerate and not self.__pause:
+            self.__worker = PlayWorker(self.__pattern,self.__stopOnCycle,self.__history)
+            self.__pattern = self.__pattern.copy()
+            self.setPatternSpeed()
+            self.__worker.start()
+            self.__root.after(self.__frameInterval,self.playPoll)
 
-    def setPatternSpeed(self):
+    def playPoll(self):
         """
-        Determines the speed at which the pattern is run.
-        If speedVar < 10 then a pause is used (using canvas.after)
-        if speedVar = 10 then no pause is used
-        if speedVar > 10 then frames are dropped from the draw
+        Called on a timer during play.  Shows the newest copy of the board published by the PlayWorker,
+        and pauses the game once the worker has stopped by itself.
         """
+        worker = self.__worker
+        if not isinstance(worker,PlayWorker):
+            return
 
-        if self.__speedFrame.speedVar.get()<=10:
-            self.__canvasFrame.canvas.after((10 - self.__speedFrame.speedVar.get())*10)
-            self.__nevery = 1
+        frame = worker.getFrame()
+        if frame is not None:
+            self.__pattern = frame
+            self.updateDisplay()
+            profiler = getProfiler()
+            now = time.time()
+            if profiler is not None and self.__lastFrame is not None:
+                # The interval includes the time Tk takes to repaint the canvas between polls.
+                profiler.addTime('display.frameInterval',now - self.__lastFrame)
+            self.__lastFrame = now
+
+        if worker.isAlive():
+            self.setPatternSpeed()
+            self.__root.after(self.__frameInterval,self.playPoll)
         else:
-            self.__nevery = 1 + pow(2,self.__speedFrame.speedVar.get() - 10)
+            self.__pause = 1
+            self.__lastFrame = None
+            self.pauseButtonConfigure()
+
+    def stopWorker(self):
+        """
+        Stops any running worker.  After play, the board is taken back from the PlayWorker.
+        """
+        worker = self.__worker
+        if worker is not None:
+            self.__worker = None
+            worker.stop()
+            if isinstance(worker,PlayWorker):
+                self.__pattern = worker.getLife()
+
+    def setPatternSpeed(self):
+        """
+        Determines the speed at which the pattern is run, by setting the pause the worker takes
+        after each generation (or each candidate when searching).
+        If speedVar < 10 then a pause of (10 - speedVar)*10 ms is used
+        if speedVar >= 10 then no pause is used.
+        The display shows the newest frame every self.__frameInterval ms whatever the speed.
+        """
+        if self.__worker is not None:
+            self.__worker.setDelay(max(0,10 - self.__speedFrame.speedVar.get())*0.01)
         
     def stepAndPlot(self):
         """
         Steps the game by one generation and plots the result.
         """
-        self.__nevery=1
+        if not self.__pause:
+            self.__pause = 1
+            self.pauseButtonConfigure()
         self.step()
 
 
@@ -679,27 +1010,79 @@ class Controller(object):
 
         ncells = self.__pattern.getNcells()
         if ncells:
+            # Record the generation before stepping too, in case the board was edited since the last step.
+            self.__pattern.findCycle()
+            self.__history.record(self.__pattern)
             self.__pattern.update()
-        else:
+            self.__history.record(self.__pattern)
+            self.__pattern.findCycle()
+
+        self.updateDisplay()
+
+    def back(self):
+        """
+        Called when the 'back' button is pressed.  Pauses the game and goes back the number of generations 
+        in the back box, or as far as the history goes.
+        """
+        if not self.__historyFrame.backText.get().isdigit():
+            tkMessageBox.showinfo("Alert","Not an integer")
+            return
+        n = int(self.__historyFrame.backText.get())
+
+        if not self.__pause:
             self.__pause = 1
             self.pauseButtonConfigure()
-            self.updateDisplay()
+        # Record the board first, in case it was edited since the last step.
+        self.__history.record(self.__pattern)
+        self.__history.back(self.__pattern,n)
+        self.updateDisplay()
 
-        gen = self.__pattern.getGeneration()
-        if gen % int(self.__nevery) == 0:
-            self.updateDisplay()
+    def seek(self):
+        """
+        Called when the 'seek' button is pressed.  Pauses the game and goes to the generation in the seek box,
+        which must be in the history.
+        """
+        try:
+            gen = int(self.__historyFrame.seekText.get())
+        except ValueError:
+            tkMessageBox.showinfo("Alert","Not an integer")
+            return
+
+        if not self.__pause:
+            self.__pause = 1
+            self.pauseButtonConfigure()
+        self.__history.record(self.__pattern)
+        if gen not in self.__history:
+            tkMessageBox.showinfo("Alert","Generation %d is not in the history (generations %d to %d)" 
+                                  %(gen,self.__history.getFirst(),self.__history.getLast()))
+            return
+        self.__history.restore(self.__pattern,gen)
+        self.updateDisplay()
 
     def updateDisplay(self):
         """
         updates the graphics and the labels
         """
-        self.__canvasFrame.canvas.update()
-        self.__canvasFrame.canvas.delete(ALL)
-        self.__pattern.printBoardGraphics(self.__canvasFrame.canvas,self.__cellWidth,self.__drawMargin)
+        profiler = getProfiler()
+        if profiler is not None:
+            start = time.time()
+        self.__renderer.draw(self.__pattern)
         ncells = self.__pattern.getNcells()
         self.__popFrame.popLabel.config(text=str(ncells))
         gen = self.__pattern.getGeneration()
         self.__popFrame.genLabel.config(text=str(gen))
+        cycle = self.__pattern.getCycle()
+        if cycle:
+            self.__popFrame.cycleLabel.config(text='    period %d from generation %d' %cycle)
+        else:
+            self.__popFrame.cycleLabel.config(text='')
+        history = self.__history
+        if history is not None and len(history):
+            self.__popFrame.historyLabel.config(text='    history %d to %d' %(history.getFirst(),history.getLast()))
+        else:
+            self.__popFrame.historyLabel.config(text='')
+        if profiler is not None:
+            profiler.addTime('display.update',time.time() - start)
 
 
 class ControlFrame(Frame):
@@ -744,7 +1127,8 @@ class SizeFrame(Frame):
 
 class PopFrame(Frame):
     """
-    Frame containing population and num. generations text.
+    Frame containing population and num. generations text, the period of the cycle once the pattern enters one,
+    and the generations which can be gone back to.
     """
     def __init__(self,parent,caller,**args):
         Frame.__init__(self,parent,**args)
@@ -758,6 +1142,10 @@ class PopFrame(Frame):
         self.popLabel = Label(self,text="0")
         self.popTextLabel.pack(side=LEFT)
         self.popLabel.pack(side=LEFT)
+        self.cycleLabel = Label(self,text="")
+        self.cycleLabel.pack(side=LEFT)
+        self.historyLabel = Label(self,text="")
+        self.historyLabel.pack(side=LEFT)
 
 class CanvasFrame(Frame):
     """
@@ -773,15 +1161,38 @@ class CanvasFrame(Frame):
         self.canvas.bind("<B1-Motion>",lambda event:caller.clickCell(event,1))
         self.canvas.bind("<Control-Button-1>",lambda event:caller.clickCell(event,-1))
         self.canvas.bind("<Control-B1-Motion>",lambda event:caller.clickCell(event,-1))
+        self.canvas.bind("<Configure>",lambda event:caller.viewChanged())
         vScroll = Scrollbar(self, orient = VERTICAL)
         vScroll.pack(side = RIGHT, fill=Y)
-        vScroll.config(command = self.canvas.yview)
+        vScroll.config(command = lambda *args:self.scroll(self.canvas.yview,args,caller))
         hScroll = Scrollbar(self, orient = HORIZONTAL)
         hScroll.pack(side = BOTTOM, fill=X)
-        hScroll.config(command = self.canvas.xview)
+        hScroll.config(command = lambda *args:self.scroll(self.canvas.xview,args,caller))
         self.canvas.config(xscrollcommand = hScroll.set, yscrollcommand = vScroll.set)
         self.canvas.pack(side=LEFT)
 
+    def scroll(self,view,args,caller):
+        """
+        Scrolls the canvas, then tells the caller that the visible region has changed.
+        """
+        view(*args)
+        caller.viewChanged()
+
+class ZoomFrame(Frame):
+    """
+    Frame containing zoom out and zoom in buttons and the zoom label.
+    """
+    def __init__(self,parent,caller,**args):
+        Frame.__init__(self,parent,**args)
+        self.pack(side=TOP)
+
+        self.zoomOutButton = Button(self,text='-',width=2,command = lambda:caller.zoom(-1))
+        self.zoomOutButton.pack(side=LEFT)
+        self.zoomLabel = Label(self,text=caller.zoomText(),width=6)
+        self.zoomLabel.pack(side=LEFT)
+        self.zoomInButton = Button(self,text='+',width=2,command = lambda:caller.zoom(1))
+        self.zoomInButton.pack(side=LEFT)
+
 class StillFrame(Frame):
     """
     Frame containing Find Still Life button and still life size text entry.
@@ -863,4 +1274,109 @@ class SpeedFrame(Frame):
         self.speedSlider.pack(side=LEFT)
 
 
+class HistoryFrame(Frame):
+    """
+    Frame containing the back button and the number of generations to go back, and the seek button 
+    and the generation to seek to
+    """
+
+    def __init__(self,parent,caller,**args):
+        Frame.__init__(self,parent,**args)
+        self.pack(side=TOP)
+
+        self.backButton = Button(self,text='back',command = caller.back)
+        self.backButton.pack(side=LEFT)
+        self.backText = Spinbox(self,width=4,from_=1, to = 1000)
+        self.backText.pack(side=LEFT)
+        self.backText.bind('<Return>',lambda event:caller.back())
+
+        self.seekButton = Button(self,text='seek',command = caller.seek)
+        self.seekButton.pack(side=LEFT)
+        self.seekText = Entry(self,width=6)
+        self.seekText.pack(side=LEFT)
+        self.seekText.bind('<Return>',lambda event:caller.seek())
+
+class CycleFrame(Frame):
+    """
+    Frame containing the box which makes play stop once the pattern enters a cycle
+    """
+
+    def __init__(self,parent,caller,stopOnCycle,**args):
+        Frame.__init__(self,parent,**args)
+        self.pack(side=TOP)
+
+        self.stopVar = IntVar()
+        self.stopVar.set(stopOnCycle)
+        self.stopButton = Checkbutton(self,text='stop on cycle',variable=self.stopVar,command=caller.setStopOnCycle)
+        self.stopButton.pack(side=LEFT)
+
+class ProfileFrame(Frame):
+    """
+    Frame containing the box which turns profiling on and off
+    """
+
+    def __init__(self,parent,caller,**args):
+        Frame.__init__(self,parent,**args)
+        self.pack(side=TOP)
+
+        self.profileVar = IntVar()
+        self.profileButton = Checkbutton(self,text='profile',variable=self.profileVar,command=caller.profile)
+        self.profileButton.pack(side=LEFT)
+
+class ProfileWindow(Toplevel):
+    """
+    Window showing the summary of the profiler's timings and counters, refreshed every half second, 
+    with buttons to clear the profiler and to export it as JSON.
+
+    self.__caller = the Controller, told when the window is closed
+    self.__text = Text widget holding the summary
+    """
+
+    def __init__(self,parent,caller,**args):
+        Toplevel.__init__(self,parent,**args)
+        self.title("Profile")
+        self.__caller = caller
+        self.protocol("WM_DELETE_WINDOW",caller.closeProfile)
+
+        buttons = Frame(self)
+        buttons.pack(side=TOP)
+        self.clearButton = Button(buttons,text='clear',command=self.clear)
+        self.clearButton.pack(side=LEFT)
+        self.exportButton = Button(buttons,text='export',command=self.export)
+        self.exportButton.pack(side=LEFT)
+
+        self.__text = Text(self,width=80,height=24,font=('Courier',10))
+        self.__text.pack(side=TOP,fill=BOTH,expand=1)
+        self.refresh()
+
+    def refresh(self):
+        """
+        Shows the current summary, and calls itself again in half a second while profiling is on.
+        """
+        profiler = getProfiler()
+        if profiler is None:
+            return
+        self.__text.delete('1.0',END)
+        self.__text.insert(END,profiler.report())
+        self.after(500,self.refresh)
+
+    def clear(self):
+        """
+        Called when the 'clear' button is pressed.  Forgets every value recorded.
+        """
+        profiler = getProfiler()
+        if profiler is not None:
+            profiler.clear()
+
+    def export(self):
+        """
+        Called when the 'export' button is pressed.  Saves the profiler as JSON.
+        """
+        profiler = getProfiler()
+        file = tkFileDialog.asksaveasfile(mode='w',defaultextension = '.json',filetypes=[('JSON','.json')])
+        if file and profiler is not None:
+            profiler.export(file)
+            file.close()
+
+
 if __name__=="__main__": controller = Controller()
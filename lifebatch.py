@@ -0,0 +1,201 @@
+"""
+==================================================================
+                  Game of Life - batch runs
+==================================================================
+
+Runs the Game of Life without a display, for use on servers and from job schedulers.
+Only lifecore is used, so no GUI module is imported.
+
+Results (a .life pattern, or one still life per line) are written to the output file, or to
+standard output.  Timing statistics are written to standard error as 'name value' lines.
+With --profile, the timings and counters of the hot paths (see Profiler) are written to a JSON file.
+
+    python lifebatch.py run pattern.life -n 1000 -o result.life
+    python lifebatch.py random 1000 1000 37.5 --seed 42 -n 1000
+    python lifebatch.py still 8 8 6
+    python lifebatch.py still 12 12 14 --checkpoint runs/12x12x14 --processes 8
+    python lifebatch.py --profile profile.json run pattern.life -n 1000
+"""
+
+import argparse,sys,time
+from lifecore import ENGINES,enableProfiling,readPattern,writeLifeFile,writeBinaryLifeFile,writeRLE,writePlaintext,stillLifeCandidates,isStillPattern,searchStillLifes,\
+    revolvingDoorStillLifes,StillLifeEnumeration,StillLifeIndex
+
+
+def runPattern(args,out):
+    """
+    Loads a pattern from a .life, .rle or .cells file and runs it (see runLife).
+    Returns the statistics as a list of (name,value) pairs.
+    """
+    with open(args.pattern,'rb') as file:
+        life = readPattern(file,args.engine,args.rows,args.cols)
+    return runLife(life,args,out)
+
+def runRandom(args,out):
+    """
+    Fills a board of args.rows x args.cols at args.density percent from args.seed and runs it (see runLife).
+    The same seed gives the same board with every engine.  Returns the statistics as a list of (name,value) pairs.
+    """
+    start = time.time()
+    life = ENGINES[args.engine](args.rows,args.cols,args.density)
+    life.randomize(args.density,args.seed,args.stream)
+    seconds = time.time() - start
+    return runLife(life,args,out) + [('fillSeconds','%.6f' %seconds)]
+
+def runLife(life,args,out):
+    """
+    Runs life for args.generations generations and writes the result to out in args.format.
+    Stops early if the pattern dies out, or enters a cycle when args.stopOnCycle is set.
+    Returns the statistics as a list of (name,value) pairs.
+    """
+    nrows = life.getNrows()
+    ncols = life.getNcols()
+    life.findCycle()
+
+    start = time.time()
+    ngens = 0
+    while ngens < args.generations and life.getNcells():
+        life.update()
+        ngens += 1
+        if args.stopOnCycle and life.findCycle():
+            break
+    seconds = time.time() - start
+
+    if args.format == 'text':
+        writeLifeFile(out,nrows,ncols,life.getGeneration(),life.getTupleFromPattern())
+        out.write("\n")
+    elif args.format == 'rle':
+        writeRLE(out,life)
+    elif args.format == 'plaintext':
+        writePlaintext(out,life)
+    else:
+        writeBinaryLifeFile(out,life,compress=args.format == 'compressed')
+
+    cycle = life.getCycle()
+    if hasattr(life,'close'):
+        life.close()
+
+    return [('engine',args.engine),
+            ('rows',nrows),
+            ('cols',ncols),
+            ('generations',ngens),
+            ('population',life.getNcells()),
+            ('period',cycle[0] if cycle else 0),
+            ('seconds','%.6f' %seconds),
+            ('cellsPerSecond','%.0f' %(nrows*ncols*ngens/seconds if seconds else 0))]
+
+def findStillLifes(args,out):
+    """
+    Finds all still lifes of args.size cells on a board of args.rows x args.cols, writing each one
+    to out as a tuple on its own line.  Returns the statistics as a list of (name,value) pairs.
+    With args.method 'search' the backtracking search is used, with 'combinations' every candidate 
+    is tested with isStillPattern, and with 'revolving' the candidates are visited in revolving door order.
+    With args.checkpoint the search is split into units run by a pool of
+    processes and checkpointed to that directory (see StillLifeEnumeration); the still lifes are only 
+    written once every unit is done, which may need the processes sharing the directory to finish.
+    With args.unique only the first of the still lifes which are translations or reflections of each other
+    is written.
+    """
+    start = time.time()
+    ncandidates = 0
+    stats = []
+    if args.checkpoint:
+        enumeration = StillLifeEnumeration(args.checkpoint,args.rows,args.cols,args.size,args.depth)
+        nsearched = enumeration.run(args.processes)
+        remaining = len(enumeration.getRemaining())
+        patterns = enumeration.getResults() if not remaining else []
+        stats = [('units',len(enumeration.getUnits())),
+                 ('searched',nsearched),
+                 ('remaining',remaining)]
+    elif args.method == 'search':
+        patterns = searchStillLifes(args.rows,args.cols,args.size)
+    elif args.method == 'revolving':
+        patterns = revolvingDoorStillLifes(args.rows,args.cols,args.size)
+    else:
+        patterns = []
+        for pattern in stillLifeCandidates(args.rows,args.cols,args.size):
+            ncandidates += 1
+            if isStillPattern(pattern,args.rows,args.cols):
+                patterns.append(pattern)
+
+    index = StillLifeIndex(args.rows,args.cols)
+    nfound = 0
+    for pattern in patterns:
+        nfound += 1
+        if index.add(pattern) or not args.unique:
+            out.write("%s\n" %(pattern,))
+    seconds = time.time() - start
+
+    return [('method','checkpoint' if args.checkpoint else args.method),
+            ('rows',args.rows),
+            ('cols',args.cols),
+            ('size',args.size),
+            ('candidates',ncandidates),
+            ('stillLifes',nfound),
+            ('unique',len(index)),
+            ('seconds','%.6f' %seconds)] + stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Runs the Game of Life without a display.')
+    parser.add_argument('--engine',default='packed',choices=sorted(ENGINES),
+                        help='the engine used to evolve the board (default packed)')
+    parser.add_argument('-o','--output',help='file for the results (default standard output)')
+    parser.add_argument('--profile',help='file for the timings and counters of the hot paths, as JSON.  '
+                                         'Still life searches run by --processes are not included')
+    commands = parser.add_subparsers(dest='command')
+
+    run = commands.add_parser('run',help='run a pattern from a .life, .rle or .cells file')
+    run.add_argument('pattern',help='the pattern file')
+    run.add_argument('--rows',type=int,help='least number of rows of the board for an RLE or plaintext pattern')
+    run.add_argument('--cols',type=int,help='least number of columns of the board for an RLE or plaintext pattern')
+
+    random = commands.add_parser('random',help='run a random pattern')
+    random.add_argument('rows',type=int)
+    random.add_argument('cols',type=int)
+    random.add_argument('density',type=float,help='percentage of live cells')
+    random.add_argument('--seed',type=int,help='seed giving a reproducible board (default random)')
+    random.add_argument('--stream',type=int,help='independent stream of the seed, for example one per job')
+
+    for command in run,random:
+        command.add_argument('-n','--generations',type=int,default=1,help='number of generations to run')
+        command.add_argument('--format',default='text',choices=['text','binary','compressed','rle','plaintext'],
+                             help='format of the resulting pattern (default text .life)')
+        command.add_argument('--stop-on-cycle',dest='stopOnCycle',action='store_true',
+                             help='stop once the pattern enters a cycle')
+
+    still = commands.add_parser('still',help='find all still lifes of a given size')
+    still.add_argument('rows',type=int)
+    still.add_argument('cols',type=int)
+    still.add_argument('size',type=int,help='number of live cells')
+    still.add_argument('--method',default='search',choices=['search','combinations','revolving'],
+                       help='backtracking search, or test every candidate in lexicographic or revolving door order '
+                            '(default search)')
+    still.add_argument('--unique',action='store_true',
+                       help='only write one of the still lifes which are translations or reflections of each other')
+    still.add_argument('--checkpoint',help='directory for a resumable search split into units, which may be shared')
+    still.add_argument('--processes',type=int,help='processes searching units (default the number of CPUs)')
+    still.add_argument('--depth',type=int,help='cells decided by each unit (default two rows)')
+
+    args = parser.parse_args(argv)
+
+    profiler = enableProfiling() if args.profile else None
+    out = open(args.output,'wb') if args.output else sys.stdout
+    try:
+        if args.command == 'run':
+            stats = runPattern(args,out)
+        elif args.command == 'random':
+            stats = runRandom(args,out)
+        else:
+            stats = findStillLifes(args,out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    for name,value in stats:
+        sys.stderr.write("%s %s\n" %(name,value))
+
+    if profiler is not None:
+        with open(args.profile,'w') as file:
+            profiler.export(file)
+
+if __name__=="__main__": main()
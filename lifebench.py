@@ -0,0 +1,443 @@
+"""
+==================================================================
+                  Game of Life - benchmarks
+==================================================================
+
+Times the engines, the still life searches, the file formats and the renderers on seeded random boards,
+so that runs of different versions of the code can be compared.
+
+Each result is written to the output file, or to standard output, as one JSON object per line.  The first line
+describes the environment.  Every result has the fields identifying what was measured (benchmark, engine, rows, ...)
+followed by its measurements, and each rate ends in 'PerSecond'.  compare reports the speedup of each rate between
+two runs, and exits with status 1 if any has slowed down by more than the threshold.
+
+    python lifebench.py all -o before.json
+    python lifebench.py update --engines list packed --sizes 64 256 --densities 10 50
+    python lifebench.py compare before.json after.json
+"""
+
+import argparse,gc,json,os,platform,shutil,sys,tempfile,time
+from lifecore import ENGINES,numpy,readPattern,writeLifeFile,writeBinaryLifeFile,writeRLE,writePlaintext,\
+    stillLifeCandidates,isStillPattern,searchStillLifes,revolvingDoorStillLifes
+
+# The fields which are measurements, rather than identifying what was measured
+MEASUREMENTS = set(['seconds','generations','population','candidates','stillLifes','complete','bytes','saves','loads',
+                    'saveSeconds','loadSeconds','frames','items','trials'])
+
+
+def timeRepeated(function,minSeconds):
+    """
+    Calls function until at least minSeconds have passed, and at least once.  Returns (calls,seconds).
+    The garbage collector is turned off meanwhile, as in bestOf.
+    """
+    calls = 0
+    start = time.time()
+    seconds = 0.0
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while calls == 0 or seconds < minSeconds:
+            function()
+            calls += 1
+            seconds = time.time() - start
+    finally:
+        if enabled:
+            gc.enable()
+    return calls,seconds
+
+def bestOf(trial,minSeconds):
+    """
+    Calls trial, which returns the seconds it measured, until they add up to at least minSeconds, and at least once.
+    Returns (trials,best), where best is the shortest time measured, the one least disturbed by other work on the machine.
+    As in timeit, the garbage collector is turned off during the trials so that its pauses don't land in some trials only.
+    """
+    trials = 0
+    total = 0.0
+    best = None
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while trials == 0 or total < minSeconds:
+            seconds = trial()
+            trials += 1
+            total += seconds
+            best = seconds if best is None else min(best,seconds)
+    finally:
+        if enabled:
+            gc.enable()
+    return trials,best
+
+def rate(count,seconds):
+    """
+    Returns count/seconds, or 0 when no time was measured.
+    """
+    return count/seconds if seconds else 0.0
+
+def randomLife(engine,nrows,ncols,density,seed):
+    """
+    Returns a new board of ENGINES[engine] filled at density percent from seed.
+    """
+    life = ENGINES[engine](nrows,ncols,density)
+    life.randomize(density,seed)
+    return life
+
+def closeLife(life):
+    """
+    Closes the board if its engine holds resources, such as worker processes or a file.
+    """
+    if hasattr(life,'close'):
+        life.close()
+
+def environment(args):
+    """
+    Returns the record describing the interpreter, numpy and machine that the benchmarks were run on.
+    """
+    return {'benchmark':'environment',
+            'python':platform.python_version(),
+            'numpy':numpy.__version__ if numpy is not None else None,
+            'platform':platform.platform(),
+            'processor':platform.processor(),
+            'time':time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'seed':args.seed}
+
+
+def benchUpdate(args):
+    """
+    Generates a record of the generations per second of each engine, for each square board size and density.
+    Each trial times args.generations generations of the same seeded board, so that every trial does the same work, 
+    and the best of the trials run in args.seconds is kept.  The first generation is run before timing starts.  
+    The population at the end shows whether the board had died out.
+    """
+    for engine in args.engines:
+        for size in args.sizes:
+            for density in args.densities:
+                generations = args.generations
+                populations = []
+                def trial():
+                    life = randomLife(engine,size,size,density,args.seed)
+                    life.update()
+                    start = time.time()
+                    for k in xrange(generations):
+                        life.update()
+                    seconds = time.time() - start
+                    populations.append(life.getNcells())
+                    closeLife(life)
+                    return seconds
+                trials,seconds = bestOf(trial,args.seconds)
+                yield {'benchmark':'update',
+                       'engine':engine,
+                       'rows':size,
+                       'cols':size,
+                       'density':density,
+                       'generations':generations,
+                       'population':populations[-1],
+                       'trials':trials,
+                       'seconds':seconds,
+                       'generationsPerSecond':rate(generations,seconds),
+                       'cellsPerSecond':rate(size*size*generations,seconds)}
+
+def benchStill(args):
+    """
+    Generates a record for each still life method and number of cells on a board of args.rows x args.cols.
+    The search and revolving door methods are run to completion.  The candidates of the combinations method are
+    tested until they run out or args.seconds have passed, so 'complete' shows whether it finished.
+    """
+    for n in args.cells:
+        for method in args.methods:
+            candidates = 0
+            complete = True
+            start = time.time()
+            if method == 'search':
+                found = sum(1 for pattern in searchStillLifes(args.rows,args.cols,n))
+            elif method == 'revolving':
+                found = len(revolvingDoorStillLifes(args.rows,args.cols,n))
+            else:
+                found = 0
+                for pattern in stillLifeCandidates(args.rows,args.cols,n):
+                    candidates += 1
+                    if isStillPattern(pattern,args.rows,args.cols):
+                        found += 1
+                    if time.time() - start > args.seconds:
+                        complete = False
+                        break
+            seconds = time.time() - start
+            record = {'benchmark':'still',
+                      'method':method,
+                      'rows':args.rows,
+                      'cols':args.cols,
+                      'size':n,
+                      'stillLifes':found,
+                      'complete':complete,
+                      'seconds':seconds}
+            if method == 'combinations':
+                record['candidates'] = candidates
+                record['candidatesPerSecond'] = rate(candidates,seconds)
+            else:
+                record['completionsPerSecond'] = rate(1,seconds)
+            yield record
+
+def loadLife(path,engine,nrows,ncols):
+    """
+    Reads the board at path into a new board of ENGINES[engine] and closes it again.
+    """
+    with open(path,'rb') as file:
+        closeLife(readPattern(file,engine,nrows,ncols))
+
+def saveLife(life,path,format):
+    """
+    Writes the board of life to path in format (text, binary, compressed, rle or plaintext).
+    """
+    with open(path,'wb') as file:
+        if format == 'text':
+            writeLifeFile(file,life.getNrows(),life.getNcols(),life.getGeneration(),life.getTupleFromPattern())
+        elif format == 'rle':
+            writeRLE(file,life)
+        elif format == 'plaintext':
+            writePlaintext(file,life)
+        else:
+            writeBinaryLifeFile(file,life,compress=format == 'compressed')
+
+def benchFiles(args):
+    """
+    Generates a record of the save and load throughput of each file format, for a board of args.size x args.size
+    filled at args.density percent.  Each is repeated for at least args.seconds.  The files are written to a 
+    temporary directory, which is removed afterwards.
+    """
+    extensions = {'text':'.life','binary':'.life','compressed':'.life','rle':'.rle','plaintext':'.cells'}
+    directory = tempfile.mkdtemp(prefix='lifebench')
+    try:
+        for engine in args.engines:
+            life = randomLife(engine,args.size,args.size,args.density,args.seed)
+            for format in args.formats:
+                path = os.path.join(directory,format + extensions[format])
+                saves,saveSeconds = timeRepeated(lambda:saveLife(life,path,format),args.seconds)
+                loads,loadSeconds = timeRepeated(lambda:loadLife(path,engine,args.size,args.size),args.seconds)
+
+                size = os.path.getsize(path)
+                cells = args.size*args.size
+                yield {'benchmark':'files',
+                       'engine':engine,
+                       'format':format,
+                       'rows':args.size,
+                       'cols':args.size,
+                       'density':args.density,
+                       'bytes':size,
+                       'saves':saves,
+                       'loads':loads,
+                       'saveSeconds':saveSeconds,
+                       'loadSeconds':loadSeconds,
+                       'saveCellsPerSecond':rate(cells*saves,saveSeconds),
+                       'loadCellsPerSecond':rate(cells*loads,loadSeconds),
+                       'saveMegabytesPerSecond':rate(size*saves/1e6,saveSeconds),
+                       'loadMegabytesPerSecond':rate(size*loads/1e6,loadSeconds)}
+            closeLife(life)
+    finally:
+        shutil.rmtree(directory)
+
+
+class StubCanvas(object):
+    """
+    Stands in for a tkinter canvas when timing the renderers, so that no display is needed.  Each call is
+    counted and returns a new item number, and the visible window is the whole board.
+
+    self.__width, self.__height = the size of the window in pixels
+    self.__items = the number of canvas calls made
+    """
+    def __init__(self,width,height):
+        self.__width = width
+        self.__height = height
+        self.__items = 0
+
+    def __call(self,*args,**kwargs):
+        self.__items += 1
+        return self.__items
+
+    create_rectangle = create_line = create_image = delete = coords = itemconfig = update = __call
+
+    def canvasx(self,x):
+        return x
+
+    def canvasy(self,y):
+        return y
+
+    def winfo_width(self):
+        return self.__width
+
+    def winfo_height(self):
+        return self.__height
+
+    def getItems(self):
+        """
+        getter for items
+        """
+        return self.__items
+
+def rendererClasses():
+    """
+    Returns a dictionary mapping the name of each renderer of life.py that can be timed here to its class.
+    The renderers need Tkinter, and the raster renderer also needs a display for its images.
+    """
+    try:
+        import Tkinter
+        import life as gui
+    except ImportError:
+        sys.stderr.write("renderers skipped: Tkinter is not available\n")
+        return {}
+    classes = {'cells':gui.CellRenderer}
+    if numpy is not None:
+        try:
+            if Tkinter._default_root is None:
+                Tkinter.Tk().withdraw()
+            classes['raster'] = gui.RasterRenderer
+        except Tkinter.TclError as error:
+            sys.stderr.write("raster renderer skipped: %s\n" %error)
+    return classes
+
+def benchRender(args):
+    """
+    Generates a record of the time per frame of each renderer, for each engine and square board size, drawing on a 
+    StubCanvas.  Each trial draws args.frames frames of the same seeded board, advancing it one generation 
+    between frames, which is not included in the time.  The best of the trials run in args.seconds is kept.
+    """
+    classes = rendererClasses()
+    for engine in args.engines:
+        for size in args.sizes:
+            canvas = StubCanvas(size*args.cellWidth + 2*args.margin,size*args.cellWidth + 2*args.margin)
+            draws = {'printBoardGraphics':lambda life:life.printBoardGraphics(canvas,args.cellWidth,args.margin)}
+            for name,renderer in classes.items():
+                draws[name] = renderer(canvas,args.cellWidth,args.margin).draw
+            for name,draw in sorted(draws.items()):
+                frames = args.frames
+                items = []
+                def trial():
+                    life = randomLife(engine,size,size,args.density,args.seed)
+                    draw(life)
+                    start = canvas.getItems()
+                    seconds = 0.0
+                    for k in xrange(frames):
+                        life.update()
+                        t = time.time()
+                        draw(life)
+                        seconds += time.time() - t
+                    items.append(canvas.getItems() - start)
+                    closeLife(life)
+                    return seconds
+                trials,seconds = bestOf(trial,args.seconds)
+                yield {'benchmark':'render',
+                       'renderer':name,
+                       'engine':engine,
+                       'rows':size,
+                       'cols':size,
+                       'density':args.density,
+                       'frames':frames,
+                       'items':items[-1],
+                       'trials':trials,
+                       'seconds':seconds,
+                       'framesPerSecond':rate(frames,seconds)}
+
+
+def readResults(path):
+    """
+    Returns a dictionary mapping the identifying fields of each result in the JSON lines file at path to the result.
+    """
+    results = {}
+    with open(path) as file:
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                if record['benchmark'] != 'environment':
+                    key = tuple(sorted([(name,value) for name,value in record.items()
+                                        if name not in MEASUREMENTS and not name.endswith('PerSecond')]))
+                    results[key] = record
+    return results
+
+def compareResults(args,out):
+    """
+    Writes the speedup of each rate measured in both args.before and args.after, one per line.  Speedups below
+    args.threshold are marked as regressions.  Returns the number of regressions.
+    """
+    before = readResults(args.before)
+    after = readResults(args.after)
+    regressions = 0
+    for key in sorted(set(before) & set(after)):
+        old = before[key]
+        new = after[key]
+        for name in sorted(old):
+            if name.endswith('PerSecond') and name in new and old[name]:
+                speedup = new[name]/old[name]
+                slow = speedup < args.threshold
+                regressions += slow
+                label = " ".join(["%s=%s" %(field,value) for field,value in key])
+                out.write("%s %s %.3f%s\n" %(label,name,speedup,'  REGRESSION' if slow else ''))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Times the Game of Life on seeded boards.')
+    parser.add_argument('-o','--output',help='file for the results (default standard output)')
+    parser.add_argument('--seed',type=int,default=1,help='seed for the random boards (default 1)')
+    parser.add_argument('--seconds',type=float,default=0.5,
+                        help='least time spent repeating each measurement, and testing candidates (default 0.5)')
+    commands = parser.add_subparsers(dest='command')
+
+    engines = sorted(ENGINES)
+    update = commands.add_parser('update',help='generations per second of each engine')
+    update.add_argument('--engines',nargs='+',default=engines,choices=engines)
+    update.add_argument('--sizes',nargs='+',type=int,default=[64,256,1024],help='rows and columns of each board')
+    update.add_argument('--densities',nargs='+',type=float,default=[10,37.5],help='percentages of live cells')
+    update.add_argument('-n','--generations',type=int,default=10,help='generations timed on each board (default 10)')
+
+    still = commands.add_parser('still',help='time to find the still lifes of each size')
+    still.add_argument('--rows',type=int,default=8)
+    still.add_argument('--cols',type=int,default=8)
+    still.add_argument('--cells',nargs='+',type=int,default=range(4,11),help='numbers of live cells (default 4 to 10)')
+    still.add_argument('--methods',nargs='+',default=['search','combinations'],
+                       choices=['search','combinations','revolving'])
+
+    files = commands.add_parser('files',help='save and load throughput of each file format')
+    files.add_argument('--engines',nargs='+',default=['packed'],choices=engines)
+    files.add_argument('--formats',nargs='+',default=['text','binary','compressed','rle','plaintext'],
+                       choices=['text','binary','compressed','rle','plaintext'])
+    files.add_argument('--size',type=int,default=1024,help='rows and columns of the board (default 1024)')
+    files.add_argument('--density',type=float,default=37.5)
+
+    render = commands.add_parser('render',help='time per frame of each renderer')
+    render.add_argument('--engines',nargs='+',default=['list','packed'],choices=engines)
+    render.add_argument('--sizes',nargs='+',type=int,default=[64,256])
+    render.add_argument('--density',type=float,default=37.5)
+    render.add_argument('--frames',type=int,default=10,help='frames timed on each board (default 10)')
+    render.add_argument('--cell-width',dest='cellWidth',type=int,default=4)
+    render.add_argument('--margin',type=int,default=25)
+
+    commands.add_parser('all',help='every benchmark with its default settings')
+
+    compare = commands.add_parser('compare',help='speedup of each rate between two runs')
+    compare.add_argument('before')
+    compare.add_argument('after')
+    compare.add_argument('--threshold',type=float,default=0.9,
+                         help='speedups below this are regressions (default 0.9)')
+
+    args = parser.parse_args(argv)
+
+    out = open(args.output,'w') if args.output else sys.stdout
+    try:
+        if args.command == 'compare':
+            return 1 if compareResults(args,out) else 0
+
+        if args.command == 'all':
+            benchmarks = []
+            for command,bench in [('update',benchUpdate),('still',benchStill),('files',benchFiles),('render',benchRender)]:
+                defaults = parser.parse_args(['--seed',str(args.seed),'--seconds',str(args.seconds),command])
+                benchmarks.append(bench(defaults))
+        else:
+            benchmarks = [{'update':benchUpdate,'still':benchStill,'files':benchFiles,'render':benchRender}[args.command](args)]
+
+        out.write(json.dumps(environment(args),sort_keys=True) + "\n")
+        for records in benchmarks:
+            for record in records:
+                out.write(json.dumps(record,sort_keys=True) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+if __name__=="__main__": sys.exit(main())
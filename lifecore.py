@@ -0,0 +1,3802 @@
+"""
+==================================================================
+                          Game of Life
+==================================================================
+(c) Christian J. Burnham, DT12127103, Dublin Institute of Technology, Jun 2013
+------------------------------------------------------------------
+
+This code implements the 'Game of Life' cellular automaton, using the rules 
+invented by John Horton Conway.  
+
+The code can also be used to perform searches for 'still lifes'.
+
+Periodic (toroidal) boundary conditions are used for the 'simulation'.  
+
+Still life searches are done within a 1-cell margin so that boundary conditions have no 
+effect on the resulting patterns and each pattern 
+remains a still-life when embedded in any larger board.
+
+This module holds the boards, engines and searches, and imports no GUI module, so it can be used 
+on machines without a display (see lifebatch.py).  The Tkinter interface is in life.py.
+"""
+
+from itertools import combinations,imap
+from random import Random
+import multiprocessing
+import ast,binascii,copy,errno,imp,json,os,re,socket,struct,tempfile,time,zlib
+from cStringIO import StringIO
+from collections import deque
+from array import array
+
+
+class LazyModule(object):
+    """
+    Stands in for a module which is imported on first use, so that programs which never use it 
+    do not pay for the import when they start.
+
+    self.__name = the name of the module
+    self.__module = the module once imported, otherwise None
+    """
+    def __init__(self,name):
+        self.__name = name
+        self.__module = None
+
+    def __getattr__(self,attr):
+        if self.__module is None:
+            self.__module = __import__(self.__name)
+        return getattr(self.__module,attr)
+
+# numpy is optional.  It takes longer to import than the rest of the program, so it is only imported 
+# once an engine which needs it is used.
+try:
+    imp.find_module('numpy')
+    numpy = LazyModule('numpy')
+except ImportError:
+    numpy = None
+
+
+class Profiler(object):
+    """
+    Timings and counters recorded by the hot paths, for finding where the time goes.  Each name (such as 'update.rules' 
+    or 'update.births') has a ring buffer of its most recent values, one per call of the code recording it, as well as 
+    the number and total of all its values.  Timings are in seconds.
+
+    Profiling is off unless enableProfiling has been called.  The code recording values only looks up PROFILER once 
+    per call and does nothing more when it is None, so profiling costs essentially nothing when it is off.
+
+    self.__size = the number of recent values remembered for each name
+    self.__recent = dictionary mapping each name to a deque of its recent values
+    self.__totals = dictionary mapping each name to [count,total] of all its values
+    self.__timings = set of the names which are timings rather than counters
+    """
+    def __init__(self,size=1000):
+        self.__size = size
+        self.clear()
+
+    def clear(self):
+        """
+        Forgets every value.
+        """
+        self.__recent = {}
+        self.__totals = {}
+        self.__timings = set()
+
+    def addTime(self,name,seconds):
+        """
+        Records a timing in seconds.
+        """
+        self.__timings.add(name)
+        self.addCount(name,seconds)
+
+    def addCount(self,name,value):
+        """
+        Records the value of a counter.  Values may be recorded by one thread while another calls clear().
+        """
+        recent = self.__recent.get(name)
+        if recent is None:
+            recent = self.__recent.setdefault(name,deque(maxlen=self.__size))
+        recent.append(value)
+        totals = self.__totals.get(name)
+        if totals is None:
+            totals = self.__totals.setdefault(name,[0,0])
+        totals[0] += 1
+        totals[1] += value
+
+    def getNames(self):
+        """
+        Returns the names recorded, in order.
+        """
+        return sorted(self.__recent.keys())
+
+    def getRecent(self,name):
+        """
+        Returns a list of the recent values of name, oldest first.
+        """
+        return list(self.__recent.get(name,()))
+
+    def summary(self,name):
+        """
+        Returns a dictionary of statistics for name: the count and total of all its values, and the mean, 
+        median, 95th percentile, minimum, maximum and last of its recent values.
+        """
+        recent = self.getRecent(name)
+        values = sorted(recent)
+        count,total = self.__totals.get(name,(0,0))
+        stats = {'count':count,'total':total,'timing':name in self.__timings}
+        if values:
+            stats.update({'mean':sum(values)/float(len(values)),
+                          'median':values[len(values)/2],
+                          'p95':values[min(len(values) - 1,len(values)*95/100)],
+                          'min':values[0],
+                          'max':values[-1],
+                          'last':recent[-1]})
+        return stats
+
+    def report(self):
+        """
+        Returns a table of the summary of every name, one line each, with timings in milliseconds.
+        """
+        lines = ['%-24s %8s %10s %10s %10s %12s' %('name','count','mean','p95','max','total')]
+        for name in self.getNames():
+            stats = self.summary(name)
+            if 'mean' not in stats:
+                continue
+            scale = 1000.0 if stats['timing'] else 1.0
+            unit = ' ms' if stats['timing'] else ''
+            lines.append('%-24s %8d %10.3f %10.3f %10.3f %12.3f%s' %(name,stats['count'],stats['mean']*scale,
+                         stats['p95']*scale,stats['max']*scale,stats['total']*scale,unit))
+        return "\n".join(lines)
+
+    def export(self,file):
+        """
+        Writes the summary and the recent values of every name to the open file as JSON.
+        """
+        data = {}
+        for name in self.getNames():
+            data[name] = self.summary(name)
+            data[name]['recent'] = self.getRecent(name)
+        json.dump({'size':self.__size,'names':data},file,indent=1,sort_keys=True)
+        file.write("\n")
+
+# The Profiler recording timings and counters, or None when profiling is off
+PROFILER = None
+
+def enableProfiling(size=1000):
+    """
+    Turns profiling on, keeping size recent values for each name, and returns the Profiler.  
+    If profiling is already on, the existing Profiler is returned.
+    """
+    global PROFILER
+    if PROFILER is None:
+        PROFILER = Profiler(size)
+    return PROFILER
+
+def disableProfiling():
+    """
+    Turns profiling off.
+    """
+    global PROFILER
+    PROFILER = None
+
+def getProfiler():
+    """
+    Returns the Profiler, or None when profiling is off.  Modules which import lifecore with * must use this, 
+    since their own copy of PROFILER is not changed by enableProfiling.
+    """
+    return PROFILER
+
+MASK64 = (1 << 64) - 1
+
+def cellKey(index):
+    """
+    Returns the 64 bit Zobrist key of the cell with the 1D integer encoding index.
+    The key is a hash of the index (splitmix64) rather than an entry of a random table, so no memory is
+    needed per cell and every engine finds the same keys.
+    """
+    z = (index + 0x9E3779B97F4A7C15) & MASK64
+    z = ((z ^ (z >> 30))*0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27))*0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+def cellKeys(indices):
+    """
+    Returns a numpy array of the Zobrist keys (see cellKey) of the cells with the 1D integer encodings in the numpy array indices.
+    """
+    z = indices.astype(numpy.uint64) + numpy.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> numpy.uint64(30)))*numpy.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> numpy.uint64(27)))*numpy.uint64(0x94D049BB133111EB)
+    z ^= z >> numpy.uint64(31)
+    return z
+
+def cellKeysHash(indices):
+    """
+    Returns the XOR of the Zobrist keys of the cells with the 1D integer encodings in the numpy array indices.
+    Gives the same result as combining cellKey for each index.
+    """
+    z = cellKeys(indices)
+    return int(numpy.bitwise_xor.reduce(z)) if len(z) else 0
+
+
+def randomStream(seed=None,stream=None):
+    """
+    Returns a numpy RandomState seeded by seed, or by (seed,stream) to give independent reproducible streams, 
+    for example one per board of an ensemble or per process.  With seed None the state is seeded by the operating system.
+    """
+    if seed is None:
+        return numpy.random.RandomState()
+    return numpy.random.RandomState(seed if stream is None else [seed,stream])
+
+def randomRows(nrows,ncols,percentage,seed=None,stream=None):
+    """
+    Generates a random board of nrows x ncols as 2D numpy arrays of uint8 (0 or 1) holding about 1M cells of whole rows 
+    each, where each cell is live with probability percentage/100.  percentage needn't be an integer.  The same seed and 
+    stream always give the same board.  Requires numpy.
+    """
+    rng = randomStream(seed,stream)
+    # Cells are live when a random 32 bit integer is below the threshold.
+    threshold = int(round(percentage/100.0*(1 << 32)))
+    chunkRows = max(1,(1 << 20)/max(1,ncols))
+    for r0 in xrange(0,nrows,chunkRows):
+        shape = (min(nrows - r0,chunkRows),ncols)
+        if threshold >= 1 << 32:
+            yield numpy.ones(shape,dtype=numpy.uint8)
+        else:
+            yield (rng.randint(0,1 << 32,size=shape,dtype=numpy.uint32) < numpy.uint32(max(threshold,0))).view(numpy.uint8)
+
+def randomCells(nrows,ncols,percentage,seed=None,stream=None):
+    """
+    Generates the rows of a random board of nrows x ncols as lists of 0s and 1s, where each cell is live with probability 
+    percentage/100.  Uses randomRows when numpy is available, otherwise Python's random module seeded by (seed,stream), 
+    which gives a different board for the same seed.
+    """
+    if numpy is not None:
+        for chunk in randomRows(nrows,ncols,percentage,seed,stream):
+            for row in chunk.tolist():
+                yield row
+    else:
+        rng = Random(seed if stream is None or seed is None else (seed,stream))
+        p = percentage/100.0
+        for i in xrange(nrows):
+            yield [1 if rng.random() < p else 0 for j in xrange(ncols)]
+
+
+class CycleDetector(object):
+    """
+    Bounded history of board hashes, used to find when a board enters a cycle.
+
+    self.__size = the number of generations remembered, which is the longest period that can be found
+    self.__generations = dictionary mapping each remembered hash to the generation it was seen at
+    self.__order = deque of the remembered (hash,generation) pairs, oldest first
+    self.__cycle = (period,start) once a cycle has been found, otherwise None
+    """
+    def __init__(self,size=1024):
+        self.__size = size
+        self.clear()
+
+    def clear(self):
+        """
+        Forgets the history.
+        """
+        self.__generations = {}
+        self.__order = deque()
+        self.__cycle = None
+
+    def record(self,hash,generation):
+        """
+        Records the hash of the board at a generation.  Returns (period,start) if the same hash has been seen before, 
+        where start is the first generation of the cycle, otherwise None.  Recording the same generation twice has no effect.
+        """
+        if self.__cycle is not None:
+            return self.__cycle
+        if self.__order and self.__order[-1] == (hash,generation):
+            return None
+
+        start = self.__generations.get(hash)
+        if start is not None:
+            self.__cycle = (generation - start,start)
+            return self.__cycle
+
+        self.__generations[hash] = generation
+        self.__order.append((hash,generation))
+        if len(self.__order) > self.__size:
+            del self.__generations[self.__order.popleft()[0]]
+        return None
+
+    def getCycle(self):
+        """
+        getter for cycle
+        """
+        return self.__cycle
+
+    def copy(self):
+        """
+        Returns an independent copy of the history.
+        """
+        other = CycleDetector(self.__size)
+        other.__generations = dict(self.__generations)
+        other.__order = deque(self.__order)
+        other.__cycle = self.__cycle
+        return other
+
+
+class Occupancy(object):
+    """
+    Number of live cells in each row and column of a board, and the bounding box of the live cells.  
+    Births, deaths and edits are added one cell at a time in O(1).  The bounding box grows with births, and is only 
+    recomputed from the row and column counts when a death empties one of its edge rows or columns.
+    Boards which are stepped as a whole mark the counts stale, and they are recounted from the board when next needed.
+
+    self.__nrows, self.__ncols = the size of the board
+    self.__rowCounts = list (nrows) of the number of live cells in each row, or None when stale
+    self.__colCounts = list (ncols) of the number of live cells in each column, or None when stale
+    self.__box = [imin,jmin,imax,jmax], the first and last rows and columns containing live cells (imin > imax when there 
+                 are none), or None when it must be recomputed from the counts
+    """
+    def __init__(self,nrows,ncols):
+        self.__nrows = nrows
+        self.__ncols = ncols
+        self.clear()
+
+    def clear(self):
+        """
+        Sets the counts for a blank board.
+        """
+        self.__rowCounts = [0]*self.__nrows
+        self.__colCounts = [0]*self.__ncols
+        self.__box = [self.__nrows,self.__ncols,-1,-1]
+
+    def invalidate(self):
+        """
+        Marks the counts stale, after the board has been changed as a whole.
+        """
+        self.__rowCounts = None
+        self.__colCounts = None
+        self.__box = None
+
+    def isStale(self):
+        """
+        Returns True if the counts must be recounted from the board.
+        """
+        return self.__rowCounts is None
+
+    def setCounts(self,rowCounts,colCounts):
+        """
+        Sets the counts recounted from the board.
+        """
+        self.__rowCounts = list(rowCounts)
+        self.__colCounts = list(colCounts)
+        self.__box = None
+
+    def add(self,i,j,delta):
+        """
+        Adds delta (+1 for a birth, -1 for a death) to the counts of row i and column j.  Does nothing when the counts are stale.
+        """
+        rowCounts = self.__rowCounts
+        if rowCounts is None:
+            return
+        colCounts = self.__colCounts
+        rowCounts[i] += delta
+        colCounts[j] += delta
+        box = self.__box
+        if box is None:
+            return
+        if delta > 0:
+            if i < box[0]: box[0] = i
+            if j < box[1]: box[1] = j
+            if i > box[2]: box[2] = i
+            if j > box[3]: box[3] = j
+        elif (not rowCounts[i] and (i == box[0] or i == box[2])) or (not colCounts[j] and (j == box[1] or j == box[3])):
+            self.__box = None
+
+    def getRowCounts(self):
+        """
+        getter for rowCounts.  Note, the list is updated in place, so it must not be changed.
+        """
+        return self.__rowCounts
+
+    def getColCounts(self):
+        """
+        getter for colCounts.  Note, the list is updated in place, so it must not be changed.
+        """
+        return self.__colCounts
+
+    def getBoundingBox(self):
+        """
+        Returns (imin,jmin,imax,jmax), the first and last rows and columns containing live cells, or None if there are none.
+        """
+        if self.__box is None:
+            rows = [i for i,n in enumerate(self.__rowCounts) if n]
+            cols = [j for j,n in enumerate(self.__colCounts) if n]
+            if rows:
+                self.__box = [rows[0],cols[0],rows[-1],cols[-1]]
+            else:
+                self.__box = [self.__nrows,self.__ncols,-1,-1]
+        if self.__box[0] > self.__box[2]:
+            return None
+        return tuple(self.__box)
+
+    def copy(self):
+        """
+        Returns an independent copy of the counts.
+        """
+        other = Occupancy(self.__nrows,self.__ncols)
+        if self.isStale():
+            other.invalidate()
+        else:
+            other.setCounts(self.__rowCounts,self.__colCounts)
+            other.__box = None if self.__box is None else list(self.__box)
+        return other
+
+
+class GenerationHistory(object):
+    """
+    Bounded history of the boards of the recent generations of a game, for going back and seeking without
+    recomputing from the start.  Every interval-th generation recorded is kept as a keyframe holding its live cells, 
+    and the generations in between as deltas holding the cells born or died since the generation before.
+    Once the frames take more than maxBytes, the oldest keyframe is evicted along with the deltas which follow it.
+    A generation is rebuilt from the nearest keyframe before it, or from the board last recorded or restored
+    when that is nearer, by toggling the cells of the deltas in between.
+    The boards are flat numpy arrays of uint8 when numpy is available, and sets of 1D integers otherwise.
+
+    self.__nrows, self.__ncols = the size of the board
+    self.__interval = the greatest number of generations from one keyframe to the next
+    self.__maxBytes = the memory the frames may take before the oldest are evicted
+    self.__frames = dictionary mapping each generation held to (isKeyframe,cells), where cells is an array of 1D integers
+    self.__keyframes = deque of the generations of the keyframes held, oldest first
+    self.__first, self.__last = the first and last generations held, or None when there are none
+    self.__bytes = the memory taken by the frames
+    self.__board = the board of generation self.__current, or None
+    self.__current = the generation last recorded or restored
+    self.__hash = the hash of the board of generation self.__current
+    """
+    def __init__(self,nrows,ncols,interval=64,maxBytes=64<<20):
+        self.__nrows = nrows
+        self.__ncols = ncols
+        self.__interval = interval
+        self.__maxBytes = maxBytes
+        self.clear()
+
+    def clear(self):
+        """
+        Forgets every generation.
+        """
+        self.__frames = {}
+        self.__keyframes = deque()
+        self.__first = None
+        self.__last = None
+        self.__bytes = 0
+        self.__board = None
+        self.__current = None
+        self.__hash = None
+
+    def getFirst(self):
+        """
+        getter for first
+        """
+        return self.__first
+
+    def getLast(self):
+        """
+        getter for last
+        """
+        return self.__last
+
+    def getBytes(self):
+        """
+        getter for bytes
+        """
+        return self.__bytes
+
+    def __contains__(self,generation):
+        return generation in self.__frames
+
+    def __len__(self):
+        return len(self.__frames)
+
+    def record(self,life):
+        """
+        Records the current generation of life, replacing any generations held from it on.  Does nothing if it
+        is the generation last recorded or restored and the board is unchanged, so it can be called both before 
+        and after each step to catch edits made in between.
+        """
+        generation = life.getGeneration()
+        if generation == self.__current and life.getHash() == self.__hash:
+            return
+
+        profiler = PROFILER
+        if profiler is not None:
+            start = time.time()
+
+        board = self.__getBoard(life)
+        while self.__last is not None and self.__last >= generation:
+            self.__drop(self.__last)
+
+        if self.__current == generation - 1 and self.__last == generation - 1 and \
+           generation - self.__keyframes[-1] < self.__interval:
+            frame = (False,self.__cells(board,self.__board))
+        else:
+            frame = (True,self.__cells(board))
+            self.__keyframes.append(generation)
+        self.__frames[generation] = frame
+        self.__bytes += self.__size(frame[1])
+        self.__last = generation
+        if self.__first is None:
+            self.__first = generation
+
+        while self.__bytes > self.__maxBytes and len(self.__keyframes) > 1:
+            self.__evict()
+
+        self.__board = board
+        self.__current = generation
+        self.__hash = life.getHash()
+
+        if profiler is not None:
+            profiler.addTime('history.record',time.time() - start)
+            profiler.addCount('history.bytes',self.__bytes)
+
+    def restore(self,life,generation):
+        """
+        Sets the board and generation of life to those of the generation held.  Raises ValueError if it is not held.
+        """
+        if generation not in self.__frames:
+            raise ValueError('generation %d is not in the history' %generation)
+
+        profiler = PROFILER
+        if profiler is not None:
+            start = time.time()
+
+        # Rebuild from the latest keyframe at or before the generation, or from the current board if fewer
+        # deltas lie between.  Going back from the current board is only possible while no keyframe is in the way.
+        keyframe = max(k for k in self.__keyframes if k <= generation)
+        current = self.__current
+        if current is not None and keyframe <= current <= generation:
+            board = self.__copyBoard(self.__board)
+            for g in xrange(current + 1,generation + 1):
+                self.__toggle(board,self.__frames[g][1])
+        elif current is not None and generation < current and current - generation < generation - keyframe and \
+             all(not self.__frames[g][0] for g in xrange(generation + 1,current + 1)):
+            board = self.__copyBoard(self.__board)
+            for g in xrange(current,generation,-1):
+                self.__toggle(board,self.__frames[g][1])
+        else:
+            board = self.__keyBoard(self.__frames[keyframe][1])
+            for g in xrange(keyframe + 1,generation + 1):
+                self.__toggle(board,self.__frames[g][1])
+
+        life.setPatternFromTuple(self.__pattern(board))
+        life.setGeneration(generation)
+        self.__board = board
+        self.__current = generation
+        self.__hash = life.getHash()
+
+        if profiler is not None:
+            profiler.addTime('history.restore',time.time() - start)
+
+    def back(self,life,n):
+        """
+        Restores life to n generations before its current one, keeping within the generations held.  
+        Returns the generation restored.
+        """
+        if self.__first is None:
+            raise ValueError('the history is empty')
+        generation = min(max(life.getGeneration() - n,self.__first),self.__last)
+        self.restore(life,generation)
+        return generation
+
+    def __drop(self,generation):
+        """
+        Removes the last generation held.
+        """
+        isKeyframe,cells = self.__frames.pop(generation)
+        self.__bytes -= self.__size(cells)
+        if isKeyframe:
+            self.__keyframes.pop()
+        if self.__frames:
+            self.__last = generation - 1
+        else:
+            self.__first = self.__last = None
+
+    def __evict(self):
+        """
+        Removes the oldest keyframe and the deltas which follow it.
+        """
+        self.__keyframes.popleft()
+        first = self.__keyframes[0]
+        for g in xrange(self.__first,first):
+            self.__bytes -= self.__size(self.__frames.pop(g)[1])
+        self.__first = first
+
+    def __size(self,cells):
+        """
+        Returns the memory taken by an array of cells, counting a little for the array itself.
+        """
+        return len(cells)*cells.itemsize + 64
+
+    def __getBoard(self,life):
+        """
+        Returns a copy of the board of life.
+        """
+        if numpy is None:
+            return set(life.getTupleFromPattern())
+        if isinstance(life,NumpyLife):
+            return numpy.array(life.getBoard(),dtype=numpy.uint8).reshape(-1)
+        board = numpy.zeros(self.__nrows*self.__ncols,dtype=numpy.uint8)
+        board[numpy.array(life.getTupleFromPattern(),dtype=numpy.int64)] = 1
+        return board
+
+    def __cells(self,board,previous=None):
+        """
+        Returns the live cells of board, or the cells which differ from the previous board, as an array of 1D integers.
+        """
+        large = self.__nrows*self.__ncols > 2**31
+        if numpy is None:
+            cells = board if previous is None else board ^ previous
+            return array('l' if large else 'i',sorted(cells))
+        cells = numpy.flatnonzero(board) if previous is None else numpy.flatnonzero(board != previous)
+        return cells.astype(numpy.int64 if large else numpy.int32)
+
+    def __keyBoard(self,cells):
+        """
+        Returns the board whose live cells are those of a keyframe.
+        """
+        if numpy is None:
+            return set(cells)
+        board = numpy.zeros(self.__nrows*self.__ncols,dtype=numpy.uint8)
+        board[cells] = 1
+        return board
+
+    def __copyBoard(self,board):
+        """
+        Returns a copy of a board.
+        """
+        return set(board) if numpy is None else board.copy()
+
+    def __toggle(self,board,cells):
+        """
+        Toggles the cells of a delta on a board.
+        """
+        if numpy is None:
+            board.symmetric_difference_update(cells)
+        else:
+            board[cells] ^= 1
+
+    def __pattern(self,board):
+        """
+        Returns the live cells of a board as a sorted tuple of 1D integers.
+        """
+        if numpy is None:
+            return tuple(sorted(board))
+        return tuple(numpy.flatnonzero(board).tolist())
+
+
+class Life(object):
+    """
+    This object implements the game board and also holds the pattern.
+    
+    self.__nrows = number of rows
+    self.__ncols = number of columns
+    self.__board = 2D list (nrows x ncols) containing the pattern
+    self.__neighbors = 2D List (nrows x ncols) containing the number of neighbors of each cell (in toroidal boundary conditions)
+    self.__generation = the generation number of the pattern
+    self.__ncells = the number of live cells currently in the pattern
+    self.__hash = the XOR of the Zobrist keys (see cellKey) of the live cells, kept up to date on every birth and death
+    self.__history = CycleDetector holding the hashes of recent generations
+    self.__occupancy = Occupancy holding the number of live cells in each row and column, kept up to date on every birth and death
+    """
+    def __init__(self,nrows,ncols,percentage):
+        self.__nrows = nrows
+        self.__ncols = ncols
+        self.__board = []
+        self.__neighbors = []
+        self.__generation = 1
+        self.__ncells = 0
+        self.__hash = 0
+        self.__history = CycleDetector()
+        self.__occupancy = Occupancy(nrows,ncols)
+
+        self.makeBlankBoard()
+
+    def randomize(self,percentage,seed=None,stream=None):
+        """
+        Fill the board according to the percentage, where 0 < percentage < 100.  
+        The same seed and stream always give the same board (see randomRows).
+        """
+
+        self.__board = list(randomCells(self.__nrows,self.__ncols,percentage,seed,stream))
+        self.countNcells()
+        self.rehash()
+
+    def setPatternFromTuple(self,tuple):
+        """
+        Creates a board pattern from a tuple, where the tuple encodes the 2D pattern as
+        a list of 1D integers.
+        """
+
+        self.makeBlankBoard()
+        # Use modular arithmetic to code 2D pattern as 1D values.
+        for val in tuple:
+            i = val/self.__ncols
+            j = val%self.__ncols
+            self.__board[i][j] = 1
+        self.__ncells = len(tuple)
+        self.rehash()
+
+    def getTupleFromPattern(self):
+        """
+        Use a list comprehension to generate a tuple from the pattern, where the tuple encodes the 2D pattern as
+        a list of 1D integers.
+        """
+        rowCounts = self.getOccupancy().getRowCounts()
+        patternList = [i*self.__ncols+j for i in xrange(self.__nrows) if rowCounts[i] for j in xrange(self.__ncols) if self.__board[i][j]]
+        return tuple(patternList)
+
+    def __str__(self):
+        """Print information about the board and pattern"""
+        return "Game of Life board of %d rows and %d columns and having %d live cells." %(self.__nrows,self.__ncols,self.__ncells)
+    
+
+    def printBoardGraphics(self,canvas,cellWidth,drawMargin):
+        """
+        Displays a graphical representation of the board onto a tkinter canvas
+
+        canvas = A tkinter canvas
+        drawWidth = the size of the individual cells when plotted on the canvas.  (Width = Height)
+        drawMargin = the width of the margin drawn around the board on the canvas
+        """
+
+        self.printGridGraphics(canvas,cellWidth,drawMargin)
+
+        # Now draw in live cells, skipping the empty rows
+        rowCounts = self.getOccupancy().getRowCounts()
+        for j in xrange(self.__nrows):
+            if not rowCounts[j]:
+                continue
+            for i in xrange(self.__ncols):
+                if self.__board[j][i]:
+                    canvas.create_rectangle(cellWidth*i + drawMargin,cellWidth*j + drawMargin,
+                                            cellWidth*(i + 1) + drawMargin,cellWidth*(j+1) + drawMargin,fill='red')
+
+    def printGridGraphics(self,canvas,cellWidth,drawMargin):
+        """
+        Draws the grid lines of the board onto a tkinter canvas
+        """
+
+        for i in xrange(self.__ncols + 1):
+            canvas.create_line(cellWidth*i + drawMargin,drawMargin,
+                               cellWidth*i + drawMargin,cellWidth*(self.__nrows) + drawMargin)
+
+        for j in xrange(self.__nrows + 1):
+            canvas.create_line(drawMargin,cellWidth*j + drawMargin
+                               ,cellWidth*(self.__ncols) + drawMargin,cellWidth*j + drawMargin)
+
+    def printBoard(self):
+        """
+        Displays a textual representation of the board, output to the monitor window.
+        """
+
+        for i in xrange(self.__nrows):
+            for j in xrange(self.__ncols):
+                if self.__board[i][j]:
+                    print("*"),
+                else:
+                    print("-"),
+            print("")
+
+
+    def makeBlankBoard(self):
+        """
+        Use a nested list comprehension to create self.__board as a blank 2D list of size nrows*ncols
+        """
+        self.__ncells = 0
+        self.__hash = 0
+        self.clearHistory()
+        self.__occupancy.clear()
+        self.__board=[[0 for j in xrange(self.__ncols)] for i in xrange(self.__nrows)]
+
+    def makeBlankNeighbors(self):
+        """
+        Use a nested list comprehension to create self.__neighbors as a blank 2D list of size nrows*ncols
+        """
+        self.__neighbors=[[0 for j in xrange(self.__ncols)] for i in xrange(self.__nrows)]
+
+    def update(self):
+        """
+        Finds the pattern on the n+1 th step, from the pattern on the nth step 
+        using Conway's rule-set.
+        """
+
+        # First build up 2D list of the number of neighbors around each cell
+        profiler = PROFILER
+        if profiler is not None:
+            start = time.time()
+        self.__generation += 1
+        self.makeBlankNeighbors()
+
+        # Only the occupied rows and the rows next to them can change
+        occupancy = self.getOccupancy()
+        rowCounts = occupancy.getRowCounts()
+        occupied = [i for i in xrange(self.__nrows) if rowCounts[i]]
+        visit = sorted(set([(i + k) % self.__nrows for i in occupied for k in (-1,0,1)]))
+        add = occupancy.add
+
+        for i in occupied:
+            for j in xrange(self.__ncols):
+                if self.__board[i][j]:
+                    # Note use of periodic (toroidal) boundary conditions
+                    iplus=(i + 1) % self.__nrows
+                    iminus=(i - 1) % self.__nrows
+                    jplus=(j + 1) % self.__ncols
+                    jminus=(j - 1) % self.__ncols
+                    self.__neighbors[iminus][jminus] += 1
+                    self.__neighbors[iminus][j     ] += 1
+                    self.__neighbors[iminus][jplus ] += 1
+                    self.__neighbors[i     ][jminus] += 1
+                    self.__neighbors[i     ][jplus ] += 1
+                    self.__neighbors[iplus ][jminus] += 1
+                    self.__neighbors[iplus ][j     ] += 1
+                    self.__neighbors[iplus ][jplus ] += 1
+
+        #Now apply Conway's rules
+
+        if profiler is not None:
+            counted = time.time()
+        births = 0
+        deaths = 0
+        for i in visit:
+            for j in xrange(self.__ncols):
+                if self.__board[i][j] == 0:
+                    if self.__neighbors[i][j] == 3:
+                        self.__board[i][j] = 1
+                        births += 1
+                        self.__hash ^= cellKey(i*self.__ncols + j)
+                        add(i,j,1)
+                elif self.__neighbors[i][j] !=2 and self.__neighbors[i][j] !=3: 
+                        self.__board[i][j] = 0
+                        deaths += 1
+                        self.__hash ^= cellKey(i*self.__ncols + j)
+                        add(i,j,-1)
+        self.__ncells += births - deaths
+
+        if profiler is not None:
+            profiler.addTime('update.neighbors',counted - start)
+            profiler.addTime('update.rules',time.time() - counted)
+            profiler.addCount('update.cellsVisited',len(visit)*self.__ncols)
+            profiler.addCount('update.births',births)
+            profiler.addCount('update.deaths',deaths)
+
+    def countNcells(self):
+        """
+        sets self.__ncells to the number of live cells on the board
+        """
+
+        ncells=0
+        for i in xrange(self.__nrows):
+            for j in xrange(self.__ncols):
+                if self.__board[i][j]: ncells += 1
+
+        self.__ncells = ncells
+
+    def countOccupancy(self):
+        """
+        Returns (rowCounts,colCounts), the number of live cells in each row and each column, counted from the whole board.
+        Used to recount the occupancy when it is stale.
+        """
+        return [sum(row) for row in self.__board],[sum(col) for col in zip(*self.__board)] if self.__nrows else [0]*self.__ncols
+
+    def getOccupancy(self,recount=True):
+        """
+        getter for occupancy.  The counts are recounted from the board first if they are stale, unless recount is False.
+        """
+        if recount and self.__occupancy.isStale():
+            self.__occupancy.setCounts(*self.countOccupancy())
+        return self.__occupancy
+
+    def hasOccupancy(self):
+        """
+        Returns True if the occupancy is up to date, so that getOccupancy() and getBoundingBox() don't need to recount the board.
+        """
+        return not self.__occupancy.isStale()
+
+    def invalidateOccupancy(self):
+        """
+        Marks the occupancy stale, so that it is recounted when next needed.  Called after the board is changed as a whole.
+        """
+        self.__occupancy.invalidate()
+
+    def getBoundingBox(self):
+        """
+        Returns (imin,jmin,imax,jmax), the first and last rows and columns containing live cells, or None if there are none.
+        """
+        return self.getOccupancy().getBoundingBox()
+
+    def getBoard(self):
+        """
+        getter for board.  Note, board is mutable, so changes to board outside of this class will also cause changes inside.
+        """
+        return self.__board
+
+    def getCell(self,i,j):
+        """
+        Returns 1 if the cell in row i and column j is live, otherwise 0.
+        """
+        return self.__board[i][j]
+
+    def getRegion(self,i0,i1,j0,j1):
+        """
+        Returns the cells in rows i0 to i1-1 and columns j0 to j1-1 as a 2D numpy array of uint8.  Requires numpy.
+        """
+        region = [row[j0:j1] for row in self.__board[i0:i1]]
+        return numpy.array(region,dtype=numpy.uint8).reshape(i1 - i0,j1 - j0)
+
+    def setCell(self,i,j,value):
+        """
+        Sets the cell in row i and column j to value (0 or 1), keeping self.__ncells up to date.
+        """
+        if self.__board[i][j] != value:
+            self.__board[i][j] = value
+            self.__ncells += 1 if value else -1
+            self.cellChanged(i,j)
+
+    def cellChanged(self,i,j):
+        """
+        Called when the cell in row i and column j is edited (rather than changed by update()).  Updates the hash and
+        the occupancy, and clears the history, since the edited board did not evolve from the earlier generations.
+        """
+        self.__hash ^= cellKey(i*self.__ncols + j)
+        self.__occupancy.add(i,j,1 if self.getCell(i,j) else -1)
+        self.clearHistory()
+
+    def clearHistory(self):
+        """
+        Forgets the hashes of earlier generations.
+        """
+        self.__history.clear()
+
+    def rehash(self):
+        """
+        Recomputes the hash from the whole pattern, clears the history and marks the occupancy stale.  
+        Called after the board is replaced.
+        """
+        self.invalidateOccupancy()
+        hash = 0
+        for val in self.getTupleFromPattern():
+            hash ^= cellKey(val)
+        self.__hash = hash
+        self.clearHistory()
+
+    def findCycle(self):
+        """
+        Records the current generation in the history.  Returns (period,start) if the board has entered a cycle, 
+        where start is the first generation of the cycle, otherwise None.  A still board has period 1.
+        """
+        return self.__history.record(self.__hash,self.__generation)
+
+    def getCycle(self):
+        """
+        Returns (period,start) if findCycle has found that the board entered a cycle, otherwise None.
+        """
+        return self.__history.getCycle()
+
+    def getHash(self):
+        """
+        getter for hash
+        """
+        return self.__hash
+
+    def setHash(self,hash):
+        """
+        setter for hash
+        """
+        self.__hash = hash
+
+    def getGeneration(self):
+        """
+        getter for generation
+        """
+        return self.__generation
+
+    def setGeneration(self,gen):
+        """
+        setter for generation
+        """
+        self.__generation = gen
+
+    def getNcells(self):
+        """
+        getter for ncells
+        """
+        return self.__ncells
+
+    def setNcells(self,nc):
+        """
+        setter for ncells
+        """
+        self.__ncells = nc
+
+    def copy(self):
+        """
+        Returns an independent copy of the board, including its pattern, generation and history.
+        """
+        other = copy.copy(self)
+        other.__board = [row[:] for row in self.__board]
+        other.__history = self.__history.copy()
+        other.__occupancy = self.__occupancy.copy()
+        return other
+
+    def getNrows(self):
+        """
+        getter for nrows
+        """
+        return self.__nrows
+
+    def getNcols(self):
+        """
+        getter for ncols
+        """
+        return self.__ncols
+
+
+def evolveArray(board,new):
+    """
+    Writes the generation after board into new, where board and new are numpy arrays of uint8 whose last 
+    two axes are rows and columns.  Any leading axes index independent boards.
+    """
+    # Sum over the 3x3 block around each cell, using numpy.roll for the periodic (toroidal) boundary conditions.
+    # The block sum includes the cell itself, so a live cell survives with a sum of 3 or 4
+    # and a dead cell is born with a sum of 3.
+    vertical = board + numpy.roll(board,1,axis=-2) + numpy.roll(board,-1,axis=-2)
+    block = vertical + numpy.roll(vertical,1,axis=-1) + numpy.roll(vertical,-1,axis=-1)
+    new[...] = (block == 3) | ((board == 1) & (block == 4))
+
+def evolveStrip(board,new,r0,r1):
+    """
+    Writes the generation after rows r0 to r1-1 of board into the same rows of new, where board and new are 
+    2D numpy arrays of uint8.  Only the strip and its one-row halo above and below are read, so the temporary 
+    arrays are the size of the strip.  Returns the number of live cells written.
+    """
+    nrows = board.shape[0]
+
+    # Note use of periodic (toroidal) boundary conditions for the halo rows
+    halo = [(r0 - 1) % nrows] + range(r0,r1) + [r1 % nrows]
+
+    block = board.take(halo,axis=0)
+    vertical = block[:-2] + block[1:-1] + block[2:]
+    total = vertical + numpy.roll(vertical,1,axis=1) + numpy.roll(vertical,-1,axis=1)
+
+    strip = new[r0:r1]
+    strip[...] = (total == 3) | ((block[1:-1] == 1) & (total == 4))
+    return int(numpy.count_nonzero(strip))
+
+
+class NumpyLife(Life):
+    """
+    Array-backed version of Life.  The board is held as a numpy array and each generation is 
+    computed with whole-array operations instead of per-cell Python loops.  Gives identical results to Life.
+    Requires numpy.
+
+    self.__buffers = 3D numpy array (2 x nrows x ncols) of uint8 holding the current and next boards
+    self.__parity = the index into self.__buffers of the current board
+    self.__board = 2D numpy array (nrows x ncols) of uint8 containing the pattern, the current board
+    """
+    def __init__(self,nrows,ncols,percentage):
+        if numpy is None:
+            raise ImportError("NumpyLife requires numpy")
+        self.__buffers = None
+        self.__parity = 0
+        Life.__init__(self,nrows,ncols,percentage)
+
+    def allocateBuffers(self):
+        """
+        Returns a new blank array of shape (2,nrows,ncols) and type uint8 to hold the current and next boards.
+        Subclasses override this to place the boards in other kinds of storage.
+        """
+        return numpy.zeros((2,self.getNrows(),self.getNcols()),dtype=numpy.uint8)
+
+    def randomize(self,percentage,seed=None,stream=None):
+        """
+        Fill the board according to the percentage, where 0 < percentage < 100, a chunk of rows at a time.
+        The same seed and stream always give the same board (see randomRows).
+        """
+        r0 = 0
+        for chunk in randomRows(self.getNrows(),self.getNcols(),percentage,seed,stream):
+            self.__board[r0:r0 + len(chunk)] = chunk
+            r0 += len(chunk)
+        self.countNcells()
+        self.rehash()
+
+    def setPatternFromTuple(self,tuple):
+        """
+        Creates a board pattern from a tuple, where the tuple encodes the 2D pattern as
+        a list of 1D integers.
+        """
+        self.makeBlankBoard()
+        # The 1D encoding is exactly the index into the flattened (row-major) board.
+        self.__board.reshape(-1)[list(tuple)] = 1
+        self.setNcells(len(tuple))
+        self.rehash()
+
+    def rehash(self):
+        """
+        Recomputes the hash from the whole pattern, clears the history and marks the occupancy stale.  
+        Called after the board is replaced.
+        """
+        self.invalidateOccupancy()
+        self.setHash(cellKeysHash(numpy.flatnonzero(self.__board)))
+        self.clearHistory()
+
+    def getTupleFromPattern(self):
+        """
+        Generate a tuple from the pattern, where the tuple encodes the 2D pattern as
+        a list of 1D integers.
+        """
+        return tuple(numpy.flatnonzero(self.__board).tolist())
+
+    def printBoardGraphics(self,canvas,cellWidth,drawMargin):
+        """
+        Displays a graphical representation of the board onto a tkinter canvas.  Only the live
+        cells are visited.
+        """
+        self.printGridGraphics(canvas,cellWidth,drawMargin)
+
+        rows,cols = numpy.nonzero(self.__board)
+        for j,i in zip(rows.tolist(),cols.tolist()):
+            canvas.create_rectangle(cellWidth*i + drawMargin,cellWidth*j + drawMargin,
+                                    cellWidth*(i + 1) + drawMargin,cellWidth*(j+1) + drawMargin,fill='red')
+
+    def printBoard(self):
+        """
+        Displays a textual representation of the board, output to the monitor window.
+        """
+        for row in self.__board.tolist():
+            print(" ".join(["*" if c else "-" for c in row]))
+
+    def makeBlankBoard(self):
+        """
+        Make self.__board a blank array of size nrows*ncols.  The buffers are only allocated once.
+        """
+        self.setNcells(0)
+        self.setHash(0)
+        self.clearHistory()
+        self.getOccupancy().clear()
+        if self.__buffers is None:
+            self.__buffers = self.allocateBuffers()
+        self.__board = self.__buffers[self.__parity]
+        self.__board[...] = 0
+
+    def makeBlankNeighbors(self):
+        """
+        Neighbor counts are computed afresh as a temporary array in update(), so there is nothing to allocate.
+        """
+        pass
+
+    def update(self):
+        """
+        Finds the pattern on the n+1 th step, from the pattern on the nth step 
+        using Conway's rule-set.
+        """
+        profiler = PROFILER
+        if profiler is not None:
+            start = time.time()
+        self.setGeneration(self.getGeneration() + 1)
+        ncells = self.evolve(self.__buffers,self.__parity)
+        if profiler is not None:
+            evolved = time.time()
+        self.__parity = 1 - self.__parity
+        self.__board = self.__buffers[self.__parity]
+        self.setNcells(ncells)
+        self.setHash(self.getHash() ^ self.changedHash(self.__buffers))
+        if profiler is not None:
+            profiler.addTime('update.evolve',evolved - start)
+            profiler.addTime('update.hash',time.time() - evolved)
+            profiler.addCount('update.cellsVisited',self.getNrows()*self.getNcols())
+            # Counting the births costs another pass over the board, so it is only done when profiling.
+            births = int(numpy.count_nonzero(self.__board > self.__buffers[1 - self.__parity]))
+            profiler.addCount('update.births',births)
+            profiler.addCount('update.deaths',births + int(numpy.count_nonzero(self.__buffers[1 - self.__parity])) - ncells)
+        # Recounting the rows and columns costs a pass over the board, so it is left until they are needed.
+        self.invalidateOccupancy()
+
+    def changedHash(self,buffers):
+        """
+        Returns the XOR of the Zobrist keys of the cells which differ between buffers[0] and buffers[1].
+        """
+        return cellKeysHash(numpy.flatnonzero(buffers[0] != buffers[1]))
+
+    def evolve(self,buffers,parity):
+        """
+        Writes the generation after buffers[parity] into buffers[1-parity], and returns its number of live cells.
+        """
+        new = buffers[1 - parity]
+        evolveArray(buffers[parity],new)
+        return int(numpy.count_nonzero(new))
+
+    def countNcells(self):
+        """
+        sets self.__ncells to the number of live cells on the board
+        """
+        self.setNcells(int(numpy.count_nonzero(self.__board)))
+
+    def countOccupancy(self):
+        """
+        Returns (rowCounts,colCounts), the number of live cells in each row and each column, counted from the whole board.
+        """
+        return self.__board.sum(axis=1,dtype=numpy.int64).tolist(),self.__board.sum(axis=0,dtype=numpy.int64).tolist()
+
+    def getBoard(self):
+        """
+        getter for board.  Note, board is a mutable numpy array, so changes to board outside of this class will also cause changes inside.
+        The array returned is only the current board until the next call to update().
+        """
+        return self.__board
+
+    def getParity(self):
+        """
+        getter for parity
+        """
+        return self.__parity
+
+    def setBuffers(self,buffers,parity):
+        """
+        Makes buffers[parity] the current board, keeping its pattern.  Used by subclasses whose buffers already hold a board.
+        """
+        self.__buffers = buffers
+        self.__parity = parity
+        self.__board = buffers[parity]
+
+    def copy(self):
+        """
+        Returns an independent copy of the board, including its pattern, generation and history.
+        """
+        other = Life.copy(self)
+        other.__buffers = self.__buffers.copy()
+        other.__board = other.__buffers[other.__parity]
+        return other
+
+    def getCell(self,i,j):
+        """
+        Returns 1 if the cell in row i and column j is live, otherwise 0.
+        """
+        return int(self.__board[i,j])
+
+    def getRegion(self,i0,i1,j0,j1):
+        """
+        Returns the cells in rows i0 to i1-1 and columns j0 to j1-1 as a 2D numpy array of uint8.
+        Note, the array is a view of the board, so it must not be changed.
+        """
+        return self.__board[i0:i1,j0:j1]
+
+    def setCell(self,i,j,value):
+        """
+        Sets the cell in row i and column j to value (0 or 1), keeping the number of live cells up to date.
+        """
+        if self.__board[i,j] != value:
+            self.__board[i,j] = value
+            self.setNcells(self.getNcells() + (1 if value else -1))
+            self.cellChanged(i,j)
+
+
+def parallelWorker(conn,shared,nrows,ncols,r0,r1):
+    """
+    Worker process for ParallelLife, which steps rows r0 to r1-1 of the board held in the shared memory.
+    For each parity received on conn, the strip of buffer parity together with its one-row halo 
+    above and below is read, the next generation of the strip is written to buffer 1-parity, and its 
+    number of live cells is sent back.  None ends the worker.
+    """
+    buffers = numpy.frombuffer(shared,dtype=numpy.uint8).reshape(2,nrows,ncols)
+
+    while True:
+        parity = conn.recv()
+        if parity is None:
+            break
+        conn.send(evolveStrip(buffers[parity],buffers[1 - parity],r0,r1))
+    conn.close()
+
+
+class ParallelLife(NumpyLife):
+    """
+    Multi-core version of NumpyLife.  The current and next boards are held in shared memory and the rows are 
+    split into strips, each stepped by its own worker process.  Each worker only reads the one-row halo 
+    above and below its strip (wrapping around at the edges) from the other strips.  
+    Gives identical results to Life.  Call close() to stop the workers.
+
+    self.__processes = the number of worker processes
+    self.__shared = the shared memory holding both boards
+    self.__workers = list of (process,connection) pairs, started on the first update()
+    """
+    def __init__(self,nrows,ncols,percentage,processes=None):
+        self.__processes = min(processes or multiprocessing.cpu_count(),nrows)
+        self.__shared = None
+        self.__workers = []
+        NumpyLife.__init__(self,nrows,ncols,percentage)
+
+    def allocateBuffers(self):
+        """
+        Returns a new blank array of shape (2,nrows,ncols) and type uint8, held in shared memory.
+        """
+        nrows = self.getNrows()
+        ncols = self.getNcols()
+        self.__shared = multiprocessing.RawArray('B',2*nrows*ncols)
+        return numpy.frombuffer(self.__shared,dtype=numpy.uint8).reshape(2,nrows,ncols)
+
+    def startWorkers(self):
+        """
+        Starts one worker process per strip of rows.
+        """
+        nrows = self.getNrows()
+        for k in xrange(self.__processes):
+            r0 = k*nrows/self.__processes
+            r1 = (k + 1)*nrows/self.__processes
+            conn,workerConn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=parallelWorker,
+                                              args=(workerConn,self.__shared,nrows,self.getNcols(),r0,r1))
+            process.daemon = True
+            process.start()
+            self.__workers.append((process,conn))
+
+    def evolve(self,buffers,parity):
+        """
+        Has the workers write the generation after buffers[parity] into buffers[1-parity], and returns its number of live cells.
+        """
+        if not self.__workers:
+            self.startWorkers()
+        for process,conn in self.__workers:
+            conn.send(parity)
+        # Waiting for every strip keeps the workers in step, so no strip is overwritten while it is still being read as a halo.
+        return sum([conn.recv() for process,conn in self.__workers])
+
+    def copy(self):
+        """
+        Returns an independent copy of the board as a NumpyLife, since a copy cannot share the worker processes.
+        """
+        other = NumpyLife.copy(self)
+        other.__class__ = NumpyLife
+        return other
+
+    def close(self):
+        """
+        Stops the worker processes.  They are restarted if update() is called again.
+        """
+        for process,conn in self.__workers:
+            conn.send(None)
+            conn.close()
+            process.join()
+        self.__workers = []
+
+
+MAPPED_MAGIC = '\x89LIFEMAP'
+MAPPED_HEADER = struct.Struct('<IIIIQQQ')
+MAPPED_OFFSET = 64
+MAPPED_VERSION = 1
+
+class MappedLife(NumpyLife):
+    """
+    Version of NumpyLife whose current and next boards are held in a memory-mapped file, one byte per cell, 
+    so that boards larger than memory can be stepped, and a board saved with flush() is reopened (see openMappedLife) 
+    without reading it.  The rows are stepped, counted and hashed in strips, so the temporary arrays are the size 
+    of a strip rather than the board.  Gives identical results to Life.
+
+    The file holds MAPPED_MAGIC and a header (MAPPED_HEADER:  version, rows, columns, parity, generation, hash and 
+    number of live cells), then at MAPPED_OFFSET the two boards.  Without a path the file is a temporary one, 
+    removed once the board is closed.
+
+    self.__path = the name of the file, or None for a temporary file
+    self.__reopen = True while an existing file is being opened, so that its board is kept
+    self.__header = numpy memmap of the header
+    self.__mapped = numpy memmap of the two boards
+    self.__stripRows = the number of rows stepped at a time
+    """
+    def __init__(self,nrows,ncols,percentage,path=None,reopen=False):
+        self.__path = path
+        self.__reopen = reopen
+        self.__header = None
+        self.__mapped = None
+        self.__stripRows = max(1,(1 << 22)/max(1,ncols))
+        NumpyLife.__init__(self,nrows,ncols,percentage)
+        if path is not None:
+            self.flush()
+
+    def allocateBuffers(self):
+        """
+        Returns an array of shape (2,nrows,ncols) and type uint8 mapped from the file, creating the file unless it is being reopened.
+        """
+        nrows = self.getNrows()
+        ncols = self.getNcols()
+        if self.__reopen:
+            mode = 'r+'
+            path = self.__path
+        else:
+            mode = 'w+'
+            if self.__path is None:
+                fd,path = tempfile.mkstemp(suffix='.lifemap')
+                os.close(fd)
+            else:
+                path = self.__path
+            with open(path,'wb') as file:
+                file.write(MAPPED_MAGIC)
+                file.truncate(MAPPED_OFFSET + 2*nrows*ncols)
+
+        self.__header = numpy.memmap(path,dtype=numpy.uint8,mode='r+',shape=(MAPPED_OFFSET,))
+        self.__mapped = numpy.memmap(path,dtype=numpy.uint8,mode='r+',offset=MAPPED_OFFSET,shape=(2,nrows,ncols))
+
+        # The mappings keep a temporary file open, so its name can go at once.
+        if self.__path is None:
+            os.remove(path)
+        return self.__mapped
+
+    def makeBlankBoard(self):
+        """
+        Make the current board blank, unless an existing file is being opened, when its board and header are kept.
+        """
+        if not self.__reopen:
+            NumpyLife.makeBlankBoard(self)
+            return
+
+        buffers = self.allocateBuffers()
+        self.__reopen = False
+        magic = self.__header[:len(MAPPED_MAGIC)].tostring()
+        version,nrows,ncols,parity,generation,hash,ncells = \
+            MAPPED_HEADER.unpack(self.__header[len(MAPPED_MAGIC):len(MAPPED_MAGIC) + MAPPED_HEADER.size].tostring())
+        if magic != MAPPED_MAGIC or version > MAPPED_VERSION:
+            raise ValueError('%s is not a mapped board' %self.__path)
+        self.setBuffers(buffers,parity)
+        self.setGeneration(generation)
+        self.setHash(hash)
+        self.setNcells(ncells)
+        self.clearHistory()
+        self.invalidateOccupancy()
+
+    def flush(self):
+        """
+        Writes the header and the boards to the file, so that it can be reopened with openMappedLife.
+        """
+        header = MAPPED_HEADER.pack(MAPPED_VERSION,self.getNrows(),self.getNcols(),self.getParity(),
+                                    self.getGeneration(),self.getHash(),self.getNcells())
+        start = len(MAPPED_MAGIC)
+        self.__header[start:start + len(header)] = numpy.frombuffer(header,dtype=numpy.uint8)
+        self.__header.flush()
+        self.__mapped.flush()
+
+    def strips(self):
+        """
+        Returns a list of (r0,r1) pairs, the first and one past the last rows of each strip.
+        """
+        nrows = self.getNrows()
+        return [(r0,min(nrows,r0 + self.__stripRows)) for r0 in xrange(0,nrows,self.__stripRows)]
+
+    def evolve(self,buffers,parity):
+        """
+        Writes the generation after buffers[parity] into buffers[1-parity] one strip at a time, and returns its number of live cells.
+        """
+        return sum([evolveStrip(buffers[parity],buffers[1 - parity],r0,r1) for r0,r1 in self.strips()])
+
+    def changedHash(self,buffers):
+        """
+        Returns the XOR of the Zobrist keys of the cells which differ between buffers[0] and buffers[1], one strip at a time.
+        """
+        ncols = self.getNcols()
+        hash = 0
+        for r0,r1 in self.strips():
+            hash ^= cellKeysHash(numpy.flatnonzero(buffers[0][r0:r1] != buffers[1][r0:r1]) + r0*ncols)
+        return hash
+
+    def rehash(self):
+        """
+        Recomputes the hash from the whole pattern one strip at a time, clears the history and marks the occupancy stale.
+        """
+        self.invalidateOccupancy()
+        board = self.getBoard()
+        ncols = self.getNcols()
+        hash = 0
+        for r0,r1 in self.strips():
+            hash ^= cellKeysHash(numpy.flatnonzero(board[r0:r1]) + r0*ncols)
+        self.setHash(hash)
+        self.clearHistory()
+
+    def countOccupancy(self):
+        """
+        Returns (rowCounts,colCounts), the number of live cells in each row and each column, counted one strip at a time.
+        """
+        board = self.getBoard()
+        rowCounts = []
+        colCounts = numpy.zeros(self.getNcols(),dtype=numpy.int64)
+        for r0,r1 in self.strips():
+            rowCounts.extend(board[r0:r1].sum(axis=1,dtype=numpy.int64).tolist())
+            colCounts += board[r0:r1].sum(axis=0,dtype=numpy.int64)
+        return rowCounts,colCounts.tolist()
+
+    def copy(self):
+        """
+        Returns an independent copy of the board as a NumpyLife held in memory, since a copy cannot share the file.
+        """
+        other = NumpyLife.copy(self)
+        other.__class__ = NumpyLife
+        return other
+
+    def close(self):
+        """
+        Flushes the board to its file, if it has one.
+        """
+        if self.__path is not None:
+            self.flush()
+
+def openMappedLife(path):
+    """
+    Reopens a MappedLife saved with flush() or close(), without reading its boards.
+    """
+    with open(path,'rb') as file:
+        head = file.read(len(MAPPED_MAGIC) + MAPPED_HEADER.size)
+    if head[:len(MAPPED_MAGIC)] != MAPPED_MAGIC:
+        raise ValueError('%s is not a mapped board' %path)
+    version,nrows,ncols = MAPPED_HEADER.unpack(head[len(MAPPED_MAGIC):])[:3]
+    return MappedLife(nrows,ncols,0,path,reopen=True)
+
+
+def bitPositions(bits):
+    """
+    Returns a list of the positions of the set bits in the integer bits, lowest first.
+    """
+    # str.find does the scanning in C, so the Python-level cost is one iteration per set bit.
+    s = bin(bits)[:1:-1]
+    positions = []
+    j = s.find('1')
+    while j >= 0:
+        positions.append(j)
+        j = s.find('1',j + 1)
+    return positions
+
+
+class PackedLife(Life):
+    """
+    Bit-packed version of Life.  Each row of the board is held as a single integer, with bit j 
+    set when the cell in column j is live, so the board costs roughly 1 bit per cell.
+    Each generation is evaluated with bitwise adder logic on whole rows at once.  
+    Gives identical results to Life.
+
+    self.__rows = list (nrows) of integers containing the pattern
+    self.__mask = integer with the lowest ncols bits set
+    """
+    def __init__(self,nrows,ncols,percentage):
+        self.__mask = (1 << ncols) - 1
+        Life.__init__(self,nrows,ncols,percentage)
+
+    def randomize(self,percentage,seed=None,stream=None):
+        """
+        Fill the board according to the percentage, where 0 < percentage < 100.
+        The same seed and stream always give the same board (see randomRows).
+        """
+        ncols = self.getNcols()
+        self.__rows = []
+        if numpy is not None and ncols:
+            # Pack each chunk of rows into bytes, last column first, so that each row reads as one integer.
+            pad = -ncols%8
+            for chunk in randomRows(self.getNrows(),ncols,percentage,seed,stream):
+                bits = numpy.zeros((len(chunk),ncols + pad),dtype=numpy.uint8)
+                bits[:,pad:] = chunk[:,::-1]
+                for row in numpy.packbits(bits,axis=1):
+                    self.__rows.append(int(binascii.hexlify(row.tostring()),16))
+        else:
+            for cells in randomCells(self.getNrows(),ncols,percentage,seed,stream):
+                row = 0
+                for j in xrange(ncols):
+                    if cells[j]:
+                        row |= 1 << j
+                self.__rows.append(row)
+        self.countNcells()
+        self.rehash()
+
+    def setPatternFromTuple(self,tuple):
+        """
+        Creates a board pattern from a tuple, where the tuple encodes the 2D pattern as
+        a list of 1D integers.
+        """
+        self.makeBlankBoard()
+        ncols = self.getNcols()
+        for val in tuple:
+            self.__rows[val/ncols] |= 1 << (val%ncols)
+        self.setNcells(len(tuple))
+        self.rehash()
+
+    def getTupleFromPattern(self):
+        """
+        Generate a tuple from the pattern, where the tuple encodes the 2D pattern as
+        a list of 1D integers.  Only the set bits of each row are visited.
+        """
+        ncols = self.getNcols()
+        patternList = []
+        for i,row in enumerate(self.__rows):
+            if row:
+                base = i*ncols
+                patternList.extend([base + j for j in bitPositions(row)])
+        return tuple(patternList)
+
+    def printBoardGraphics(self,canvas,cellWidth,drawMargin):
+        """
+        Displays a graphical representation of the board onto a tkinter canvas.  Only the live
+        cells are visited.
+        """
+        self.printGridGraphics(canvas,cellWidth,drawMargin)
+
+        for j,row in enumerate(self.__rows):
+            if row:
+                for i in bitPositions(row):
+                    canvas.create_rectangle(cellWidth*i + drawMargin,cellWidth*j + drawMargin,
+                                            cellWidth*(i + 1) + drawMargin,cellWidth*(j+1) + drawMargin,fill='red')
+
+    def printBoard(self):
+        """
+        Displays a textual representation of the board, output to the monitor window.
+        """
+        ncols = self.getNcols()
+        for row in self.__rows:
+            print(" ".join(["*" if (row >> j) & 1 else "-" for j in xrange(ncols)]))
+
+    def makeBlankBoard(self):
+        """
+        Create self.__rows as nrows blank rows
+        """
+        self.setNcells(0)
+        self.setHash(0)
+        self.clearHistory()
+        self.getOccupancy().clear()
+        self.__rows = [0]*self.getNrows()
+
+    def makeBlankNeighbors(self):
+        """
+        Neighbor counts are never stored, so there is nothing to allocate.
+        """
+        pass
+
+    def update(self):
+        """
+        Finds the pattern on the n+1 th step, from the pattern on the nth step 
+        using Conway's rule-set.
+        """
+        profiler = PROFILER
+        if profiler is not None:
+            start = time.time()
+        self.setGeneration(self.getGeneration() + 1)
+        rows = self.__rows
+        nrows = len(rows)
+        ncols = self.getNcols()
+        mask = self.__mask
+        top = ncols - 1
+
+        # For each row, find the cells to the west and east of each cell, rotating the bits
+        # for the periodic (toroidal) boundary conditions.  Then add (west,centre,east) as 
+        # 2-bit numbers (sum0,sum1) for use by the rows above and below, and (west,east) for use by the row itself.
+        sum0 = []
+        sum1 = []
+        side0 = []
+        side1 = []
+        for row in rows:
+            west = ((row << 1) | (row >> top)) & mask
+            east = (row >> 1) | ((row & 1) << top)
+            westEast = west ^ east
+            sum0.append(westEast ^ row)
+            sum1.append((west & east) | (row & westEast))
+            side0.append(westEast)
+            side1.append(west & east)
+
+        # Add the three 2-bit numbers for each row.  The neighbor count is 2 or 3 exactly when
+        # the twos column sums to exactly 1, and the ones column then distinguishes 3 from 2.
+        if profiler is not None:
+            counted = time.time()
+            visited = 0
+            births = 0
+        newRows = []
+        ncells = 0
+        hash = self.getHash()
+        # The occupancy is only kept up to date if it is already, so stepping never has to recount it.
+        occupancy = self.getOccupancy(False)
+        colCounts = occupancy.getColCounts()
+        rowCounts = [] if colCounts is not None else None
+        for i in xrange(nrows):
+            iminus = i - 1
+            iplus = (i + 1) % nrows
+            # A row with no live cells in it or next to it stays empty
+            if not (rows[iminus] or rows[i] or rows[iplus]):
+                newRows.append(0)
+                if rowCounts is not None:
+                    rowCounts.append(0)
+                continue
+            a = sum0[iminus]
+            b = side0[i]
+            c = sum0[iplus]
+            ab = a ^ b
+            ones = ab ^ c
+            carry = (a & b) | (c & ab)
+
+            w = sum1[iminus]
+            x = side1[i]
+            y = sum1[iplus]
+            wx = w ^ x
+            yc = y ^ carry
+            twos = wx ^ yc
+            pairs = (w & x) | (y & carry) | (wx & yc)
+
+            newRow = twos & ~pairs & (ones | rows[i])
+            newRows.append(newRow)
+            count = bin(newRow).count('1') if newRow else 0
+            ncells += count
+
+            changed = newRow ^ rows[i]
+            if profiler is not None:
+                visited += 1
+                births += bin(changed & newRow).count('1')
+            if changed:
+                base = i*ncols
+                for j in bitPositions(changed):
+                    hash ^= cellKey(base + j)
+                if colCounts is not None:
+                    for j in bitPositions(changed & newRow):
+                        colCounts[j] += 1
+                    for j in bitPositions(changed & rows[i]):
+                        colCounts[j] -= 1
+            if rowCounts is not None:
+                rowCounts.append(count)
+
+        if rowCounts is not None:
+            occupancy.setCounts(rowCounts,colCounts)
+        self.__rows = newRows
+        if profiler is not None:
+            profiler.addTime('update.neighbors',counted - start)
+            profiler.addTime('update.rules',time.time() - counted)
+            profiler.addCount('update.cellsVisited',visited*ncols)
+            profiler.addCount('update.births',births)
+            profiler.addCount('update.deaths',self.getNcells() + births - ncells)
+        self.setNcells(ncells)
+        self.setHash(hash)
+
+    def countNcells(self):
+        """
+        sets self.__ncells to the number of live cells on the board
+        """
+        self.setNcells(sum([bin(row).count('1') for row in self.__rows]))
+
+    def countOccupancy(self):
+        """
+        Returns (rowCounts,colCounts), the number of live cells in each row and each column.  Only the set bits are visited.
+        """
+        colCounts = [0]*self.getNcols()
+        for row in self.__rows:
+            if row:
+                for j in bitPositions(row):
+                    colCounts[j] += 1
+        return [bin(row).count('1') for row in self.__rows],colCounts
+
+    def getBoard(self):
+        """
+        getter for board.  Note, the board is returned as the list of packed rows, where bit j of 
+        row i is the cell in row i and column j.  Use setCell to change cells.
+        """
+        return self.__rows
+
+    def copy(self):
+        """
+        Returns an independent copy of the board, including its pattern, generation and history.
+        """
+        other = Life.copy(self)
+        other.__rows = list(self.__rows)
+        return other
+
+    def getCell(self,i,j):
+        """
+        Returns 1 if the cell in row i and column j is live, otherwise 0.
+        """
+        return (self.__rows[i] >> j) & 1
+
+    def getRegion(self,i0,i1,j0,j1):
+        """
+        Returns the cells in rows i0 to i1-1 and columns j0 to j1-1 as a 2D numpy array of uint8.  Requires numpy.
+        """
+        width = j1 - j0
+        mask = (1 << width) - 1
+        region = numpy.zeros((i1 - i0,width),dtype=numpy.uint8)
+        for k,row in enumerate(self.__rows[i0:i1]):
+            bits = (row >> j0) & mask
+            if bits:
+                # bin() puts the highest column first, so reverse it
+                digits = bin(bits)[:1:-1]
+                region[k,:len(digits)] = numpy.frombuffer(digits,dtype=numpy.uint8) - ord('0')
+        return region
+
+    def setCell(self,i,j,value):
+        """
+        Sets the cell in row i and column j to value (0 or 1), keeping the number of live cells up to date.
+        """
+        if self.getCell(i,j) != value:
+            self.__rows[i] ^= 1 << j
+            self.setNcells(self.getNcells() + (1 if value else -1))
+            self.cellChanged(i,j)
+
+
+class ActiveLife(Life):
+    """
+    Incremental version of Life.  Neighbor counts are kept from one generation to the next and 
+    are adjusted only where cells are born or die.  Only the 3x3 neighborhoods of the cells that 
+    changed in the previous generation are re-evaluated, so the cost of a generation scales with the 
+    activity on the board rather than with its area.  Gives identical results to Life.
+
+    self.__board = 2D list (nrows x ncols) containing the pattern
+    self.__neighbors = 2D List (nrows x ncols) containing the number of neighbors of each cell (in toroidal boundary conditions)
+    self.__active = set of (i,j) cells which may change on the next generation
+    """
+    def __init__(self,nrows,ncols,percentage):
+        self.__active = set()
+        Life.__init__(self,nrows,ncols,percentage)
+
+    def randomize(self,percentage,seed=None,stream=None):
+        """
+        Fill the board according to the percentage, where 0 < percentage < 100.
+        The same seed and stream always give the same board (see randomRows).
+        """
+        self.makeBlankBoard()
+        for i,cells in enumerate(randomCells(self.getNrows(),self.getNcols(),percentage,seed,stream)):
+            for j in xrange(len(cells)):
+                if cells[j]:
+                    self.__flip(i,j,1)
+        self.countNcells()
+        self.rehash()
+
+    def setPatternFromTuple(self,tuple):
+        """
+        Creates a board pattern from a tuple, where the tuple encodes the 2D pattern as
+        a list of 1D integers.
+        """
+        self.makeBlankBoard()
+        ncols = self.getNcols()
+        for val in tuple:
+            i = val/ncols
+            j = val%ncols
+            if not self.__board[i][j]:
+                self.__flip(i,j,1)
+        self.setNcells(len(tuple))
+        self.rehash()
+
+    def getTupleFromPattern(self):
+        """
+        Generate a tuple from the pattern, where the tuple encodes the 2D pattern as
+        a list of 1D integers.
+        """
+        ncols = self.getNcols()
+        patternList = [i*ncols+j for i,row in enumerate(self.__board) if 1 in row for j,cell in enumerate(row) if cell]
+        return tuple(patternList)
+
+    def printBoardGraphics(self,canvas,cellWidth,drawMargin):
+        """
+        Displays a graphical representation of the board onto a tkinter canvas
+        """
+        self.printGridGraphics(canvas,cellWidth,drawMargin)
+
+        for j,row in enumerate(self.__board):
+            if 1 in row:
+                for i,cell in enumerate(row):
+                    if cell:
+                        canvas.create_rectangle(cellWidth*i + drawMargin,cellWidth*j + drawMargin,
+                                                cellWidth*(i + 1) + drawMargin,cellWidth*(j+1) + drawMargin,fill='red')
+
+    def printBoard(self):
+        """
+        Displays a textual representation of the board, output to the monitor window.
+        """
+        for row in self.__board:
+            print(" ".join(["*" if cell else "-" for cell in row]))
+
+    def makeBlankBoard(self):
+        """
+        Create self.__board and self.__neighbors as blank 2D lists of size nrows*ncols
+        """
+        self.setNcells(0)
+        self.setHash(0)
+        self.clearHistory()
+        self.getOccupancy().clear()
+        self.__board=[[0]*self.getNcols() for i in xrange(self.getNrows())]
+        self.makeBlankNeighbors()
+        self.__active = set()
+
+    def makeBlankNeighbors(self):
+        """
+        Create self.__neighbors as a blank 2D list of size nrows*ncols
+        """
+        self.__neighbors=[[0]*self.getNcols() for i in xrange(self.getNrows())]
+
+    def __flip(self,i,j,value):
+        """
+        Sets the cell in row i and column j to value, adjusts the neighbor counts around it
+        and marks its 3x3 neighborhood as active.
+        """
+        self.__board[i][j] = value
+        delta = 1 if value else -1
+
+        # Note use of periodic (toroidal) boundary conditions
+        nrows = self.getNrows()
+        ncols = self.getNcols()
+        iplus=(i + 1) % nrows
+        iminus=(i - 1) % nrows
+        jplus=(j + 1) % ncols
+        jminus=(j - 1) % ncols
+        neighbors = self.__neighbors
+        neighbors[iminus][jminus] += delta
+        neighbors[iminus][j     ] += delta
+        neighbors[iminus][jplus ] += delta
+        neighbors[i     ][jminus] += delta
+        neighbors[i     ][jplus ] += delta
+        neighbors[iplus ][jminus] += delta
+        neighbors[iplus ][j     ] += delta
+        neighbors[iplus ][jplus ] += delta
+
+        self.__active.update(((iminus,jminus),(iminus,j),(iminus,jplus),
+                              (i,jminus),(i,j),(i,jplus),
+                              (iplus,jminus),(iplus,j),(iplus,jplus)))
+
+    def update(self):
+        """
+        Finds the pattern on the n+1 th step, from the pattern on the nth step 
+        using Conway's rule-set.  Only the active cells are examined.
+        """
+        profiler = PROFILER
+        if profiler is not None:
+            start = time.time()
+        self.setGeneration(self.getGeneration() + 1)
+        board = self.__board
+        neighbors = self.__neighbors
+
+        # Decide every change first, using the counts from the nth step, then apply them.
+        births = []
+        deaths = []
+        for i,j in self.__active:
+            n = neighbors[i][j]
+            if board[i][j] == 0:
+                if n == 3:
+                    births.append((i,j))
+            elif n != 2 and n != 3:
+                deaths.append((i,j))
+
+        if profiler is not None:
+            decided = time.time()
+            visited = len(self.__active)
+        self.__active = set()
+        ncols = self.getNcols()
+        hash = self.getHash()
+        add = self.getOccupancy(False).add
+        for i,j in births:
+            self.__flip(i,j,1)
+            hash ^= cellKey(i*ncols + j)
+            add(i,j,1)
+        for i,j in deaths:
+            self.__flip(i,j,0)
+            hash ^= cellKey(i*ncols + j)
+            add(i,j,-1)
+
+        self.setNcells(self.getNcells() + len(births) - len(deaths))
+        self.setHash(hash)
+        if profiler is not None:
+            profiler.addTime('update.rules',decided - start)
+            profiler.addTime('update.neighbors',time.time() - decided)
+            profiler.addCount('update.cellsVisited',visited)
+            profiler.addCount('update.births',len(births))
+            profiler.addCount('update.deaths',len(deaths))
+
+    def countNcells(self):
+        """
+        sets self.__ncells to the number of live cells on the board
+        """
+        self.setNcells(sum([sum(row) for row in self.__board]))
+
+    def countOccupancy(self):
+        """
+        Returns (rowCounts,colCounts), the number of live cells in each row and each column, counted from the whole board.
+        """
+        return [sum(row) for row in self.__board],[sum(col) for col in zip(*self.__board)] if self.getNrows() else [0]*self.getNcols()
+
+    def getBoard(self):
+        """
+        getter for board.  Note, the neighbor counts are only kept up to date by setCell, 
+        so use setCell rather than changing the board directly.
+        """
+        return self.__board
+
+    def copy(self):
+        """
+        Returns an independent copy of the board, including its pattern, generation and history.
+        """
+        other = Life.copy(self)
+        other.__board = [row[:] for row in self.__board]
+        other.__neighbors = [row[:] for row in self.__neighbors]
+        other.__active = set(self.__active)
+        return other
+
+    def getCell(self,i,j):
+        """
+        Returns 1 if the cell in row i and column j is live, otherwise 0.
+        """
+        return self.__board[i][j]
+
+    def getRegion(self,i0,i1,j0,j1):
+        """
+        Returns the cells in rows i0 to i1-1 and columns j0 to j1-1 as a 2D numpy array of uint8.  Requires numpy.
+        """
+        region = [row[j0:j1] for row in self.__board[i0:i1]]
+        return numpy.array(region,dtype=numpy.uint8).reshape(i1 - i0,j1 - j0)
+
+    def setCell(self,i,j,value):
+        """
+        Sets the cell in row i and column j to value (0 or 1), keeping the number of live cells up to date.
+        """
+        if self.__board[i][j] != value:
+            self.__flip(i,j,value)
+            self.setNcells(self.getNcells() + (1 if value else -1))
+            self.cellChanged(i,j)
+
+
+class HashLifeNode(object):
+    """
+    A canonical (hash-consed) quadtree node used by HashLife.  A node of level n represents a square of 
+    2**n x 2**n cells.  Level 0 nodes are single cells and have no children.
+
+    nw, ne, sw, se = the four quadrants, each a node of level n-1
+    level = the level of the node
+    population = the number of live cells in the node
+    results = dictionary mapping j to the centre of the node (level n-1) after 2**j generations
+    """
+    __slots__ = ('nw','ne','sw','se','level','population','results')
+
+    def __init__(self,nw,ne,sw,se,level,population):
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level
+        self.population = population
+        self.results = None
+
+
+class HashLife(object):
+    """
+    HashLife engine, which advances the pattern by 2**k generations at a time using a memoized quadtree.
+    The same periodic (toroidal) boundary conditions as Life are used, so the results are identical:
+    the board is tiled periodically over the plane, and since every node at a given level is determined by 
+    its position modulo the board size, the tiling shares nodes as much as the pattern allows.
+
+    self.__nrows = number of rows
+    self.__ncols = number of columns
+    self.__cells = set of 1D integers encoding the live cells, as in the tuples used by Life
+    self.__generation = the generation number of the pattern
+    self.__maxNodes = the node table is garbage collected when it grows beyond this many nodes
+    self.__table = dictionary mapping (nw,ne,sw,se) to the canonical node with those quadrants
+    self.__empty = list of the canonical empty node of each level
+    self.__on, self.__off = the canonical live and dead level 0 nodes
+    self.__root = the most recent result node, kept alive through garbage collections
+    """
+    def __init__(self,nrows,ncols,maxNodes=1000000):
+        self.__nrows = nrows
+        self.__ncols = ncols
+        self.__cells = set()
+        self.__generation = 1
+        self.__maxNodes = maxNodes
+        self.__root = None
+        self.clearNodes()
+
+    def clearNodes(self):
+        """
+        Discards every node and memoized result.
+        """
+        self.__table = {}
+        self.__off = HashLifeNode(None,None,None,None,0,0)
+        self.__on = HashLifeNode(None,None,None,None,0,1)
+        self.__empty = [self.__off]
+        self.__root = None
+
+    def getNodeCount(self):
+        """
+        Returns the number of nodes in the node table.
+        """
+        return len(self.__table)
+
+    def collect(self):
+        """
+        Garbage collects the node table, keeping only the nodes which make up the last result, 
+        and those of their memoized results which are also kept.
+        """
+        root = self.__root
+        self.__table = {}
+        self.__empty = [self.__off]
+        if root is None:
+            return
+        table = self.__table
+        stack = [root]
+        seen = set()
+        while stack:
+            node = stack.pop()
+            if node.level == 0 or id(node) in seen:
+                continue
+            seen.add(id(node))
+            table[(node.nw,node.ne,node.sw,node.se)] = node
+            stack.extend((node.nw,node.ne,node.sw,node.se))
+
+        for node in table.values():
+            if node.results:
+                for j,result in node.results.items():
+                    if id(result) not in seen:
+                        del node.results[j]
+
+    def join(self,nw,ne,sw,se):
+        """
+        Returns the canonical node with the given four quadrants.
+        """
+        key = (nw,ne,sw,se)
+        node = self.__table.get(key)
+        if node is None:
+            node = HashLifeNode(nw,ne,sw,se,nw.level + 1,
+                                nw.population + ne.population + sw.population + se.population)
+            self.__table[key] = node
+        return node
+
+    def empty(self,level):
+        """
+        Returns the canonical empty node of the given level.
+        """
+        while len(self.__empty) <= level:
+            e = self.__empty[-1]
+            self.__empty.append(self.join(e,e,e,e))
+        return self.__empty[level]
+
+    def centre(self,node):
+        """
+        Returns the centre of a node as a node of one level lower.
+        """
+        return self.join(node.nw.se,node.ne.sw,node.sw.ne,node.se.nw)
+
+    def __base(self,node):
+        """
+        Returns the centre 2x2 of a level 2 node after one generation, using Conway's rule-set.
+        """
+        a,b,c,d = node.nw,node.ne,node.sw,node.se
+        grid = ((a.nw.population,a.ne.population,b.nw.population,b.ne.population),
+                (a.sw.population,a.se.population,b.sw.population,b.se.population),
+                (c.nw.population,c.ne.population,d.nw.population,d.ne.population),
+                (c.sw.population,c.se.population,d.sw.population,d.se.population))
+        cells = []
+        for i in (1,2):
+            for j in (1,2):
+                n = (grid[i-1][j-1] + grid[i-1][j] + grid[i-1][j+1] + grid[i][j-1] + grid[i][j+1]
+                     + grid[i+1][j-1] + grid[i+1][j] + grid[i+1][j+1])
+                alive = n == 3 or (n == 2 and grid[i][j])
+                cells.append(self.__on if alive else self.__off)
+        return self.join(*cells)
+
+    def step(self,node,j):
+        """
+        Returns the centre of node (a node of one level lower) after 2**j generations, where j <= level - 2.
+        """
+        n = node.level
+        if node.population == 0:
+            return self.empty(n - 1)
+        if node.results is None:
+            node.results = {}
+        elif j in node.results:
+            return node.results[j]
+        if n == 2:
+            result = self.__base(node)
+            node.results[j] = result
+            return result
+
+        join = self.join
+        nw,ne,sw,se = node.nw,node.ne,node.sw,node.se
+
+        # Nine overlapping sub-squares of level n-1 tile the node.
+        n00 = nw
+        n01 = join(nw.ne,ne.nw,nw.se,ne.sw)
+        n02 = ne
+        n10 = join(nw.sw,nw.se,sw.nw,sw.ne)
+        n11 = join(nw.se,ne.sw,sw.ne,se.nw)
+        n12 = join(ne.sw,ne.se,se.nw,se.ne)
+        n20 = sw
+        n21 = join(sw.ne,se.nw,sw.se,se.sw)
+        n22 = se
+
+        if j == n - 2:
+            # Full speed: advance each sub-square by half the time, then the recombined squares by the other half.
+            c = [self.step(m,n - 3) for m in (n00,n01,n02,n10,n11,n12,n20,n21,n22)]
+            k = n - 3
+        else:
+            # Reduced speed: take the centres without advancing, then advance the recombined squares by the full 2**j.
+            centre = self.centre
+            c = [centre(m) for m in (n00,n01,n02,n10,n11,n12,n20,n21,n22)]
+            k = j
+
+        result = join(self.step(join(c[0],c[1],c[3],c[4]),k),
+                      self.step(join(c[1],c[2],c[4],c[5]),k),
+                      self.step(join(c[3],c[4],c[6],c[7]),k),
+                      self.step(join(c[4],c[5],c[7],c[8]),k))
+        node.results[j] = result
+        return result
+
+    def __build(self,level,i0,j0):
+        """
+        Builds the node of the given level whose top-left cell is in row i0 and column j0 of the periodic tiling of the board.
+        """
+        nrows = self.__nrows
+        ncols = self.__ncols
+        cells = self.__cells
+        on = self.__on
+        off = self.__off
+        memo = {}
+
+        def build(level,i,j):
+            key = (level,i,j)
+            node = memo.get(key)
+            if node is not None:
+                return node
+            if level == 1:
+                iplus = (i + 1) % nrows
+                jplus = (j + 1) % ncols
+                node = self.join(on if i*ncols + j in cells else off,
+                                 on if i*ncols + jplus in cells else off,
+                                 on if iplus*ncols + j in cells else off,
+                                 on if iplus*ncols + jplus in cells else off)
+            else:
+                half = 1 << (level - 1)
+                iplus = (i + half) % nrows
+                jplus = (j + half) % ncols
+                node = self.join(build(level - 1,i,j),build(level - 1,i,jplus),
+                                 build(level - 1,iplus,j),build(level - 1,iplus,jplus))
+            memo[key] = node
+            return node
+
+        if not cells:
+            return self.empty(level)
+        return build(level,i0 % nrows,j0 % ncols)
+
+    def __extract(self,node,i0,j0,cells):
+        """
+        Adds the live cells of node, whose top-left cell is at row i0 and column j0, which lie on the board to cells.
+        """
+        if node.population == 0 or i0 >= self.__nrows or j0 >= self.__ncols:
+            return
+        if node.level == 0:
+            cells.add(i0*self.__ncols + j0)
+            return
+        half = 1 << (node.level - 1)
+        self.__extract(node.nw,i0,j0,cells)
+        self.__extract(node.ne,i0,j0 + half,cells)
+        self.__extract(node.sw,i0 + half,j0,cells)
+        self.__extract(node.se,i0 + half,j0 + half,cells)
+
+    def advance(self,k):
+        """
+        Advances the pattern by 2**k generations.
+        """
+        # The result of a node of level n is its centre, of width 2**(n-1), which must cover the whole board.
+        size = max(self.__nrows,self.__ncols)
+        level = max(k + 2,3)
+        while 1 << (level - 1) < size:
+            level += 1
+
+        quarter = 1 << (level - 2)
+        node = self.__build(level,-quarter,-quarter)
+        result = self.step(node,k)
+        self.__root = result
+
+        cells = set()
+        self.__extract(result,0,0,cells)
+        self.__cells = cells
+        self.__generation += 1 << k
+
+        if len(self.__table) > self.__maxNodes:
+            self.collect()
+
+    def advanceBy(self,ngens):
+        """
+        Advances the pattern by any number of generations, as a sum of powers of 2.
+        """
+        k = 0
+        while ngens:
+            if ngens & 1:
+                self.advance(k)
+            ngens >>= 1
+            k += 1
+
+    def setPatternFromTuple(self,tuple):
+        """
+        Creates the pattern from a tuple, where the tuple encodes the 2D pattern as
+        a list of 1D integers.
+        """
+        self.__cells = set(tuple)
+
+    def getTupleFromPattern(self):
+        """
+        Generate a tuple from the pattern, where the tuple encodes the 2D pattern as
+        a list of 1D integers.
+        """
+        return tuple(sorted(self.__cells))
+
+    def loadLife(self,life):
+        """
+        Copies the pattern and generation from a Life board of the same size.
+        """
+        self.setPatternFromTuple(life.getTupleFromPattern())
+        self.__generation = life.getGeneration()
+
+    def storeLife(self,life):
+        """
+        Copies the pattern and generation back to a Life board of the same size.
+        """
+        life.setPatternFromTuple(self.getTupleFromPattern())
+        life.setGeneration(self.__generation)
+
+    def getGeneration(self):
+        """
+        getter for generation
+        """
+        return self.__generation
+
+    def setGeneration(self,gen):
+        """
+        setter for generation
+        """
+        self.__generation = gen
+
+    def getNcells(self):
+        """
+        getter for ncells
+        """
+        return len(self.__cells)
+
+
+class SparseLife(object):
+    """
+    Unbounded version of Life, holding only the coordinates of the live cells in a set.  There is no boundary, 
+    so patterns never wrap around, and memory and the cost of each generation are proportional to the population.
+    Rows and columns may be any integers, including negative ones.
+
+    self.__cells = set of (i,j) pairs, the rows and columns of the live cells
+    self.__generation = the generation number of the pattern
+    """
+    def __init__(self):
+        self.__cells = set()
+        self.__generation = 1
+
+    def setPatternFromTuple(self,tuple,ncols,row0=0,col0=0):
+        """
+        Creates the pattern from a tuple, where the tuple encodes the 2D pattern as a list of 1D integers
+        for a board with ncols columns.  The pattern is translated by row0 rows and col0 columns.
+        """
+        self.__cells = set([(row0 + val/ncols,col0 + val%ncols) for val in tuple])
+
+    def getTupleFromPattern(self,ncols,row0=0,col0=0):
+        """
+        Generate a tuple encoding the 2D pattern as a list of 1D integers for a board with ncols columns,
+        translated so that the top-left corner of its bounding box is at row row0 and column col0.
+        """
+        if not self.__cells:
+            return ()
+        imin,jmin,imax,jmax = self.getBoundingBox()
+        if row0 < 0 or col0 < 0 or col0 + jmax - jmin >= ncols:
+            raise ValueError("pattern does not fit in %d columns" %ncols)
+        return tuple(sorted([(i - imin + row0)*ncols + j - jmin + col0 for i,j in self.__cells]))
+
+    def loadLife(self,life,row0=0,col0=0):
+        """
+        Copies the pattern and generation from a Life board, translating it by row0 rows and col0 columns.
+        """
+        self.setPatternFromTuple(life.getTupleFromPattern(),life.getNcols(),row0,col0)
+        self.__generation = life.getGeneration()
+
+    def storeLife(self,life,row0=None,col0=None):
+        """
+        Copies the pattern and generation to a Life board, with the top-left corner of the bounding box of the 
+        pattern at row row0 and column col0.  By default the pattern is centred on the board.
+        """
+        nrows = life.getNrows()
+        ncols = life.getNcols()
+        if self.__cells:
+            imin,jmin,imax,jmax = self.getBoundingBox()
+            if row0 is None:
+                row0 = (nrows - (imax - imin + 1))/2
+            if col0 is None:
+                col0 = (ncols - (jmax - jmin + 1))/2
+            if row0 + imax - imin >= nrows:
+                raise ValueError("pattern does not fit in %d rows" %nrows)
+        life.setPatternFromTuple(self.getTupleFromPattern(ncols,row0 or 0,col0 or 0))
+        life.setGeneration(self.__generation)
+
+    def getBoundingBox(self):
+        """
+        Returns (imin,jmin,imax,jmax), the first and last rows and columns containing live cells, or None if there are none.
+        """
+        if not self.__cells:
+            return None
+        rows = [i for i,j in self.__cells]
+        cols = [j for i,j in self.__cells]
+        return (min(rows),min(cols),max(rows),max(cols))
+
+    def printBoard(self):
+        """
+        Displays a textual representation of the bounding box of the pattern, output to the monitor window.
+        """
+        if not self.__cells:
+            return
+        imin,jmin,imax,jmax = self.getBoundingBox()
+        for i in xrange(imin,imax + 1):
+            print(" ".join(["*" if (i,j) in self.__cells else "-" for j in xrange(jmin,jmax + 1)]))
+
+    def update(self):
+        """
+        Finds the pattern on the n+1 th step, from the pattern on the nth step 
+        using Conway's rule-set.
+        """
+        self.__generation += 1
+        cells = self.__cells
+
+        # Only cells next to a live cell can have any neighbors, so count just those.
+        neighbors = {}
+        get = neighbors.get
+        for i,j in cells:
+            for cell in ((i-1,j-1),(i-1,j),(i-1,j+1),(i,j-1),(i,j+1),(i+1,j-1),(i+1,j),(i+1,j+1)):
+                neighbors[cell] = get(cell,0) + 1
+
+        self.__cells = set([cell for cell,n in neighbors.iteritems() if n == 3 or (n == 2 and cell in cells)])
+
+    def getCell(self,i,j):
+        """
+        Returns 1 if the cell in row i and column j is live, otherwise 0.
+        """
+        return 1 if (i,j) in self.__cells else 0
+
+    def setCell(self,i,j,value):
+        """
+        Sets the cell in row i and column j to value (0 or 1).
+        """
+        if value:
+            self.__cells.add((i,j))
+        else:
+            self.__cells.discard((i,j))
+
+    def getCells(self):
+        """
+        getter for cells.  Note, the set is mutable, so changes to it outside of this class will also cause changes inside.
+        """
+        return self.__cells
+
+    def getGeneration(self):
+        """
+        getter for generation
+        """
+        return self.__generation
+
+    def setGeneration(self,gen):
+        """
+        setter for generation
+        """
+        self.__generation = gen
+
+    def getNcells(self):
+        """
+        getter for ncells
+        """
+        return len(self.__cells)
+
+
+class EnsembleLife(object):
+    """
+    An ensemble of independent boards of the same size, held in one contiguous numpy array and all 
+    advanced together by each call to update(), so the interpreter overhead is shared between the boards.
+    Each board has periodic (toroidal) boundary conditions and gives identical results to Life.
+    A board is stable once it has settled into a still life or an oscillator (as a whole) of period at most maxPeriod,
+    which is found from the Zobrist hashes of each board over the last maxPeriod generations.
+    Requires numpy.
+
+    self.__nboards, self.__nrows, self.__ncols = the number of boards and the size of each board
+    self.__buffers = 4D numpy array (2 x nboards x nrows x ncols) of uint8 holding the current and next boards
+    self.__parity = the index into self.__buffers of the current boards
+    self.__generation = the generation number of the boards
+    self.__ncells = 1D array (nboards) of the number of live cells on each board
+    self.__maxPeriod = the longest period found
+    self.__keys = 1D array (nrows*ncols) of uint64 holding the Zobrist key of each cell (see cellKey)
+    self.__hashes = 2D array (maxPeriod x nboards) of uint64 holding the hashes of the boards, newest generation first
+    self.__nhashes = the number of generations in self.__hashes, which are only kept since the boards were last changed
+    self.__periods = 1D array (nboards) of the period each board has settled into, or 0 if it has not settled
+    self.__stableSince = 1D array (nboards) of the generation at which each board settled, or 0 if it has not settled
+    """
+    def __init__(self,nboards,nrows,ncols,maxPeriod=8):
+        if numpy is None:
+            raise ImportError("EnsembleLife requires numpy")
+        self.__nboards = nboards
+        self.__nrows = nrows
+        self.__ncols = ncols
+        self.__buffers = numpy.zeros((2,nboards,nrows,ncols),dtype=numpy.uint8)
+        self.__parity = 0
+        self.__generation = 1
+        self.__ncells = numpy.zeros(nboards,dtype=numpy.int64)
+        self.__maxPeriod = maxPeriod
+        self.__keys = cellKeys(numpy.arange(nrows*ncols))
+        self.__hashes = numpy.zeros((maxPeriod,nboards),dtype=numpy.uint64)
+        self.__nhashes = 0
+        self.__periods = numpy.zeros(nboards,dtype=numpy.int64)
+        self.__stableSince = numpy.zeros(nboards,dtype=numpy.int64)
+
+    def randomize(self,percentage,seed=None):
+        """
+        Fill every board independently according to the percentage, where 0 < percentage < 100.
+        Board k is filled from stream k of seed, so it is the same as a single board randomized with 
+        that seed and stream, whatever the number of boards.
+        """
+        boards = self.getBoards()
+        for k in xrange(self.__nboards):
+            r0 = 0
+            for chunk in randomRows(self.__nrows,self.__ncols,percentage,seed,k):
+                boards[k,r0:r0 + len(chunk)] = chunk
+                r0 += len(chunk)
+        self.__reset()
+
+    def setPatternFromTuple(self,k,tuple):
+        """
+        Creates the pattern of board k from a tuple, where the tuple encodes the 2D pattern as
+        a list of 1D integers.
+        """
+        board = self.getBoards()[k]
+        board[...] = 0
+        board.reshape(-1)[list(tuple)] = 1
+        self.__reset()
+
+    def getTupleFromPattern(self,k):
+        """
+        Generate a tuple from the pattern of board k, where the tuple encodes the 2D pattern as
+        a list of 1D integers.
+        """
+        return tuple(numpy.flatnonzero(self.getBoards()[k]).tolist())
+
+    def __reset(self):
+        """
+        Recounts the live cells after the boards are changed, and forgets their earlier hashes and which boards had settled.
+        """
+        boards = self.getBoards()
+        self.__ncells = numpy.count_nonzero(boards.reshape(self.__nboards,-1),axis=1).astype(numpy.int64)
+        self.__nhashes = 0
+        self.__periods[...] = 0
+        self.__stableSince[...] = 0
+
+    def __hash(self,boards):
+        """
+        Returns a 1D array (nboards) of the Zobrist hashes of boards, the XOR of the keys of their live cells.
+        """
+        flat = boards.reshape(self.__nboards,-1)
+        return numpy.bitwise_xor.reduce(numpy.where(flat,self.__keys,numpy.uint64(0)),axis=1)
+
+    def update(self):
+        """
+        Advances every board by one generation using Conway's rule-set.
+        """
+        self.__generation += 1
+        board = self.__buffers[self.__parity]
+        new = self.__buffers[1 - self.__parity]
+        if not self.__nhashes:
+            self.__hashes[0] = self.__hash(board)
+            self.__nhashes = 1
+        evolveArray(board,new)
+        self.__parity = 1 - self.__parity
+
+        flat = new.reshape(self.__nboards,-1)
+        self.__ncells = numpy.count_nonzero(flat,axis=1).astype(numpy.int64)
+
+        # The period is the first number of generations back at which the hash is the same.
+        hash = self.__hash(new)
+        same = self.__hashes[:self.__nhashes] == hash
+        self.__periods = numpy.where(same.any(axis=0),same.argmax(axis=0) + 1,0)
+        self.__hashes[1:] = self.__hashes[:-1].copy()
+        self.__hashes[0] = hash
+        self.__nhashes = min(self.__nhashes + 1,self.__maxPeriod)
+
+        settled = self.__periods > 0
+        self.__stableSince[~settled] = 0
+        started = settled & (self.__stableSince == 0)
+        self.__stableSince[started] = self.__generation - self.__periods[started]
+
+    def run(self,ngens):
+        """
+        Advances every board by up to ngens generations, stopping early once every board is stable.
+        Returns the number of generations run.
+        """
+        for gen in xrange(ngens):
+            if self.__periods.all():
+                return gen
+            self.update()
+        return ngens
+
+    def getBoards(self):
+        """
+        getter for the boards, a 3D array (nboards x nrows x ncols).  Note, the array is mutable, so changes to it outside of 
+        this class will also cause changes inside.  It is only the current boards until the next call to update().
+        """
+        return self.__buffers[self.__parity]
+
+    def storeLife(self,k,life):
+        """
+        Copies the pattern of board k and the generation to a Life board of the same size.
+        """
+        life.setPatternFromTuple(self.getTupleFromPattern(k))
+        life.setGeneration(self.__generation)
+
+    def getPopulations(self):
+        """
+        Returns a 1D array of the number of live cells on each board.
+        """
+        return self.__ncells
+
+    def getExtinct(self):
+        """
+        Returns a 1D array of booleans, set for the boards with no live cells.
+        """
+        return self.__ncells == 0
+
+    def getStable(self):
+        """
+        Returns a 1D array of booleans, set for the boards which have settled into a still life or an oscillator 
+        of period at most maxPeriod.  Boards with no live cells are still.
+        """
+        return self.__periods > 0
+
+    def getPeriods(self):
+        """
+        Returns a 1D array of the period each board has settled into (1 for a still board), or 0 for boards 
+        which have not settled.
+        """
+        return self.__periods
+
+    def getStableSince(self):
+        """
+        Returns a 1D array of the first generation of the cycle each board has settled into, or 0 for boards 
+        which have not settled.
+        """
+        return self.__stableSince
+
+    def getGeneration(self):
+        """
+        getter for generation
+        """
+        return self.__generation
+
+    def getNboards(self):
+        """
+        getter for nboards
+        """
+        return self.__nboards
+
+
+# Stepping engines, by name.  Each engine is a class with the same interface as Life.
+ENGINES = {'list':Life,'packed':PackedLife,'active':ActiveLife}
+if numpy is not None:
+    ENGINES['numpy'] = NumpyLife
+    ENGINES['parallel'] = ParallelLife
+    ENGINES['mapped'] = MappedLife
+
+
+class Symmetries(object):
+    """
+    The symmetries of the board inside the 1 cell margin of a board of nrows x ncols, used to keep one representative 
+    of each pattern and its translations and reflections.  The reflections are precomputed as tables mapping each 
+    1D integer on the board of dimension (nrows-2)*(ncols-2) to its image, so that no division is done per pattern.
+    Use getSymmetries rather than making one directly, so the tables are only built once per board size.
+
+    self.__nrows_reduced = number of rows inside the margin
+    self.__ncols_reduced = number of columns inside the margin
+    self.__rows = list of the row of each cell
+    self.__cols = list of the column of each cell
+    self.__tables = list of the tables of the reflections other than the identity:  horizontal, vertical and 
+                    horizontal + vertical, then for square boards the same after swapping rows and columns
+    """
+    def __init__(self,nrows,ncols):
+        nrows_reduced = nrows - 2
+        ncols_reduced = ncols - 2
+        self.__nrows_reduced = nrows_reduced
+        self.__ncols_reduced = ncols_reduced
+
+        cells = xrange(max(nrows_reduced*ncols_reduced,0))
+        self.__rows = [m/ncols_reduced for m in cells]
+        self.__cols = [m%ncols_reduced for m in cells]
+
+        maps = [lambda i,j: (nrows_reduced - 1 - i,j),
+                lambda i,j: (i,ncols_reduced - 1 - j),
+                lambda i,j: (nrows_reduced - 1 - i,ncols_reduced - 1 - j)]
+        if nrows==ncols:
+            maps += [lambda i,j: (j,i),
+                     lambda i,j: (j,nrows_reduced - 1 - i),
+                     lambda i,j: (ncols_reduced - 1 - j,i),
+                     lambda i,j: (ncols_reduced - 1 - j,nrows_reduced - 1 - i)]
+
+        self.__tables = []
+        for map in maps:
+            table = []
+            for m in cells:
+                i,j = map(self.__rows[m],self.__cols[m])
+                table.append(i*ncols_reduced + j)
+            self.__tables.append(table)
+
+    def getTables(self):
+        """
+        getter for tables
+        """
+        return self.__tables
+
+    def isCanonical(self,tuplej):
+        """
+        Returns True if tuplej, a sorted tuple of cells, has a live cell in row 0 and in column 0, and is no greater 
+        than any of its reflections.  Each reflection is compared by its smallest cell first, and only sorted 
+        if that is a tie.
+        """
+        if not tuplej or tuplej[0] >= self.__ncols_reduced:
+            return False
+        cols = self.__cols
+        for m in tuplej:
+            if not cols[m]:
+                break
+        else:
+            return False
+
+        first = tuplej[0]
+        for table in self.__tables:
+            image = [table[m] for m in tuplej]
+            least = min(image)
+            if least < first:
+                return False
+            if least == first and tuple(sorted(image)) < tuplej:
+                return False
+        return True
+
+    def canonicalForm(self,tuplej):
+        """
+        Returns the smallest of the images of tuplej under the symmetries, each translated so that it has a live cell 
+        in row 0 and in column 0.  Patterns which are translations or reflections of each other have the same form.
+        """
+        rows = self.__rows
+        cols = self.__cols
+        ncols_reduced = self.__ncols_reduced
+        best = None
+        for table in [None] + self.__tables:
+            image = tuplej if table is None else [table[m] for m in tuplej]
+            row0 = min([rows[m] for m in image])
+            col0 = min([cols[m] for m in image])
+            form = tuple(sorted([(rows[m] - row0)*ncols_reduced + cols[m] - col0 for m in image]))
+            if best is None or form < best:
+                best = form
+        return best
+
+SYMMETRIES = {}
+
+def getSymmetries(nrows,ncols):
+    """
+    Returns the Symmetries of a board of nrows x ncols, building them the first time.
+    """
+    symmetries = SYMMETRIES.get((nrows,ncols))
+    if symmetries is None:
+        symmetries = SYMMETRIES[(nrows,ncols)] = Symmetries(nrows,ncols)
+    return symmetries
+
+def isCanonical(tuplej,nrows,ncols):
+    """
+    Returns True if tuplej, a sorted tuple of live cells inside the 1 cell margin of a board of nrows x ncols 
+    (encoded as 1D integers on the board of dimension (nrows-2)*(ncols-2)), is the representative which the 
+    still life searches keep of its translations and reflections:  it has a live cell in row 0 and in column 0, 
+    and is no greater than its reflections along the 4 symmetries of a rectangle or 8 symmetries of the square.
+    """
+    return getSymmetries(nrows,ncols).isCanonical(tuplej)
+
+def boardTuple(tuplej,ncols):
+    """
+    Converts a pattern tuple inside the 1 cell margin to the format for a board of dimension nrows*ncols.
+    """
+    ncols_reduced = ncols - 2
+    pattern=[]
+    for val in tuplej:
+        i = 1 + val/ncols_reduced
+        j = 1 + val%ncols_reduced
+        pattern.append(i*ncols + j)
+    return tuple(pattern)
+
+def reducedTuple(pattern,ncols):
+    """
+    Converts a pattern tuple for a board of dimension nrows*ncols to the format inside the 1 cell margin,
+    the inverse of boardTuple.
+    """
+    ncols_reduced = ncols - 2
+    tuplej=[]
+    for val in pattern:
+        i = val/ncols - 1
+        j = val%ncols - 1
+        tuplej.append(i*ncols_reduced + j)
+    return tuple(sorted(tuplej))
+
+
+class StillLifeIndex(object):
+    """
+    Index of patterns on a board of nrows x ncols by their canonical form (see Symmetries.canonicalForm), so that 
+    translations and reflections of a pattern already found are recognised in constant time.
+
+    self.__nrows = number of rows
+    self.__ncols = number of columns
+    self.__forms = dictionary mapping the canonical form of each pattern added to the first pattern added with that form
+    """
+    def __init__(self,nrows,ncols):
+        self.__nrows = nrows
+        self.__ncols = ncols
+        self.__forms = {}
+
+    def getForm(self,pattern):
+        """
+        Returns the canonical form of pattern, a tuple for the full board.
+        """
+        return getSymmetries(self.__nrows,self.__ncols).canonicalForm(reducedTuple(pattern,self.__ncols))
+
+    def add(self,pattern):
+        """
+        Adds pattern, a tuple for the full board.  Returns True if no translation or reflection of it had been added.
+        """
+        form = self.getForm(pattern)
+        if form in self.__forms:
+            return False
+        self.__forms[form] = pattern
+        return True
+
+    def find(self,pattern):
+        """
+        Returns the pattern added which is a translation or reflection of pattern, or None.
+        """
+        return self.__forms.get(self.getForm(pattern))
+
+    def __contains__(self,pattern):
+        return self.find(pattern) is not None
+
+    def __len__(self):
+        return len(self.__forms)
+
+def stillLifeCandidates(nrows,ncols,n):
+    """
+    Generates every pattern of n live cells inside a 1 cell 'safety-margin' about the perimeter of a board of 
+    nrows x ncols, except for translations and reflections of patterns generated earlier.  Each pattern is 
+    a tuple encoding the 2D pattern on the full board as a list of 1D integers.
+    This is the brute force enumeration: every candidate must still be tested with isStillPattern.  
+    searchStillLifes finds the same still lifes much faster.
+    """
+
+    # Iterate over all patterns in a board of dimension (nrows-2)*(ncols-2), 
+    # the size of the board within a 1 square safety margin around the perimeter.
+
+    ncols_reduced = ncols - 2
+    nrows_reduced = nrows - 2
+    if n <= 0 or nrows_reduced <= 0 or ncols_reduced <= 0:
+        return
+
+    for tuplej in combinations(xrange(nrows_reduced*ncols_reduced),n):
+
+        # Halt enumeration if the first live cell in the tuple is in a column more than half-way accross the width of the board.
+        # All subsequent patterns are translations and rotations of patterns encountered so far.
+        # Proof:  If the first cell is in row 0, then the reflection j -> ncols-1-j results in a pattern where j is 
+        # less than half-way across the 
+        # width of the board and so will already have been enumerated.  
+        # If the first cell is not in row 0, then a translation can take the pattern to one which has its first cell in row 0.
+
+        j0 = tuplej[0]%ncols_reduced
+        if j0 > ncols_reduced-1 - j0: break
+
+        if isCanonical(tuplej,nrows,ncols):
+            yield boardTuple(tuplej,ncols)
+
+def searchStillLifes(nrows,ncols,n,prefix=(),depth=None,stopped=None):
+    """
+    Generates the same still lifes as testing every pattern from stillLifeCandidates with isStillPattern, in the same order, 
+    but by a backtracking search which is orders of magnitude faster.
+
+    The cells inside the margin are decided one at a time in the order of their 1D integers, trying live before dead
+    (which gives the patterns in the same order as combinations).  For every cell of the board the search keeps the number 
+    of live and of undecided neighbors, and abandons a partial pattern as soon as some cell can no longer be stable: 
+    a live cell with more than 3 live neighbors or too few possible ones, or a dead cell with all its neighbors decided 
+    and exactly 3 of them live.  Partial patterns whose first live cell, or live cell in column 0, could not satisfy
+    isCanonical are abandoned too.
+
+    prefix fixes the values (1 live, 0 dead) of the first len(prefix) cells, so that only the still lifes which extend it 
+    are generated.  If depth is given, the partial patterns of depth cells reached by the search are generated instead, 
+    as prefixes.  Searching each of them in turn generates the same still lifes as the whole search, so they can be 
+    used as independent units of work (see StillLifeEnumeration).
+
+    stopped, if given, is called every few thousand values tried, and the search ends as soon as it returns True, 
+    so that a search which goes a long time between still lifes can be abandoned.
+    """
+    ncols_reduced = ncols - 2
+    nrows_reduced = nrows - 2
+    ncandidates = nrows_reduced*ncols_reduced
+    if n <= 0 or nrows_reduced <= 0 or ncols_reduced <= 0 or n > ncandidates:
+        return
+
+    # The full board cell of each candidate cell, and the full board cells which neighbor it (in toroidal boundary conditions,
+    # repeated as often as Life.update would count them).
+
+    cells = [(1 + k/ncols_reduced)*ncols + 1 + k%ncols_reduced for k in xrange(ncandidates)]
+    neighbors = []
+    for cell in cells:
+        i,j = divmod(cell,ncols)
+        neighbors.append([((i + di)%nrows)*ncols + (j + dj)%ncols 
+                          for di in (-1,0,1) for dj in (-1,0,1) if di or dj])
+
+    # state: 1 live, 0 dead, -1 undecided.  Cells outside the margin are always dead.
+    # live, undecided: the number of live and undecided neighbors of each cell of the board.
+
+    state = [0]*(nrows*ncols)
+    live = [0]*(nrows*ncols)
+    undecided = [0]*(nrows*ncols)
+    for k in xrange(ncandidates):
+        state[cells[k]] = -1
+        for cell in neighbors[k]:
+            undecided[cell] += 1
+
+    # The last candidate which may hold the first live cell, and the last candidate in column 0.
+
+    lastFirst = (ncols_reduced - 1)/2
+    lastColumn0 = (nrows_reduced - 1)*ncols_reduced
+
+    leaf = ncandidates if depth is None else min(depth,ncandidates)
+    values = [0]*ncandidates
+    nlive = 0
+    nlive0 = 0
+    k = 0
+    value = 1
+
+    # tested counts the values tried for a cell, and pruned those abandoned because some cell could no longer be stable.
+    profiler = PROFILER
+    start = time.time()
+    tested = 0
+    pruned = 0
+    try:
+        while True:
+            if k == leaf or value < 0:
+                if k == leaf:
+                    if depth is not None:
+                        yield tuple(values[:leaf])
+                    else:
+                        assert nlive == n
+                        tuplej = tuple([m for m in xrange(ncandidates) if values[m]])
+                        if isCanonical(tuplej,nrows,ncols):
+                            yield boardTuple(tuplej,ncols)
+
+                # Backtrack to the last decided cell and try its next value.
+
+                k -= 1
+                if k < 0:
+                    return
+                value = values[k] - 1
+                if values[k]:
+                    nlive -= 1
+                    if k%ncols_reduced == 0: nlive0 -= 1
+                    for cell in neighbors[k]:
+                        live[cell] -= 1
+                for cell in neighbors[k]:
+                    undecided[cell] += 1
+                state[cells[k]] = -1
+                continue
+
+            # Check the count of live cells and the canonical position of the first live cell and a live cell in column 0.
+
+            if k < len(prefix) and value != prefix[k]:
+                feasible = False
+            elif value:
+                feasible = nlive < n and (nlive or k <= lastFirst)
+            else:
+                feasible = nlive + ncandidates - k - 1 >= n and (nlive or k < lastFirst)\
+                    and (k != lastColumn0 or nlive0)
+            if not feasible:
+                value -= 1
+                continue
+
+            values[k] = value
+            state[cells[k]] = value
+            tested += 1
+            if not tested & 4095 and stopped is not None and stopped():
+                return
+            if value:
+                nlive += 1
+                if k%ncols_reduced == 0: nlive0 += 1
+                for cell in neighbors[k]:
+                    live[cell] += 1
+            for cell in neighbors[k]:
+                undecided[cell] -= 1
+
+            # Check every cell whose state or neighbors have just changed.
+
+            for cell in neighbors[k] + [cells[k]]:
+                if state[cell] == 1:
+                    if live[cell] > 3 or live[cell] + undecided[cell] < 2:
+                        break
+                elif state[cell] == 0:
+                    if undecided[cell] == 0 and live[cell] == 3:
+                        break
+            else:
+                k += 1
+                value = 1
+                continue
+
+            # The cell can't take this value: undo it and try the next.
+
+            pruned += 1
+            if value:
+                nlive -= 1
+                if k%ncols_reduced == 0: nlive0 -= 1
+                for cell in neighbors[k]:
+                    live[cell] -= 1
+            for cell in neighbors[k]:
+                undecided[cell] += 1
+            state[cells[k]] = -1
+            value -= 1
+    finally:
+        if profiler is not None:
+            profiler.addTime('search.seconds',time.time() - start)
+            profiler.addCount('search.tested',tested)
+            profiler.addCount('search.pruned',pruned)
+
+def revolvingDoorSwaps(n,t):
+    """
+    Generates the t-combinations of range(n) in revolving door order (Knuth, Algorithm 7.2.1.3R), starting
+    from range(t).  Consecutive combinations differ by one element leaving and one entering, so only the 
+    (out,in) pairs are generated, in amortized constant time each.
+    """
+    if t <= 0 or t >= n:
+        return
+
+    # c[1..t] hold the combination in increasing order, with the sentinel c[t+1] = n.
+
+    c = range(-1,t) + [n]
+    while True:
+        if t%2:
+            if c[1] + 1 < c[2]:
+                c[1] += 1
+                yield c[1] - 1,c[1]
+                continue
+            j = 2
+            increase = False
+        else:
+            if c[1] > 0:
+                c[1] -= 1
+                yield c[1] + 1,c[1]
+                continue
+            j = 2
+            increase = True
+
+        while j <= t:
+            if not increase:
+                # Try to decrease c[j], which is c[j-1] + 1.
+                if c[j] >= j:
+                    out = c[j]
+                    c[j] = c[j-1]
+                    c[j-1] = j - 2
+                    yield out,j - 2
+                    break
+                j += 1
+            # Try to increase c[j], with c[j-1] = j - 2.
+            increase = False
+            if c[j] + 1 < c[j+1]:
+                c[j-1] = c[j]
+                c[j] += 1
+                yield j - 2,c[j]
+                break
+            j += 1
+        else:
+            return
+
+def revolvingDoorStillLifes(nrows,ncols,n):
+    """
+    Returns the same still lifes as testing every pattern from stillLifeCandidates with isStillPattern, in the same order.
+
+    Every pattern of n cells inside the margin is visited in revolving door order (see revolvingDoorSwaps), so each 
+    differs from the last by one cell dying and one being born.  The number of live neighbors of every cell of the board,
+    and the number of cells which would change in the next generation, are updated for just those two cells and their 
+    neighbors, so testing a pattern takes constant time.  The translation and reflection filter (isCanonical) is only 
+    applied to the patterns which are still lifes, which are then sorted into the order of combinations.
+    """
+    ncols_reduced = ncols - 2
+    nrows_reduced = nrows - 2
+    ncandidates = nrows_reduced*ncols_reduced
+    if n <= 0 or nrows_reduced <= 0 or ncols_reduced <= 0 or n > ncandidates:
+        return []
+
+    # The full board cell of each candidate cell, the full board cells which neighbor it (repeated as often 
+    # as Life.update would count them), and the distinct cells whose next state depends on it.
+
+    cells = [(1 + k/ncols_reduced)*ncols + 1 + k%ncols_reduced for k in xrange(ncandidates)]
+    neighbors = []
+    for cell in cells:
+        i,j = divmod(cell,ncols)
+        neighbors.append([((i + di)%nrows)*ncols + (j + dj)%ncols 
+                          for di in (-1,0,1) for dj in (-1,0,1) if di or dj])
+    around = [list(set(neighbors[k] + [cells[k]])) for k in xrange(ncandidates)]
+
+    # changes[state][count] is 1 if a cell in state with count live neighbors changes in the next generation.
+
+    changes = [[0,0,0,1,0,0,0,0,0],[1,1,0,0,1,1,1,1,1]]
+    state = [0]*(nrows*ncols)
+    count = [0]*(nrows*ncols)
+
+    def flip(k):
+        """
+        Flips candidate k, returning the change in the number of cells which would change.
+        """
+        before = 0
+        for cell in around[k]:
+            before += changes[state[cell]][count[cell]]
+        value = 1 - state[cells[k]]
+        state[cells[k]] = value
+        delta = 2*value - 1
+        for cell in neighbors[k]:
+            count[cell] += delta
+        after = 0
+        for cell in around[k]:
+            after += changes[state[cell]][count[cell]]
+        return after - before
+
+    # As in stillLifeCandidates, only patterns whose first live cell m lies in row 0, no more than half-way across, 
+    # can pass isCanonical.  For each m the other cells are chosen in revolving door order from the cells after it.
+
+    lastFirst = (ncols_reduced - 1)/2
+    found = []
+    for m in xrange(min(lastFirst + 1,ncandidates - n + 1)):
+        live = set([m] + range(m + 1,m + n))
+        unstable = 0
+        for k in live:
+            unstable += flip(k)
+
+        swaps = revolvingDoorSwaps(ncandidates - m - 1,n - 1)
+        while True:
+            if not unstable:
+                tuplej = tuple(sorted(live))
+                if isCanonical(tuplej,nrows,ncols):
+                    found.append(boardTuple(tuplej,ncols))
+            for out,into in swaps:
+                out += m + 1
+                into += m + 1
+                live.remove(out)
+                live.add(into)
+                unstable += flip(out) + flip(into)
+                break
+            else:
+                break
+
+        for k in live:
+            flip(k)
+
+    found.sort()
+    return found
+
+
+def enumerateUnit(work):
+    """
+    Searches one unit of a StillLifeEnumeration, given as (directory,nrows,ncols,n,index,prefix), unless another 
+    process has claimed it.  The still lifes found are written to the unit's result file, one tuple per line, which 
+    marks the unit as done.  Returns (index,list of still lifes), or (index,None) if the unit was claimed elsewhere.
+    Used as the task of the process pool, so it must be a module level function.
+    """
+    directory,nrows,ncols,n,index,prefix = work
+    enumeration = StillLifeEnumeration(directory,nrows,ncols,n)
+    if not enumeration.claim(index):
+        return index,None
+
+    found = list(searchStillLifes(nrows,ncols,n,prefix))
+    enumeration.complete(index,found)
+    return index,found
+
+
+class StillLifeEnumeration(object):
+    """
+    A search for all still lifes of n cells on a board of nrows x ncols (see searchStillLifes), split into units of 
+    work which are checkpointed to a directory, so that the search can be resumed after it is abandoned or crashes, 
+    and shared between several machines through the same directory.
+
+    The units are the partial patterns of the first depth cells reached by the search, numbered in search order.  
+    The directory holds:
+        enumeration.txt         the board size, n and depth, which must match on resume
+        unit-NNNNNN.claim       the host and process id of the process searching unit NNNNNN
+        unit-NNNNNN.txt         the still lifes found in unit NNNNNN, written once the unit is done
+    Claims left by crashed processes on this host are taken over.  Claims left by crashed processes on another 
+    host must be removed by hand.
+
+    self.__directory = the checkpoint directory
+    self.__nrows = number of rows
+    self.__ncols = number of columns
+    self.__n = the number of live cells in the still lifes
+    self.__depth = the number of cells decided by each unit's prefix
+    self.__units = list of the prefixes of the units, in search order
+    """
+    def __init__(self,directory,nrows,ncols,n,depth=None):
+        self.__directory = directory
+        self.__nrows = nrows
+        self.__ncols = ncols
+        self.__n = n
+        self.__units = None
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        # The depth of a new enumeration defaults to the first two rows inside the margin.
+
+        manifest = os.path.join(directory,'enumeration.txt')
+        if os.path.exists(manifest):
+            with open(manifest) as file:
+                saved = [int(x) for x in file.read().split()]
+            if saved[:3] != [nrows,ncols,n] or (depth is not None and saved[3] != depth):
+                raise ValueError('%s holds a different enumeration: %s' %(directory,saved))
+            self.__depth = saved[3]
+        else:
+            self.__depth = depth if depth is not None else 2*(ncols - 2)
+            self.__writeFile(manifest,'%s %s %s %s\n' %(nrows,ncols,n,self.__depth))
+
+        # There are no still lifes of more cells than fit inside the margin, so there are no units, whatever 
+        # units and results an earlier version of the search left in the directory.
+
+        if n <= 0 or nrows <= 2 or ncols <= 2 or n > (nrows - 2)*(ncols - 2):
+            self.__units = []
+
+    def __path(self,index,extension):
+        return os.path.join(self.__directory,'unit-%06d.%s' %(index,extension))
+
+    def __writeFile(self,path,text):
+        """
+        Writes a file atomically, so that readers never see it half written.
+        """
+        temporary = '%s.%s.%s.tmp' %(path,socket.gethostname(),os.getpid())
+        with open(temporary,'w') as file:
+            file.write(text)
+        os.rename(temporary,path)
+
+    def getUnits(self):
+        """
+        getter for units
+        """
+        if self.__units is None:
+            self.__units = list(searchStillLifes(self.__nrows,self.__ncols,self.__n,depth=self.__depth))
+        return self.__units
+
+    def getDepth(self):
+        """
+        getter for depth
+        """
+        return self.__depth
+
+    def isDone(self,index):
+        """
+        Returns True if unit index has been searched.
+        """
+        return os.path.exists(self.__path(index,'txt'))
+
+    def getRemaining(self):
+        """
+        Returns the indices of the units which have not been searched.
+        """
+        return [index for index in xrange(len(self.getUnits())) if not self.isDone(index)]
+
+    def claim(self,index):
+        """
+        Claims unit index for this process.  Returns False if the unit is done, or claimed by a process which 
+        is still running (or which runs on another host).
+        """
+        if self.isDone(index):
+            return False
+
+        path = self.__path(index,'claim')
+        host = socket.gethostname()
+        try:
+            fd = os.open(path,os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except OSError as error:
+            if error.errno != errno.EEXIST:
+                raise
+            try:
+                with open(path) as file:
+                    owner,pid = file.read().split()
+                pid = int(pid)
+            except (IOError,ValueError):
+                return False
+            if owner == host and pid == os.getpid():
+                return True
+            if owner != host or self.__isRunning(pid):
+                return False
+
+            # The claim was left by a crashed process on this host.  If two processes take it over at once, 
+            # both search the unit, which only costs time: getResults drops the duplicates.
+            self.__writeFile(path,'%s %s\n' %(host,os.getpid()))
+            return True
+
+        os.write(fd,'%s %s\n' %(host,os.getpid()))
+        os.close(fd)
+        return True
+
+    def __isRunning(self,pid):
+        try:
+            os.kill(pid,0)
+        except OSError as error:
+            return error.errno == errno.EPERM
+        return True
+
+    def complete(self,index,found):
+        """
+        Records the still lifes found in unit index, which marks it as done, and releases its claim.
+        """
+        self.__writeFile(self.__path(index,'txt'),''.join(['%s\n' %(pattern,) for pattern in found]))
+        try:
+            os.remove(self.__path(index,'claim'))
+        except OSError:
+            pass
+
+    def getFound(self,index):
+        """
+        Returns the still lifes found in unit index, which must be done.
+        """
+        with open(self.__path(index,'txt')) as file:
+            return [ast.literal_eval(line) for line in file if line.strip()]
+
+    def run(self,processes=None,callback=None):
+        """
+        Searches every unit which is not done or claimed, in a pool of processes (the number of CPUs by default).
+        callback, if given, is called with (index,still lifes) as each unit is done here.
+        Returns the number of units searched by this call.
+        """
+        work = [(self.__directory,self.__nrows,self.__ncols,self.__n,index,self.getUnits()[index]) 
+                for index in self.getRemaining()]
+        nsearched = 0
+        if processes == 1:
+            results = imap(enumerateUnit,work)
+        else:
+            pool = multiprocessing.Pool(processes)
+            results = pool.imap_unordered(enumerateUnit,work)
+        try:
+            for index,found in results:
+                if found is not None:
+                    nsearched += 1
+                    if callback:
+                        callback(index,found)
+        finally:
+            if processes != 1:
+                pool.terminate()
+        return nsearched
+
+    def getResults(self):
+        """
+        Returns the still lifes found by the whole enumeration, in the same order as searchStillLifes, 
+        once every unit is done.  A pattern found twice is only returned once.
+        """
+        remaining = self.getRemaining()
+        if remaining:
+            raise ValueError('%d units of the enumeration have not been searched' %len(remaining))
+
+        results = []
+        seen = set()
+        for index in xrange(len(self.getUnits())):
+            for pattern in self.getFound(index):
+                if pattern not in seen:
+                    seen.add(pattern)
+                    results.append(pattern)
+        return results
+
+
+def isStillPattern(pattern,nrows,ncols):
+    """
+    Returns True if pattern, a tuple for a board of nrows x ncols, is unchanged after one generation 
+    (in toroidal boundary conditions).  Only the live cells and their neighbors are looked at, stopping 
+    at the first cell which would change, so the cost depends on the size of the pattern and not of the board.
+    Gives the same result as isStillLife.
+    """
+    live = set(pattern)
+    dead = set()
+    for cell in live:
+        i,j = divmod(cell,ncols)
+        n = 0
+        for di in (-1,0,1):
+            row = ((i + di)%nrows)*ncols
+            for dj in (-1,0,1):
+                if di or dj:
+                    neighbor = row + (j + dj)%ncols
+                    if neighbor in live:
+                        n += 1
+                    else:
+                        dead.add(neighbor)
+        if n < 2 or n > 3:
+            return False
+
+    # A dead cell can only be born if it neighbors a live cell.
+
+    for cell in dead:
+        i,j = divmod(cell,ncols)
+        n = 0
+        for di in (-1,0,1):
+            row = ((i + di)%nrows)*ncols
+            for dj in (-1,0,1):
+                if (di or dj) and row + (j + dj)%ncols in live:
+                    n += 1
+        if n == 3:
+            return False
+    return True
+
+def isStillLife(life,pattern):
+    """
+    Returns True if pattern, a tuple for the board of life, is unchanged after one generation.  
+    The board of life is used to evolve the pattern, which costs time in proportion to the size of the board;
+    isStillPattern gives the same result much faster.
+    """
+    life.setPatternFromTuple(pattern)
+    life.update()
+    return set(pattern) == set(life.getTupleFromPattern())
+
+
+def readLifeFile(file):
+    """
+    Reads a pattern from an open .life file.  Returns (nrows,ncols,generation,tuple), where tuple is
+    the pattern encoded as a list of 1D integers.
+    """
+    rowsCols=file.readline().split(" ")
+    nrows = int(rowsCols[0])
+    ncols = int(rowsCols[1])
+    generation = int(file.readline())
+    tuple = ast.literal_eval(file.read())
+    return nrows,ncols,generation,tuple
+
+def writeLifeFile(file,nrows,ncols,generation,tuple):
+    """
+    Writes a pattern to an open file in the .life format read by readLifeFile.
+    """
+    file.write("%s %s\n" %(nrows,ncols))
+    file.write("%s\n" %generation)
+    file.write(str(tuple))
+
+# The binary .life format:  BINARY_MAGIC, then a header of version, flags, rows, columns, generation and the
+# hash of the board (BINARY_HEADER, little-endian), then the board one row at a time, 8 cells to the byte with the first 
+# cell in the highest bit and each row padded to a whole byte.  If flags has BINARY_COMPRESSED set the
+# rows are compressed as a single zlib stream.
+
+BINARY_MAGIC = '\x89LIFE\r\n\x1a'
+BINARY_HEADER = struct.Struct('<BBxxIIQQ')
+BINARY_VERSION = 1
+BINARY_COMPRESSED = 1
+BINARY_CHUNK = 1 << 20
+
+def writeBinaryLifeFile(file,life,compress=False):
+    """
+    Writes the board of life to an open file in the binary .life format, compressed if compress is set.
+    The board is read and written in chunks of about BINARY_CHUNK bytes.  Requires numpy.
+    """
+    nrows = life.getNrows()
+    ncols = life.getNcols()
+    file.write(BINARY_MAGIC)
+    file.write(BINARY_HEADER.pack(BINARY_VERSION,BINARY_COMPRESSED if compress else 0,nrows,ncols,
+                                  life.getGeneration(),life.getHash()))
+
+    compressor = zlib.compressobj() if compress else None
+    chunkRows = max(1,BINARY_CHUNK/max(1,(ncols + 7)/8))
+    for i0 in xrange(0,nrows,chunkRows):
+        i1 = min(nrows,i0 + chunkRows)
+        data = numpy.packbits(life.getRegion(i0,i1,0,ncols),axis=1).tostring()
+        file.write(compressor.compress(data) if compressor else data)
+    if compressor:
+        file.write(compressor.flush())
+
+def readBinaryLifeFile(file,engine='list'):
+    """
+    Reads a board from an open file in the binary .life format, after BINARY_MAGIC, into a new board of ENGINES[engine].
+    The rows are read in chunks of about BINARY_CHUNK bytes.  For the numpy engines each chunk is unpacked 
+    straight into the board, and the hash is taken from the header rather than recomputed, which would take longer
+    than the rest of the load.  For the others the live cells are collected and set with setPatternFromTuple.
+    Requires numpy.
+    """
+    version,flags,nrows,ncols,generation,hash = BINARY_HEADER.unpack(file.read(BINARY_HEADER.size))
+    if version > BINARY_VERSION:
+        raise ValueError('binary .life version %d is not supported' %version)
+
+    life = ENGINES[engine](nrows,ncols,0)
+    board = life.getBoard() if isinstance(life,NumpyLife) else None
+    cells = []
+    ncells = 0
+
+    decompressor = zlib.decompressobj() if flags & BINARY_COMPRESSED else None
+    rowBytes = (ncols + 7)/8
+    chunkRows = max(1,BINARY_CHUNK/max(1,rowBytes))
+    pending = ''
+    i0 = 0
+    while i0 < nrows:
+        # Read until the data holds at least one chunk of rows, or the file ends.
+        need = min(chunkRows,nrows - i0)*rowBytes
+        while len(pending) < need:
+            if decompressor and decompressor.unconsumed_tail:
+                data = decompressor.unconsumed_tail
+            else:
+                data = file.read(BINARY_CHUNK)
+                if not data:
+                    break
+            # A well compressed board may hold far more than one chunk per chunk read, so the output is limited too.
+            pending += decompressor.decompress(data,BINARY_CHUNK) if decompressor else data
+        rows = min(len(pending)/rowBytes if rowBytes else nrows - i0,nrows - i0)
+        if rows == 0:
+            raise ValueError('binary .life file ends after %d of %d rows' %(i0,nrows))
+
+        packed = numpy.frombuffer(pending,dtype=numpy.uint8,count=rows*rowBytes).reshape(rows,rowBytes)
+        chunk = numpy.unpackbits(packed,axis=1)[:,:ncols]
+        if board is not None:
+            board[i0:i0 + rows] = chunk
+            ncells += int(numpy.count_nonzero(chunk))
+        else:
+            cells.append(numpy.flatnonzero(chunk) + i0*ncols)
+        pending = pending[rows*rowBytes:]
+        i0 += rows
+
+    if board is None:
+        life.setPatternFromTuple(tuple(numpy.concatenate(cells).tolist()) if cells else ())
+    else:
+        life.setNcells(ncells)
+        life.setHash(hash)
+        life.clearHistory()
+        life.invalidateOccupancy()
+    life.setGeneration(generation)
+    return life
+
+def readLife(file,engine='list'):
+    """
+    Reads a board from an open .life file in either the binary or the text format, into a new board of ENGINES[engine].
+    """
+    head = file.read(len(BINARY_MAGIC))
+    if head == BINARY_MAGIC:
+        return readBinaryLifeFile(file,engine)
+
+    nrows,ncols,generation,tuple = readLifeFile(StringIO(head + file.read()))
+    life = ENGINES[engine](nrows,ncols,0)
+    life.setPatternFromTuple(tuple)
+    life.setGeneration(generation)
+    return life
+
+# Run-length encoded (RLE) and plaintext patterns.  Both are read and written one line at a time, and the live cells 
+# are passed around as runs (i,j,n) of n live cells starting at row i and column j, so that no list of cells is built.
+
+RLE_TOKEN = re.compile(r'(\d*)([^\d\s])')
+RLE_HEADER = re.compile(r'x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*(\S+))?')
+RLE_LINE = 70
+PLAINTEXT_RUN = re.compile(r'[O*]+')
+
+def readRLEHeader(file):
+    """
+    Reads the comments and the header line of an open RLE file.  Returns (width,height,rule), where rule is None
+    if the header gives none.  The rest of the file can then be read with rleRuns.
+    """
+    for line in file:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        match = RLE_HEADER.match(line)
+        if not match:
+            raise ValueError('RLE header expected, found %r' %line[:40])
+        return int(match.group(1)),int(match.group(2)),match.group(3)
+    raise ValueError('RLE file has no header')
+
+def isLifeRule(rule):
+    """
+    Returns True if the rule of an RLE header is Conway's rule-set, written as B3/S23 (in either order and case), 
+    or as 23/3 (survival/birth).  Any bounded grid given after a ':' is ignored.
+    """
+    parts = rule.split(':')[0].upper().split('/')
+    if len(parts) != 2:
+        return False
+    if parts[0][:1].isdigit() or parts[1][:1].isdigit():
+        survival,birth = parts
+    else:
+        named = dict((part[:1],part[1:]) for part in parts)
+        if sorted(named) != ['B','S']:
+            return False
+        birth,survival = named['B'],named['S']
+    return sorted(birth) == ['3'] and sorted(survival) == ['2','3']
+
+def rleRuns(file):
+    """
+    Generates the runs (i,j,n) of live cells in the body of an open RLE file, after readRLEHeader, as it is read.
+    States other than b (dead) are read as live.
+    """
+    i = 0
+    j = 0
+    carry = ''
+    for line in file:
+        if line.startswith('#'):
+            continue
+        line = carry + line.strip()
+
+        # A run count may be split over two lines.
+        end = len(line)
+        while end and line[end - 1].isdigit():
+            end -= 1
+        carry = line[end:]
+
+        for match in RLE_TOKEN.finditer(line,0,end):
+            n = int(match.group(1)) if match.group(1) else 1
+            tag = match.group(2)
+            if tag == '!':
+                return
+            elif tag == '$':
+                i += n
+                j = 0
+            elif tag == 'b' or tag == '.':
+                j += n
+            else:
+                yield i,j,n
+                j += n
+
+def plaintextSize(file):
+    """
+    Returns (width,height) of the pattern in an open plaintext (.cells) file, reading the whole file.
+    """
+    width = 0
+    height = 0
+    for line in file:
+        if line.startswith('!'):
+            continue
+        width = max(width,len(line.rstrip()))
+        height += 1
+    return width,height
+
+def plaintextRuns(file):
+    """
+    Generates the runs (i,j,n) of live cells in an open plaintext (.cells) file, as it is read.  
+    Live cells are O (or *), and lines starting with ! are comments.
+    """
+    i = 0
+    for line in file:
+        if line.startswith('!'):
+            continue
+        for match in PLAINTEXT_RUN.finditer(line):
+            yield i,match.start(),match.end() - match.start()
+        i += 1
+
+def placeRuns(life,runs,row0=0,col0=0):
+    """
+    Sets the live cells of runs (i,j,n) on the board of life, translated by row0 rows and col0 columns, without
+    clearing the cells already there.  Runs wrap around the edges of the board (toroidal boundary conditions).
+    life may also be a SparseLife, which has no edges.
+    """
+    if isinstance(life,SparseLife):
+        cells = life.getCells()
+        for i,j,n in runs:
+            i += row0
+            j += col0
+            cells.update([(i,j + k) for k in xrange(n)])
+        return
+
+    nrows = life.getNrows()
+    ncols = life.getNcols()
+    if isinstance(life,NumpyLife):
+        # Fill the board directly, then count and hash it once.
+        board = life.getBoard()
+        for i,j,n in runs:
+            i = (i + row0)%nrows
+            j = (j + col0)%ncols
+            while n > 0:
+                m = min(n,ncols - j)
+                board[i,j:j + m] = 1
+                n -= m
+                j = 0
+        life.countNcells()
+        life.rehash()
+    else:
+        for i,j,n in runs:
+            i = (i + row0)%nrows
+            for k in xrange(j + col0,j + col0 + n):
+                life.setCell(i,k%ncols,1)
+
+def patternRows(life):
+    """
+    Returns (width,height,rows), where rows generates, for each row of the board of life in turn, the list of its runs 
+    (j,n) of n live cells starting at column j.  For a SparseLife the rows and columns of its bounding box are used.
+    """
+    if isinstance(life,SparseLife):
+        box = life.getBoundingBox()
+        if box is None:
+            return 0,0,iter([])
+        imin,jmin,imax,jmax = box
+
+        def rows():
+            cells = sorted(life.getCells())
+            k = 0
+            for i in xrange(imin,imax + 1):
+                runs = []
+                while k < len(cells) and cells[k][0] == i:
+                    j = cells[k][1] - jmin
+                    if runs and runs[-1][0] + runs[-1][1] == j:
+                        runs[-1][1] += 1
+                    else:
+                        runs.append([j,1])
+                    k += 1
+                yield runs
+        return jmax - jmin + 1,imax - imin + 1,rows()
+
+    nrows = life.getNrows()
+    ncols = life.getNcols()
+
+    def rows():
+        for i in xrange(nrows):
+            if numpy is not None:
+                row = numpy.zeros(ncols + 2,dtype=numpy.int8)
+                row[1:-1] = life.getRegion(i,i + 1,0,ncols)[0]
+                edges = numpy.flatnonzero(numpy.diff(row))
+                yield [(int(j0),int(j1 - j0)) for j0,j1 in zip(edges[::2],edges[1::2])]
+            else:
+                runs = []
+                for j in xrange(ncols):
+                    if life.getCell(i,j):
+                        if runs and runs[-1][0] + runs[-1][1] == j:
+                            runs[-1][1] += 1
+                        else:
+                            runs.append([j,1])
+                yield runs
+    return ncols,nrows,rows()
+
+def writeRLE(file,life):
+    """
+    Writes the board of life (or the bounding box of a SparseLife) to an open file as RLE, one row at a time.
+    """
+    width,height,rows = patternRows(life)
+    file.write('x = %d, y = %d, rule = B3/S23\n' %(width,height))
+
+    line = []
+    length = [0]
+
+    def put(n,tag):
+        token = (str(n) if n > 1 else '') + tag
+        if length[0] + len(token) > RLE_LINE:
+            file.write(''.join(line) + '\n')
+            del line[:]
+            length[0] = 0
+        line.append(token)
+        length[0] += len(token)
+
+    # Row ends are only written once a later row has live cells, so blank rows at the end are left out.
+    ends = 0
+    for runs in rows:
+        if runs:
+            if ends:
+                put(ends,'$')
+                ends = 0
+            j = 0
+            for j0,n in runs:
+                if j0 > j:
+                    put(j0 - j,'b')
+                put(n,'o')
+                j = j0 + n
+        ends += 1
+    put(1,'!')
+    file.write(''.join(line) + '\n')
+
+def writePlaintext(file,life):
+    """
+    Writes the board of life (or the bounding box of a SparseLife) to an open file in the plaintext (.cells) format, 
+    one row at a time.
+    """
+    width,height,rows = patternRows(life)
+    for runs in rows:
+        j = 0
+        for j0,n in runs:
+            file.write('.'*(j0 - j) + 'O'*n)
+            j = j0 + n
+        file.write('.'*(width - j) + '\n')
+
+def readPattern(file,engine='list',nrows=None,ncols=None):
+    """
+    Reads a board from an open pattern file into a new board of ENGINES[engine].  The format is chosen from the 
+    extension of the file's name:  .rle for RLE, .cells for plaintext, and otherwise .life (binary or text).
+    An RLE or plaintext pattern is centred on a board of at least nrows x ncols, and at least the size of the pattern.
+    Raises ValueError for an RLE pattern whose rule is not Conway's (see isLifeRule).
+    """
+    name = getattr(file,'name','').lower()
+    if name.endswith('.rle'):
+        width,height,rule = readRLEHeader(file)
+        if rule is not None and not isLifeRule(rule):
+            raise ValueError('RLE pattern is for the rule %s, not B3/S23' %rule)
+        runs = rleRuns(file)
+    elif name.endswith('.cells'):
+        width,height = plaintextSize(file)
+        file.seek(0)
+        runs = plaintextRuns(file)
+    else:
+        return readLife(file,engine)
+
+    nrows = max(nrows or 0,height)
+    ncols = max(ncols or 0,width)
+    life = ENGINES[engine](nrows,ncols,0)
+    placeRuns(life,runs,(nrows - height)/2,(ncols - width)/2)
+    return life
@@ -0,0 +1,71 @@
+"""
+Tests of the still life searches in lifecore against the brute force enumeration.
+
+    python -m unittest test_lifecore
+"""
+
+import os,shutil,tempfile,unittest
+from lifecore import stillLifeCandidates,isStillPattern,searchStillLifes,revolvingDoorStillLifes,StillLifeEnumeration
+
+
+def bruteForceStillLifes(nrows,ncols,n):
+    """
+    Returns the still lifes of n cells found by testing every candidate with isStillPattern.
+    """
+    return [pattern for pattern in stillLifeCandidates(nrows,ncols,n) if isStillPattern(pattern,nrows,ncols)]
+
+
+class StillLifeSearchTest(unittest.TestCase):
+
+    def testSmallBoards(self):
+        """
+        The searches match the brute force enumeration on small boards, including more cells than fit inside the margin.
+        """
+        for nrows in xrange(1,7):
+            for ncols in xrange(1,7):
+                ncandidates = max(0,(nrows - 2)*(ncols - 2))
+                for n in xrange(ncandidates + 3):
+                    expected = bruteForceStillLifes(nrows,ncols,n)
+                    self.assertEqual(list(searchStillLifes(nrows,ncols,n)),expected,(nrows,ncols,n))
+                    self.assertEqual(list(revolvingDoorStillLifes(nrows,ncols,n)),expected,(nrows,ncols,n))
+
+    def testTooManyCells(self):
+        """
+        There are no still lifes of more cells than fit inside the margin.
+        """
+        self.assertEqual(list(searchStillLifes(4,4,5)),[])
+        self.assertEqual(list(searchStillLifes(4,4,7)),[])
+
+    def testEnumeration(self):
+        """
+        The checkpointed enumeration matches the brute force enumeration.
+        """
+        for nrows,ncols,n in [(6,6,4),(6,6,6),(4,4,4),(4,4,5)]:
+            directory = tempfile.mkdtemp()
+            try:
+                enumeration = StillLifeEnumeration(directory,nrows,ncols,n)
+                enumeration.run(1)
+                self.assertEqual(enumeration.getResults(),bruteForceStillLifes(nrows,ncols,n),(nrows,ncols,n))
+            finally:
+                shutil.rmtree(directory)
+
+    def testStaleEnumeration(self):
+        """
+        Units left in the directory of an enumeration of more cells than fit inside the margin are ignored.
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(directory,'enumeration.txt'),'w') as file:
+                file.write('4 4 5 4\n')
+            with open(os.path.join(directory,'unit-000000.txt'),'w') as file:
+                file.write('(5, 6, 9, 10)\n')
+            enumeration = StillLifeEnumeration(directory,4,4,5)
+            self.assertEqual(enumeration.getUnits(),[])
+            self.assertEqual(enumeration.run(1),0)
+            self.assertEqual(enumeration.getResults(),[])
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()